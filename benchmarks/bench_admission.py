@@ -0,0 +1,121 @@
+"""
+Latencia del hashing bajo sobrecarga, con y sin control de admisión.
+
+Se generan llegadas abiertas (Poisson) a `--overload` veces la capacidad del
+executor de hashing durante `--seconds`: 70 % verificaciones de login y 30 %
+hashes de registro. Sin admisión todo se encola y la latencia crece mientras
+dure la ola; con admisión lo que excede la cola o la espera máxima se rechaza
+(503) y la latencia de lo admitido queda acotada, con login por delante.
+
+Se usa bcrypt real con un costo bajo (--rounds) para que la corrida sea corta;
+la forma de las curvas no depende del costo.
+
+Uso:
+    python benchmarks/bench_admission.py [--seconds 10] [--overload 3] [--rounds 8]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.adapters.admission import AdmissionController, AdmissionRejected, HashPriority
+from src.adapters.password_hashers import HashPolicy, hash_password, verify_password
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"n": 0}
+    samples = sorted(samples)
+    pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 1)
+    return {"n": len(samples), "p50_ms": pick(0.5), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+async def _run(args, policy, hashed, controller):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    rng = random.Random(args.seed)
+    latencies = {priority: [] for priority in (HashPriority.LOGIN, HashPriority.REGISTER)}
+    rejected = {priority: 0 for priority in latencies}
+
+    async def operation(priority):
+        start = time.perf_counter()
+        work = (lambda: verify_password("Bench-2024!", hashed)) if priority == HashPriority.LOGIN \
+            else (lambda: hash_password("Bench-2024!", policy))
+        try:
+            if controller is None:
+                await loop.run_in_executor(executor, work)
+            else:
+                async with controller.slot(priority):
+                    await loop.run_in_executor(executor, work)
+        except AdmissionRejected:
+            rejected[priority] += 1
+            return
+        latencies[priority].append(time.perf_counter() - start)
+
+    tasks = []
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        priority = HashPriority.LOGIN if rng.random() < 0.7 else HashPriority.REGISTER
+        tasks.append(asyncio.ensure_future(operation(priority)))
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    executor.shutdown()
+    return {
+        priority.name.lower(): {**_percentiles(latencies[priority]), "rejected": rejected[priority]}
+        for priority in latencies
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--overload", type=float, default=3.0, help="Llegadas / capacidad")
+    parser.add_argument("--rounds", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-queue", type=int, default=0, help="0 = 16 por worker")
+    parser.add_argument("--max-wait-ms", type=float, default=1000.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    policy = HashPolicy(bcrypt_rounds=args.rounds)
+    hashed = hash_password("Bench-2024!", policy)
+    service = statistics.median(
+        _timed(lambda: verify_password("Bench-2024!", hashed)) for _ in range(10)
+    )
+    capacity = args.workers / service
+    args.rate = capacity * args.overload
+
+    controller = AdmissionController(
+        slots=args.workers,
+        max_queue=args.max_queue or 16 * args.workers,
+        max_wait=args.max_wait_ms / 1000,
+    )
+    report = {
+        "workers": args.workers,
+        "service_ms": round(service * 1000, 2),
+        "capacity_per_s": round(capacity, 1),
+        "arrivals_per_s": round(args.rate, 1),
+        "without_admission": asyncio.run(_run(args, policy, hashed, None)),
+        "with_admission": asyncio.run(_run(args, policy, hashed, controller)),
+        "controller": controller.stats(),
+    }
+    print(json.dumps(report, indent=2))
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Rendimiento del repositorio síncrono (threadpool) frente al asíncrono (AsyncSession)
+con muchos clientes concurrentes.
+
+Cada cliente ejecuta find_by_id en bucle:
+    - sync:  MySQLUserRepository en el threadpool de AnyIO (como ThreadedUserRepository)
+    - async: AsyncSQLUserRepository sobre AsyncSession
+
+Por defecto usa una base SQLite temporal (sqlite / aiosqlite). Para medir contra
+MySQL, indicar --database-url y --async-database-url de una base de pruebas.
+
+Uso:
+    python benchmarks/bench_async_repository.py [--clients 500] [--requests-per-client 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _run_clients(clients, requests_per_client, lookup):
+    latencies = []
+
+    async def client():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            await lookup()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests-per-client", type=int, default=20)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--database-url")
+    parser.add_argument("--async-database-url")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db_path = os.path.join(tmp.name, "bench.db")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{db_path}"
+    os.environ["ASYNC_DATABASE_URL"] = args.async_database_url or f"sqlite+aiosqlite:///{db_path}"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    from anyio import to_thread
+    from src.adapters.repositories.database import Base, SessionLocal, get_engine
+    from src.adapters.repositories.async_database import AsyncSessionLocal, get_async_engine
+    from src.adapters.repositories.db_models import UserDB
+    from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+    from src.adapters.repositories.async_sql_user_repository import AsyncSQLUserRepository
+    from src.adapters.repositories.mappers import entity_to_model
+    from src.domain.entities.profile import Profile
+    from src.domain.entities.user import User
+    from src.domain.value_objects.email import Email
+    from src.domain.value_objects.enums import Entorno, NivelEducativo
+    from src.domain.value_objects.password import Password
+
+    Base.metadata.create_all(bind=get_engine())
+    user_ids = []
+    with SessionLocal() as db:
+        db.query(UserDB).filter(UserDB.username.like("bench_%")).delete(synchronize_session=False)
+        for i in range(args.users):
+            user_id = uuid.uuid4()
+            user = User(
+                user_id=user_id, username=f"bench_{i}", age=25,
+                email=Email(value=f"bench{i}@example.com"), password=Password.from_hash("x"),
+                profile=Profile(user_id=user_id, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.PRIMARIA),
+            )
+            db.add(entity_to_model(user))
+            user_ids.append(user_id)
+        db.commit()
+
+    def sync_find():
+        with SessionLocal() as db:
+            return MySQLUserRepository(db).find_by_id(random.choice(user_ids))
+
+    async def sync_lookup():
+        await to_thread.run_sync(sync_find)
+
+    async def async_lookup():
+        async with AsyncSessionLocal() as db:
+            await AsyncSQLUserRepository(db).find_by_id(random.choice(user_ids))
+
+    async def run():
+        get_async_engine()
+        results = {
+            "clients": args.clients,
+            "sync_threadpool": await _run_clients(args.clients, args.requests_per_client, sync_lookup),
+            "async_session": await _run_clients(args.clients, args.requests_per_client, async_lookup),
+        }
+        await get_async_engine().dispose()
+        return results
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+    get_engine().dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compara el diccionario de contraseñas comunes cargado con pandas en un `set`
+contra el índice compacto mapeado en memoria (src/adapters/common_passwords.py).
+
+Mide, en procesos independientes para aislar la memoria:
+    - tiempo de carga (import de pandas + lectura, o apertura del índice)
+    - memoria residente y memoria privada del proceso (Linux)
+    - latencia media de búsqueda (aciertos y fallos)
+
+Uso:
+    python benchmarks/bench_common_passwords.py [--csv 1millionPasswords.csv] [--size 1000000]
+
+Si no se indica --csv se genera un diccionario sintético del tamaño pedido.
+"""
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import json, sys, time, random
+sys.path.insert(0, {root!r})
+
+def memory():
+    stats = {{}}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                if key in ("Rss", "Private_Clean", "Private_Dirty"):
+                    stats[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return {{"rss_mb": stats.get("Rss", 0.0),
+             "private_mb": stats.get("Private_Clean", 0.0) + stats.get("Private_Dirty", 0.0)}}
+
+if {mode!r} != "pandas":
+    from src.adapters.common_passwords import CommonPasswordIndex
+
+before = memory()
+start = time.perf_counter()
+if {mode!r} == "pandas":
+    import pandas as pd
+    df = pd.read_csv({csv!r}, header=None, usecols=[1], low_memory=False)
+    passwords = set(df[1].dropna().astype(str))
+else:
+    passwords = CommonPasswordIndex({index!r})
+load_ms = (time.perf_counter() - start) * 1000
+
+probes = {probes!r}
+start = time.perf_counter()
+for _ in range(5):
+    for p in probes:
+        p in passwords
+lookup_us = (time.perf_counter() - start) / (5 * len(probes)) * 1e6
+after = memory()
+print(json.dumps({{
+    "load_ms": round(load_ms, 1),
+    "rss_mb": round(after["rss_mb"] - before["rss_mb"], 1),
+    "private_mb": round(after["private_mb"] - before["private_mb"], 1),
+    "lookup_us": round(lookup_us, 2),
+}}))
+"""
+
+
+def _synthetic_csv(path: str, size: int) -> list:
+    rng = random.Random(42)
+    alphabet = string.ascii_letters + string.digits
+    sample = []
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            password = "".join(rng.choice(alphabet) for _ in range(rng.randint(6, 12)))
+            f.write(f"{i},{password}\n")
+            if i % (size // 1000 or 1) == 0:
+                sample.append(password)
+    return sample
+
+
+def _run(mode: str, csv_path: str, index_path: str, probes: list) -> dict:
+    code = _CHILD.format(root=ROOT, mode=mode, csv=csv_path, index=index_path, probes=probes)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", help="CSV original del diccionario (columna 1 = contraseña)")
+    parser.add_argument("--size", type=int, default=1_000_000, help="Entradas del diccionario sintético")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from src.adapters.common_passwords import build_index, read_csv_passwords
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv or os.path.join(tmp, "passwords.csv")
+        if args.csv:
+            hits = [p for _, p in zip(range(1000), read_csv_passwords(csv_path))]
+        else:
+            hits = _synthetic_csv(csv_path, args.size)
+        misses = [f"NoEsComun!{i}" for i in range(len(hits))]
+        probes = hits + misses
+
+        index_path = os.path.join(tmp, "common_passwords.idx")
+        total = build_index(read_csv_passwords(csv_path), index_path)
+
+        results = {
+            "entries": total,
+            "index_file_mb": round(os.path.getsize(index_path) / 2**20, 1),
+            "pandas_set": _run("pandas", csv_path, index_path, probes),
+            "mmap_index": _run("mmap", csv_path, index_path, probes),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Costo de hidratar entidades de dominio desde filas ORM.
+
+Construye N objetos UserDB/ProfileDB en memoria (sin base de datos) y mide
+MySQLUserRepository._model_to_entity sobre todos ellos, que es lo que hace
+find_all() por cada fila.
+
+Uso:
+    python benchmarks/bench_entity_hydration.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.adapters.repositories.db_models import UserDB, ProfileDB
+from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+from src.domain.value_objects.enums import Rol, Entorno, NivelEducativo
+
+# Hash bcrypt fijo: la hidratación nunca hashea, solo reconstruye el objeto
+_HASH = "$2b$12$C6UzMDM.H6dfI/f/IKcEeO5tPmQ8tG2V1a9aZ1hN0gV3wqJkW6W2a"
+
+
+def build_rows(count: int) -> list:
+    rows = []
+    for i in range(count):
+        user_id = str(uuid.uuid4())
+        rows.append(UserDB(
+            user_id=user_id,
+            username=f"usuario_{i}",
+            email=f"usuario{i}@example.com",
+            password_hash=_HASH,
+            age=20 + i % 50,
+            created_at=datetime.datetime(2025, 1, 1),
+            profile=ProfileDB(
+                profile_id=str(uuid.uuid4()),
+                user_id=user_id,
+                rol=Rol.ALUMNO,
+                entorno=Entorno.CASA,
+                nivel_educativo=NivelEducativo.SECUNDARIA,
+            ),
+        ))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    repository = MySQLUserRepository(db=None)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for row in rows:
+            repository._model_to_entity(row)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(json.dumps({
+        "rows": args.rows,
+        "total_ms": round(best * 1000, 1),
+        "per_row_us": round(best / args.rows * 1e6, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
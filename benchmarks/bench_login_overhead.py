@@ -0,0 +1,107 @@
+"""
+Costo del login sin contar bcrypt.
+
+Compara, por login, la parte que no es verificación de contraseña:
+    - entity:      find_by_email (JOIN al perfil + hidratación de User) + create_access_token
+    - credentials: find_credentials_by_email (user_id + password_hash) + create_access_token
+
+Además mide una verificación bcrypt real para poner las cifras en contexto.
+Por defecto usa una base SQLite temporal; --database-url permite medir contra MySQL.
+
+Uso:
+    python benchmarks/bench_login_overhead.py [--users 1000] [--logins 5000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _measure(logins, emails, lookup, create_access_token):
+    latencies = []
+    for _ in range(logins):
+        email = random.choice(emails)
+        start = time.perf_counter()
+        found = lookup(email)
+        create_access_token(data={"sub": str(found.user_id)})
+        latencies.append(time.perf_counter() - start)
+    return {
+        "mean_us": round(statistics.fmean(latencies) * 1e6, 1),
+        "p50_us": round(statistics.median(latencies) * 1e6, 1),
+        "p99_us": round(sorted(latencies)[int(len(latencies) * 0.99)] * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    from src.adapters.password_hashers import hash_password, verify_password
+    from src.adapters.repositories.database import Base, SessionLocal, get_engine
+    from src.adapters.repositories.db_models import UserDB
+    from src.adapters.repositories.mappers import entity_to_model
+    from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+    from src.adapters.security import create_access_token
+    from src.domain.entities.profile import Profile
+    from src.domain.entities.user import User
+    from src.domain.value_objects.email import Email
+    from src.domain.value_objects.enums import Entorno, NivelEducativo
+    from src.domain.value_objects.password import Password
+
+    plain = "Bench-Login-2024!"
+    hashed = hash_password(plain)
+    Base.metadata.create_all(bind=get_engine())
+    emails = []
+    with SessionLocal() as db:
+        db.query(UserDB).filter(UserDB.username.like("bench_%")).delete(synchronize_session=False)
+        for i in range(args.users):
+            user_id = uuid.uuid4()
+            user = User(
+                user_id=user_id, username=f"bench_{i}", age=25,
+                email=Email(value=f"bench{i}@example.com"), password=Password.from_hash(hashed),
+                profile=Profile(user_id=user_id, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.PRIMARIA),
+            )
+            db.add(entity_to_model(user))
+            emails.append(f"bench{i}@example.com")
+        db.commit()
+
+    with SessionLocal() as db:
+        repository = MySQLUserRepository(db)
+        # Calentamiento: compila las consultas y carga jose
+        _measure(100, emails, repository.find_by_email, create_access_token)
+        _measure(100, emails, repository.find_credentials_by_email, create_access_token)
+        entity = _measure(args.logins, emails, repository.find_by_email, create_access_token)
+        credentials = _measure(args.logins, emails, repository.find_credentials_by_email, create_access_token)
+
+    start = time.perf_counter()
+    verify_password(plain, hashed)
+    bcrypt_verify_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "logins": args.logins,
+        "entity": entity,
+        "credentials": credentials,
+        "speedup": round(entity["mean_us"] / credentials["mean_us"], 2),
+        "bcrypt_verify_ms": round(bcrypt_verify_ms, 1),
+    }, indent=2))
+    get_engine().dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
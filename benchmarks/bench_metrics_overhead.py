@@ -0,0 +1,123 @@
+"""
+Costo de registrar métricas en el camino caliente.
+
+Escenarios:
+    - observe_ns:       Histogram hijo ya resuelto (lo que hacen los decoradores)
+    - labels_observe_ns: búsqueda del hijo por labels + observe
+    - counter_inc_ns:   Counter hijo ya resuelto
+    - timed_sync_ns / timed_async_ns: sobrecosto del decorador @timed sobre
+      una función vacía (síncrona y async)
+    - request_us: GET a una ruta trivial llamando a la app ASGI directamente,
+      con y sin MetricsMiddleware; la diferencia es el costo por request
+    - render_ms: tiempo de generar /metrics con las series actuales
+
+Uso:
+    python benchmarks/bench_metrics_overhead.py [--iterations 200000] [--requests 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.adapters.metrics import REGISTRY, Counter, Histogram, MetricsMiddleware, timed
+
+
+def _ns_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def _baseline_ns(iterations: int) -> float:
+    noop = lambda: None
+    return _ns_per_call(noop, iterations)
+
+
+async def _request_us(app, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    from fastapi import FastAPI
+
+    histogram = Histogram("bench_seconds", "bench", ("operation",))
+    counter = Counter("bench_total", "bench", ("route",))
+    child, counter_child = histogram.labels("op"), counter.labels("/ping")
+    baseline = _baseline_ns(args.iterations)
+
+    def noop():
+        return None
+
+    async def async_noop():
+        return None
+
+    timed_noop = timed(histogram, "noop")(noop)
+    timed_async_noop = timed(histogram, "async_noop")(async_noop)
+
+    async def drive(fn):
+        for _ in range(args.iterations):
+            await fn()
+
+    def async_ns(fn) -> float:
+        start = time.perf_counter()
+        asyncio.run(drive(fn))
+        return (time.perf_counter() - start) / args.iterations * 1e9
+
+    plain_app, measured_app = FastAPI(), FastAPI()
+    for app in (plain_app, measured_app):
+        app.get("/ping")(lambda: {"ok": True})
+    measured_app.add_middleware(MetricsMiddleware)
+    plain_us = asyncio.run(_request_us(plain_app, args.requests))
+    measured_us = asyncio.run(_request_us(measured_app, args.requests))
+
+    REGISTRY.render()  # El primer scrape importa los módulos de los collectors
+    start = time.perf_counter()
+    REGISTRY.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "observe_ns": round(_ns_per_call(lambda: child.observe(0.001), args.iterations) - baseline),
+        "labels_observe_ns": round(_ns_per_call(lambda: histogram.labels("op").observe(0.001), args.iterations) - baseline),
+        "counter_inc_ns": round(_ns_per_call(counter_child.inc, args.iterations) - baseline),
+        "timed_sync_ns": round(_ns_per_call(timed_noop, args.iterations) - _ns_per_call(noop, args.iterations)),
+        "timed_async_ns": round(async_ns(timed_async_noop) - async_ns(async_noop)),
+        "request_us": {
+            "without_middleware": round(plain_us, 2),
+            "with_middleware": round(measured_us, 2),
+            "overhead": round(measured_us - plain_us, 2),
+        },
+        "render_ms": round(render_ms, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
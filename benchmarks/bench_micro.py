@@ -0,0 +1,243 @@
+"""
+Micro-benchmarks del camino caliente por request, comparables entre commits.
+
+Mide el costo de CPU por llamada de:
+    - dto.register / dto.register_rejected / dto.login: validación de los
+      DTOs de request (cuerpo válido y cuerpo rechazado por la contraseña)
+    - vo.email / vo.username: Email(value=...) y Username(value=...)
+    - vo.password: Password.validated (sanitización, regex, entropía y
+      búsqueda en el diccionario; sin bcrypt)
+    - mapper.model_to_entity / mapper.entity_to_model: conversiones de
+      MySQLUserRepository entre filas ORM y entidades, sin base de datos
+    - jwt.create_access_token
+
+Los fixtures son fijos: mismos datos de entrada en cada corrida, un
+diccionario sintético de --dictionary-size contraseñas (generado con semilla
+fija en un directorio temporal, con el mismo formato de índice que el real) y
+JWT HS256 con una clave fija, sin depender del .env.
+
+Cada benchmark se calibra para que una muestra dure al menos --min-time-ms y
+se toman --samples muestras tras una de calentamiento (al estilo de pyperf);
+se reporta mediana, media, desviación y mínimo en ns por llamada.
+
+Para comparar commits:
+    python benchmarks/bench_micro.py --output base.json          # en el commit base
+    python benchmarks/bench_micro.py --compare base.json         # en el commit nuevo
+Un cambio se marca como significativo si supera --threshold (%) y los
+intervalos mediana ± desviación no se solapan.
+
+Uso:
+    python benchmarks/bench_micro.py [--filter vo.] [--samples 20] [--min-time-ms 20]
+        [--output resultados.json] [--compare base.json]
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+REGISTER_BODY = {
+    "username": "usuario_prueba",
+    "email": "prueba@example.com",
+    "password": "MiPassword123!",
+    "confirm_password": "MiPassword123!",
+    "age": 25,
+    "entorno": "casa",
+    "nivel_educativo": "secundaria",
+}
+REJECTED_BODY = {**REGISTER_BODY, "password": "mipassword123!", "confirm_password": "mipassword123!"}
+LOGIN_BODY = {"email": "prueba@example.com", "password": "MiPassword123!"}
+USER_ID = uuid.UUID("6f1c2a9e-3b7d-4c59-9a0e-2d8f4b1c7e35")
+# Hash bcrypt fijo: ningún benchmark hashea
+PASSWORD_HASH = "$2b$12$C6UzMDM.H6dfI/f/IKcEeO5tPmQ8tG2V1a9aZ1hN0gV3wqJkW6W2a"
+
+
+def _fixture_environment(directory: str, dictionary_size: int) -> None:
+    """Diccionario sintético y configuración JWT fijos, antes de leer Settings."""
+    from src.adapters.common_passwords import build_index
+
+    rng = random.Random(1234)
+    alphabet = string.ascii_lowercase + string.digits
+    passwords = ("".join(rng.choices(alphabet, k=rng.randint(6, 12))) for _ in range(dictionary_size))
+    index_path = os.path.join(directory, "common_passwords.idx")
+    build_index(passwords, index_path)
+    os.environ.update({
+        "COMMON_PASSWORDS_INDEX": index_path,
+        "COMMON_PASSWORDS_CSV": os.path.join(directory, "no-existe.csv"),
+        "SECRET_KEY": "bench-secret-key-0123456789abcdef",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+        "JWT_KEY_FILES": "",
+    })
+
+
+def _benchmarks() -> dict:
+    """Nombre -> función sin argumentos que ejecuta una llamada."""
+    from pydantic import ValidationError
+
+    from src.adapters.common_passwords import get_common_passwords
+    from src.adapters.password_service import get_password_service
+    from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+    from src.adapters.security import create_access_token
+    from src.domain.entities.profile import Profile
+    from src.domain.entities.user import User
+    from src.domain.value_objects.email import Email
+    from src.domain.value_objects.enums import Entorno, NivelEducativo
+    from src.domain.value_objects.password import Password
+    from src.domain.value_objects.username import Username
+    from src.use_cases.dtos import LoginRequestDTO, RegisterUserRequestDTO
+
+    get_common_passwords()  # Abre el índice fuera de la medición
+    password_service = get_password_service()
+
+    repository = MySQLUserRepository(db=None)
+    user = User(
+        user_id=USER_ID, username="usuario_prueba", age=25,
+        email=Email(value="prueba@example.com"), password=Password.from_hash(PASSWORD_HASH),
+        profile=Profile(user_id=USER_ID, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.SECUNDARIA),
+    )
+    row = repository._entity_to_model(user)
+    token_data = {"sub": str(USER_ID)}
+
+    def register_rejected():
+        try:
+            RegisterUserRequestDTO(**REJECTED_BODY)
+        except ValidationError:
+            pass
+        else:
+            raise AssertionError("El cuerpo de dto.register_rejected debería fallar la validación")
+
+    return {
+        "dto.register": lambda: RegisterUserRequestDTO(**REGISTER_BODY),
+        "dto.register_rejected": register_rejected,
+        "dto.login": lambda: LoginRequestDTO(**LOGIN_BODY),
+        "vo.email": lambda: Email(value="prueba@example.com"),
+        "vo.username": lambda: Username(value="usuario_prueba"),
+        "vo.password": lambda: Password.validated("MiPassword123!", password_service),
+        "mapper.model_to_entity": lambda: repository._model_to_entity(row),
+        "mapper.entity_to_model": lambda: repository._entity_to_model(user),
+        "jwt.create_access_token": lambda: create_access_token(data=token_data),
+    }
+
+
+def _calibrate(fn, min_time: float) -> int:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            return loops
+        loops *= 2
+
+
+def _run(fn, samples: int, min_time: float) -> dict:
+    fn()  # Falla temprano si el fixture no es válido
+    loops = _calibrate(fn, min_time)
+    timings = []
+    gc.collect()
+    for _ in range(samples + 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - start) / loops * 1e9)
+    timings = timings[1:]  # La primera muestra es de calentamiento
+    return {
+        "median_ns": round(statistics.median(timings), 1),
+        "mean_ns": round(statistics.fmean(timings), 1),
+        "stdev_ns": round(statistics.stdev(timings), 1) if len(timings) > 1 else 0.0,
+        "min_ns": round(min(timings), 1),
+        "loops": loops,
+        "samples": len(timings),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def _compare(base: dict, current: dict, threshold: float) -> dict:
+    comparison = {}
+    for name, result in current.items():
+        old = base.get(name)
+        if old is None:
+            continue
+        change = (result["median_ns"] - old["median_ns"]) / old["median_ns"] * 100
+        overlap = (result["median_ns"] - result["stdev_ns"] <= old["median_ns"] + old["stdev_ns"]
+                   and old["median_ns"] - old["stdev_ns"] <= result["median_ns"] + result["stdev_ns"])
+        comparison[name] = {
+            "base_ns": old["median_ns"],
+            "ns": result["median_ns"],
+            "change_pct": round(change, 1),
+            "significant": abs(change) >= threshold and not overlap,
+        }
+    return comparison
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Solo benchmarks cuyo nombre contiene este texto")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--min-time-ms", type=float, default=20.0, help="Duración mínima de cada muestra")
+    parser.add_argument("--dictionary-size", type=int, default=1_000_000)
+    parser.add_argument("--output", help="Además de imprimirlo, guarda el resultado en este archivo")
+    parser.add_argument("--compare", help="Resultado previo (--output) contra el cual comparar")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Cambio mínimo significativo, en %%")
+    args = parser.parse_args()
+
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        if base["metadata"]["dictionary_size"] != args.dictionary_size:
+            parser.error("--compare requiere el mismo --dictionary-size que el resultado base")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _fixture_environment(tmp, args.dictionary_size)
+        # Los mensajes de carga del servicio van a stderr: stdout queda para el JSON
+        with redirect_stdout(sys.stderr):
+            benchmarks = {name: fn for name, fn in _benchmarks().items() if args.filter in name}
+            results = {name: _run(fn, args.samples, args.min_time_ms / 1000) for name, fn in benchmarks.items()}
+
+    report = {
+        "metadata": {
+            "revision": _git_revision(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dictionary_size": args.dictionary_size,
+            "samples": args.samples,
+            "min_time_ms": args.min_time_ms,
+        },
+        "benchmarks": results,
+    }
+    if base is not None:
+        report["comparison"] = _compare(base["benchmarks"], results, args.threshold)
+        report["metadata"]["base_revision"] = base["metadata"]["revision"]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
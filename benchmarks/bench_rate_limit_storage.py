@@ -0,0 +1,106 @@
+"""
+Storage del rate limiting: costo por verificación y límite efectivo con varios workers.
+
+Escenarios:
+    - check_us: microsegundos por hit (ventana deslizante) en un proceso,
+      con memory:// y con sqlite:// (archivo temporal en modo WAL)
+    - workers: N procesos golpean la misma clave con un límite L por minuto;
+      con memory:// cada worker cuenta por su lado (se aceptan ~N*L), con
+      sqlite:// el límite es compartido (se aceptan L)
+    - key_func_us: costo de get_client_ip detrás de un proxy de confianza
+
+Uso:
+    python benchmarks/bench_rate_limit_storage.py [--workers 4] [--limit 50] [--hits 2000]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+def _limiter(uri: str):
+    from limits.strategies import SlidingWindowCounterRateLimiter
+    from limits.storage import storage_from_string
+    import src.adapters.rate_limit_storage  # noqa: F401 (registra sqlite://)
+
+    return SlidingWindowCounterRateLimiter(storage_from_string(uri))
+
+
+def _worker(uri: str, limit: int, hits: int, accepted) -> None:
+    from limits import parse
+
+    limiter, item = _limiter(uri), parse(f"{limit}/minute")
+    count = sum(limiter.hit(item, "bench", "login") for _ in range(hits))
+    with accepted.get_lock():
+        accepted.value += count
+
+
+def _accepted_with_workers(uri: str, workers: int, limit: int, hits: int) -> int:
+    accepted = multiprocessing.Value("i", 0)
+    processes = [multiprocessing.Process(target=_worker, args=(uri, limit, hits, accepted)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return accepted.value
+
+
+def _check_us(uri: str, hits: int) -> float:
+    from limits import parse
+
+    limiter, item = _limiter(uri), parse("1000000/minute")
+    start = time.perf_counter()
+    for i in range(hits):
+        limiter.hit(item, f"10.0.{i % 256}.{i % 7}", "login")
+    return (time.perf_counter() - start) / hits * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--hits", type=int, default=2000, help="Hits por escenario (y por worker)")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault("TRUSTED_PROXIES", "10.0.0.0/8")
+    uris = {"memory": "memory://", "sqlite": f"sqlite:///{os.path.join(tmp.name, 'rl.db')}"}
+
+    from starlette.requests import Request
+    from src.adapters.api.rate_limiter import get_client_ip
+
+    request = Request({
+        "type": "http", "client": ("10.1.2.3", 50000),
+        "headers": [(b"x-forwarded-for", b"1.2.3.4, 203.0.113.9, 10.0.0.7")],
+    })
+    start = time.perf_counter()
+    for _ in range(args.hits * 10):
+        get_client_ip(request)
+    key_func_us = (time.perf_counter() - start) / (args.hits * 10) * 1e6
+
+    report = {
+        "check_us": {name: round(_check_us(uri, args.hits), 2) for name, uri in uris.items()},
+        "workers": {
+            "workers": args.workers,
+            "limit": args.limit,
+            "accepted": {
+                name: _accepted_with_workers(uri, args.workers, args.limit, args.hits // args.workers)
+                for name, uri in uris.items()
+            },
+        },
+        "key_func_us": round(key_func_us, 2),
+        "client_ip": get_client_ip(request),
+    }
+    print(json.dumps(report, indent=2))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+CPU de bcrypt que ahorran los refresh tokens con una carga de sesiones realista.
+
+Modelo: cada sesión dura un tiempo tomado de una distribución log-normal
+(por defecto mediana de 4 h, una jornada escolar, con colas largas). Cada vez
+que expira el access token (ACCESS_TOKEN_EXPIRE_MINUTES) el cliente necesita
+uno nuevo:
+    - sin refresh tokens: vuelve a /login -> una verificación bcrypt
+    - con refresh tokens: llama a /token/refresh -> búsqueda por clave primaria,
+      rotación y firma del JWT, sin bcrypt
+
+Los costos unitarios se miden en este equipo (tiempo de CPU del proceso): una
+verificación bcrypt real y una renovación completa con RefreshAccessTokenUseCase
+sobre una base SQLite temporal.
+
+Uso:
+    python benchmarks/bench_refresh_savings.py [--sessions 100000] [--median-session-minutes 240]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cpu_seconds(fn, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--median-session-minutes", type=float, default=240.0)
+    parser.add_argument("--sigma", type=float, default=0.8, help="Dispersión de la log-normal")
+    parser.add_argument("--access-minutes", type=float, help="Por defecto ACCESS_TOKEN_EXPIRE_MINUTES")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    from src.adapters.password_hashers import hash_password, verify_password
+    from src.adapters.repositories.database import Base, SessionLocal, get_engine
+    from src.adapters.repositories.sql_refresh_token_repository import SQLRefreshTokenRepository
+    from src.config import get_settings
+    from src.use_cases.dtos import RefreshTokenRequestDTO
+    from src.use_cases.refresh_token import RefreshAccessTokenUseCase, new_refresh_token
+
+    access_minutes = args.access_minutes or get_settings().access_token_expire_minutes
+
+    # Costo unitario de una verificación bcrypt (lo que cuesta cada re-login)
+    plain = "Bench-Refresh-2024!"
+    hashed = hash_password(plain)
+    bcrypt_cpu = _cpu_seconds(lambda: verify_password(plain, hashed), 5)
+
+    # Costo unitario de una renovación con refresh token
+    Base.metadata.create_all(bind=get_engine())
+    with SessionLocal() as db:
+        repository = SQLRefreshTokenRepository(db)
+        use_case = RefreshAccessTokenUseCase(repository)
+        token, entity = new_refresh_token(uuid.uuid4())
+        repository.add(entity)
+        current = [token]
+
+        def refresh():
+            current[0] = use_case.execute(RefreshTokenRequestDTO(refresh_token=current[0])).refresh_token
+
+        for _ in range(20):
+            refresh()  # Calentamiento (compilación de consultas, carga de jose)
+        refresh_cpu = _cpu_seconds(refresh, 500)
+
+    # Renovaciones por sesión según la distribución de duraciones
+    rng = random.Random(args.seed)
+    mu = math.log(args.median_session_minutes)
+    renewals = 0
+    for _ in range(args.sessions):
+        minutes = rng.lognormvariate(mu, args.sigma)
+        renewals += max(0, math.ceil(minutes / access_minutes) - 1)
+
+    without_refresh = (args.sessions + renewals) * bcrypt_cpu
+    with_refresh = args.sessions * bcrypt_cpu + renewals * refresh_cpu
+
+    print(json.dumps({
+        "sessions": args.sessions,
+        "access_token_minutes": access_minutes,
+        "median_session_minutes": args.median_session_minutes,
+        "renewals_per_session": round(renewals / args.sessions, 2),
+        "unit_cpu_ms": {"bcrypt_verify": round(bcrypt_cpu * 1000, 2), "refresh": round(refresh_cpu * 1000, 3)},
+        "cpu_seconds": {"without_refresh": round(without_refresh, 1), "with_refresh": round(with_refresh, 1)},
+        "bcrypt_verifications_avoided": renewals,
+        "cpu_saved_pct": round(100 * (1 - with_refresh / without_refresh), 1) if without_refresh else 0.0,
+    }, indent=2))
+    get_engine().dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
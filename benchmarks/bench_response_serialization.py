@@ -0,0 +1,137 @@
+"""
+Costo de serializar las respuestas de GET /users/{id} y /login.
+
+Para el DTO que arma cada caso de uso compara, por respuesta:
+    - standard: lo que hace FastAPI con `response_model` (volcado del DTO,
+      revalidación, jsonable_encoder y json de la biblioteca estándar)
+    - fast: FastJSONResponse (orjson directo sobre el DTO, FAST_RESPONSES=true)
+y verifica que ambos cuerpos sean idénticos.
+
+Además mide GET /users/{id} de punta a punta contra la app ASGI (SQLite
+temporal) con FAST_RESPONSES desactivado y activado.
+
+Uso:
+    python benchmarks/bench_response_serialization.py [--iterations 20000] [--requests 3000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+def _route(app, path: str, method: str):
+    return next(r for r in app.routes if getattr(r, "path", None) == path and method in r.methods)
+
+
+async def _serialization_us(route, dto, iterations: int) -> dict:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    from src.adapters.api.responses import FastJSONResponse
+
+    async def standard() -> bytes:
+        content = await serialize_response(field=route.response_field, response_content=dto, is_coroutine=True)
+        return JSONResponse(content).body
+
+    async def fast() -> bytes:
+        return FastJSONResponse(dto).body
+
+    standard_body, fast_body = await standard(), await fast()
+    if standard_body != fast_body:
+        raise AssertionError(f"Cuerpos distintos:\n{standard_body}\n{fast_body}")
+
+    result = {}
+    for name, fn in (("standard_us", standard), ("fast_us", fast)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        result[name] = round((time.perf_counter() - start) / iterations * 1e6, 2)
+    result["speedup"] = round(result["standard_us"] / result["fast_us"], 2)
+    result["bytes"] = len(fast_body)
+    return result
+
+
+async def _get_user_request_us(app, user_id: str, requests: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        headers = {"X-User-Context": user_id}
+        for _ in range(100):
+            assert (await client.get(f"/users/{user_id}", headers=headers)).status_code == 200
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(f"/users/{user_id}", headers=headers)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def _run(args) -> dict:
+    from src.adapters.api.main import app, create_db_and_tables
+    from src.adapters.repositories.database import SessionLocal
+    from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+    from src.config import get_settings
+    from src.domain.entities.profile import Profile
+    from src.domain.entities.user import User
+    from src.domain.value_objects.email import Email
+    from src.domain.value_objects.enums import Entorno, NivelEducativo
+    from src.domain.value_objects.password import Password
+    from src.use_cases.get_user import GetUserUseCase
+    from src.use_cases.dtos import LoginResponseDTO
+
+    create_db_and_tables()
+    user_id = uuid.uuid4()
+    user = User(
+        user_id=user_id, username="usuario_prueba", age=25,
+        email=Email(value="prueba@example.com"),
+        password=Password.from_hash("$2b$12$C6UzMDM.H6dfI/f/IKcEeO5tPmQ8tG2V1a9aZ1hN0gV3wqJkW6W2a"),
+        profile=Profile(user_id=user_id, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.SECUNDARIA),
+    )
+    with SessionLocal() as db:
+        MySQLUserRepository(db).save(user)
+
+    user_dto = GetUserUseCase._to_response(user)
+    login_dto = LoginResponseDTO(access_token="eyJ" + "a" * 300, refresh_token="r" * 43)
+
+    report = {
+        "get_user": await _serialization_us(_route(app, "/users/{user_id}", "GET"), user_dto, args.iterations),
+        "login": await _serialization_us(_route(app, "/login", "POST"), login_dto, args.iterations),
+    }
+
+    end_to_end = {}
+    for mode, enabled in (("standard_us", "false"), ("fast_us", "true")):
+        os.environ["FAST_RESPONSES"] = enabled
+        get_settings.cache_clear()
+        end_to_end[mode] = round(await _get_user_request_us(app, str(user_id), args.requests), 1)
+    end_to_end["saved_us"] = round(end_to_end["standard_us"] - end_to_end["fast_us"], 1)
+    report["get_user_request"] = end_to_end
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    try:
+        # Los mensajes de arranque del servicio van a stderr: stdout queda para el JSON
+        with redirect_stdout(sys.stderr):
+            report = asyncio.run(_run(args))
+    finally:
+        tmp.cleanup()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Validaciones de token por segundo en un núcleo (un solo hilo).
+
+Escenarios:
+    - baseline: lo que hacía /validate-token antes de la caché (imports dentro
+      de la función + get_settings + jwt.decode en cada llamada)
+    - miss:     verify_access_token con tokens siempre distintos (caché fría)
+    - hit:      verify_access_token sobre un conjunto pequeño de tokens que el
+      gateway repite (caché caliente: sin verificación de firma)
+
+Uso:
+    python benchmarks/bench_validate_token.py [--seconds 2] [--tokens 1000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.adapters.security import create_access_token, get_token_cache, verify_access_token
+
+
+def baseline_validate(token: str):
+    from jose import JWTError, jwt
+    from src.config import get_settings
+
+    settings = get_settings()
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]).get("sub")
+    except JWTError:
+        return None
+
+
+def _rate(fn, tokens, seconds: float) -> float:
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            fn(token)
+        calls += len(tokens)
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--tokens", type=int, default=1000, help="Tokens distintos en el escenario hit")
+    args = parser.parse_args()
+
+    hot = [create_access_token({"sub": str(uuid.uuid4())}) for _ in range(args.tokens)]
+    baseline = _rate(baseline_validate, hot, args.seconds)
+
+    cache = get_token_cache()
+    cache.clear()
+    # Escenario miss: cada token se valida una sola vez
+    cold = [create_access_token({"sub": str(uuid.uuid4())}) for _ in range(int(baseline * args.seconds * 1.5))]
+    start = time.perf_counter()
+    for token in cold:
+        verify_access_token(token)
+    miss = len(cold) / (time.perf_counter() - start)
+
+    cache.clear()
+    for token in hot:
+        verify_access_token(token)
+    hit = _rate(verify_access_token, hot, args.seconds)
+
+    print(json.dumps({
+        "validations_per_second": {
+            "baseline": round(baseline),
+            "miss": round(miss),
+            "hit": round(hit),
+        },
+        "hit_speedup": round(hit / baseline, 1),
+        "cache": cache.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Presupuesto de tiempo de arranque del servicio.
+
+Ejecuta `python -X importtime -c "import <módulo>"` varias veces en procesos
+nuevos, toma el mínimo por módulo (el valor menos afectado por ruido) y
+reporta el costo acumulado de importación de cada módulo de `src`, además de
+las dependencias externas más pesadas.
+
+Termina con código 1 si el costo total supera el presupuesto configurado
+(--budget-ms o la variable de entorno IMPORT_BUDGET_MS).
+
+Uso:
+    python benchmarks/import_time.py [--module src.adapters.api.main] [--runs 5] [--budget-ms 1500] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULE = "src.adapters.api.main"
+DEFAULT_BUDGET_MS = 1500.0
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def _measure_once(module: str) -> List[Tuple[str, int, int, int]]:
+    """Devuelve (módulo, self_us, cumulative_us, nivel) para cada import del proceso."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"No se pudo importar '{module}'")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def measure(module: str, runs: int) -> Tuple[float, Dict[str, float]]:
+    """Costo total (ms) y costo acumulado mínimo por módulo (ms) sobre `runs` ejecuciones."""
+    _measure_once(module)  # Calienta la caché de bytecode
+    totals: List[float] = []
+    per_module: Dict[str, float] = {}
+    for _ in range(runs):
+        rows = _measure_once(module)
+        # Los imports de nivel superior suman el costo completo del proceso
+        totals.append(sum(cumulative for _, _, cumulative, level in rows if level == 0) / 1000)
+        seen: Dict[str, float] = {}
+        for name, _, cumulative, _ in rows:
+            seen[name] = max(seen.get(name, 0.0), cumulative / 1000)
+        for name, value in seen.items():
+            per_module[name] = min(per_module.get(name, value), value)
+    return min(totals), per_module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--top", type=int, default=10, help="Dependencias externas a mostrar")
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args()
+
+    total_ms, per_module = measure(args.module, args.runs)
+    src_modules = {name: ms for name, ms in per_module.items() if name == "src" or name.startswith("src.")}
+    external = {
+        name: ms for name, ms in per_module.items()
+        if not name.startswith("src") and "." not in name
+    }
+    heaviest = sorted(external.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    passed = total_ms <= args.budget_ms
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "total_ms": round(total_ms, 1),
+            "budget_ms": args.budget_ms,
+            "passed": passed,
+            "src_modules_ms": {k: round(v, 1) for k, v in sorted(src_modules.items())},
+            "heaviest_dependencies_ms": {k: round(v, 1) for k, v in heaviest},
+        }, indent=2))
+    else:
+        print(f"Costo acumulado de importación por módulo de src ({args.runs} ejecuciones, mínimo):")
+        for name, ms in sorted(src_modules.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {ms:9.1f} ms  {name}")
+        print("\nDependencias externas más pesadas:")
+        for name, ms in heaviest:
+            print(f"  {ms:9.1f} ms  {name}")
+        print(f"\nTotal: {total_ms:.1f} ms (presupuesto: {args.budget_ms:.1f} ms) -> {'OK' if passed else 'EXCEDIDO'}")
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""
+Prueba de carga de punta a punta contra el servicio sobre SQLite.
+
+Levanta la aplicación con una base SQLite temporal en lugar de MySQL, ya sea
+dentro del mismo proceso (httpx + ASGITransport, sin red) o como servidor
+uvicorn en un subproceso (--mode uvicorn, con --workers), y reproduce una
+mezcla ponderada de operaciones:
+
+    register   POST /register          (201)
+    login      POST /login             (200)
+    validate   GET  /validate-token    (200)
+    get        GET  /users/{id}        (200)
+    update     PUT  /users/{id}        (200)
+    delete     DELETE /users/{id}      (204)
+
+Los cuerpos se arman a partir de request_registro.json y request_login.json,
+con email y username únicos por usuario virtual. get/update/delete envían
+X-User-Context como lo haría el API Gateway tras /validate-token.
+
+Antes de medir se registran --users usuarios con sesión iniciada. La carga
+puede ser de lazo cerrado (--concurrency N: N clientes que encadenan
+requests) o abierto (--rps R: llegadas Poisson a R requests por segundo, sin
+esperar respuestas, hasta --max-inflight en vuelo).
+
+Cada request sale con una IP de cliente distinta en X-Forwarded-For (el
+stack se levanta con TRUSTED_PROXIES=127.0.0.1), tomada de --client-ips
+direcciones; con --client-ips 1 todo el tráfico comparte los límites de
+rate limiting por IP, como detrás de un NAT.
+
+Con --url se apunta a un servicio ya levantado (no se crea el stack).
+--bcrypt-rounds baja el costo del hash para medir el resto del stack; las
+cifras de capacidad de register/login solo valen con el costo de producción.
+
+Reporte JSON: throughput, p50/p95/p99 y tasa de error por endpoint.
+
+Uso:
+    python benchmarks/load_test.py [--duration 30] [--concurrency 16 | --rps 50]
+        [--mix register=1,login=2,validate=10,get=5,update=1,delete=0.5]
+        [--mode inprocess|uvicorn] [--workers 1] [--users 20] [--bcrypt-rounds 12]
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextlib import redirect_stdout
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+EXPECTED_STATUS = {"register": 201, "login": 200, "validate": 200, "get": 200, "update": 200, "delete": 204}
+DEFAULT_MIX = "register=1,login=2,validate=10,get=5,update=1,delete=0.5"
+CLIENT_NETWORK = ipaddress.ip_network("10.0.0.0/8")
+
+
+def _parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in EXPECTED_STATUS:
+            raise ValueError(f"Operación desconocida en --mix: {name!r} (válidas: {', '.join(EXPECTED_STATUS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("--mix no tiene ninguna operación con peso > 0")
+    return mix
+
+
+def _load_template(name: str) -> dict:
+    with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Workload:
+    """Usuarios virtuales y las operaciones que los usan."""
+
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.rng = random.Random(args.seed)
+        self.client_ips = args.client_ips
+        self.register_template = _load_template("request_registro.json")
+        self.login_template = _load_template("request_login.json")
+        self.users = []  # dicts con user_id, email, password, token
+        self.sequence = 0
+
+    def _headers(self, user=None) -> dict:
+        ip = CLIENT_NETWORK[1 + self.rng.randrange(self.client_ips)]
+        headers = {"X-Forwarded-For": str(ip)}
+        if user is not None:
+            headers["X-User-Context"] = user["user_id"]
+        return headers
+
+    def _new_identity(self) -> dict:
+        self.sequence += 1
+        suffix = f"{self.sequence}_{uuid.uuid4().hex[:6]}"
+        body = dict(self.register_template)
+        body["username"] = f"{body['username'][:14]}_{suffix}"
+        local, _, domain = body["email"].partition("@")
+        body["email"] = f"{local}+{suffix}@{domain}"
+        body.setdefault("confirm_password", body["password"])
+        return body
+
+    def _pick(self):
+        return self.rng.choice(self.users) if self.users else None
+
+    async def register(self):
+        response, _ = await self.register_user()
+        return response
+
+    async def register_user(self):
+        """Registra un usuario nuevo; devuelve la respuesta y el usuario agregado al pool (o None)."""
+        body = self._new_identity()
+        response = await self.client.post("/register", json=body, headers=self._headers())
+        user = None
+        if response.status_code == 201:
+            user = {
+                "user_id": response.json()["user_id"], "email": body["email"],
+                "password": body["password"], "token": None,
+            }
+            self.users.append(user)
+        return response, user
+
+    async def login(self, user=None):
+        user = user or self._pick()
+        if user is None:
+            return await self.register()
+        body = {**self.login_template, "email": user["email"], "password": user["password"]}
+        response = await self.client.post("/login", json=body, headers=self._headers())
+        if response.status_code == 200:
+            user["token"] = response.json()["access_token"]
+        return response
+
+    async def validate(self):
+        user = self._pick()
+        if user is None or user["token"] is None:
+            return await self.login(user)
+        headers = {**self._headers(), "Authorization": f"Bearer {user['token']}"}
+        return await self.client.get("/validate-token", headers=headers)
+
+    async def get(self):
+        user = self._pick()
+        if user is None:
+            return await self.register()
+        return await self.client.get(f"/users/{user['user_id']}", headers=self._headers(user))
+
+    async def update(self):
+        user = self._pick()
+        if user is None:
+            return await self.register()
+        body = {"age": self.rng.randint(18, 99)}
+        return await self.client.put(f"/users/{user['user_id']}", json=body, headers=self._headers(user))
+
+    async def delete(self):
+        if not self.users:
+            return await self.register()
+        # Se saca del pool antes de enviar, para que ninguna otra operación lo elija
+        user = self.users.pop(self.rng.randrange(len(self.users)))
+        return await self.client.delete(f"/users/{user['user_id']}", headers=self._headers(user))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, operation: str, status: str, seconds: float) -> None:
+        if self.recording:
+            self.latencies[operation].append(seconds)
+            self.statuses[operation][status] += 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        total = errors = 0
+        for operation, samples in sorted(self.latencies.items()):
+            samples.sort()
+            pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+            expected = str(EXPECTED_STATUS[operation])
+            failed = sum(n for status, n in self.statuses[operation].items() if status != expected)
+            total += len(samples)
+            errors += failed
+            endpoints[operation] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed, 2),
+                "error_rate": round(failed / len(samples), 4),
+                "statuses": dict(self.statuses[operation]),
+                "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": pick(1.0),
+            }
+        return {
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+async def _execute(workload: Workload, recorder: Recorder, operation: str) -> None:
+    # La operación efectiva puede cambiar (p. ej. login sin usuarios registra uno);
+    # se registra bajo el endpoint que realmente se llamó
+    start = time.perf_counter()
+    try:
+        response = await getattr(workload, operation)()
+    except httpx.HTTPError as e:
+        recorder.record(operation, f"exception:{type(e).__name__}", time.perf_counter() - start)
+        return
+    elapsed = time.perf_counter() - start
+    recorder.record(_operation_of(response.request), str(response.status_code), elapsed)
+
+
+def _operation_of(request: httpx.Request) -> str:
+    path, method = request.url.path, request.method
+    if path == "/register":
+        return "register"
+    if path == "/login":
+        return "login"
+    if path == "/validate-token":
+        return "validate"
+    return {"GET": "get", "PUT": "update", "DELETE": "delete"}[method]
+
+
+async def _seed(workload: Workload, users: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            _, user = await workload.register_user()
+            if user is not None:
+                await workload.login(user)
+
+    await asyncio.gather(*(one() for _ in range(users)))
+    if len(workload.users) < users:
+        raise RuntimeError(f"Solo se pudieron registrar {len(workload.users)} de {users} usuarios iniciales")
+
+
+async def _drive(args, client: httpx.AsyncClient) -> dict:
+    mix = _parse_mix(args.mix)
+    operations, weights = list(mix), list(mix.values())
+    workload = Workload(client, args)
+    recorder = Recorder()
+
+    await _seed(workload, args.users, max(1, min(args.users, args.concurrency or 8)))
+
+    rng = random.Random(args.seed + 1)
+    deadline = time.perf_counter() + args.warmup + args.duration
+    dropped = 0
+
+    async def measure_after_warmup():
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+
+    warmup = asyncio.ensure_future(measure_after_warmup())
+
+    if args.rps:
+        inflight = set()
+        next_arrival = time.perf_counter()
+        while next_arrival < deadline:
+            if len(inflight) >= args.max_inflight:
+                dropped += recorder.recording
+            else:
+                task = asyncio.ensure_future(_execute(workload, recorder, rng.choices(operations, weights)[0]))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+            next_arrival += rng.expovariate(args.rps)
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        recorder.recording = False  # Las respuestas de después del cierre no cuentan
+        if inflight:
+            await asyncio.wait(inflight)
+    else:
+        async def client_loop():
+            while time.perf_counter() < deadline:
+                await _execute(workload, recorder, rng.choices(operations, weights)[0])
+
+        await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+    await warmup
+
+    report = recorder.report(args.duration)
+    if args.rps:
+        report["dropped_client_side"] = dropped
+    return report
+
+
+async def _run_inprocess(args) -> dict:
+    from src.adapters.api.main import app
+
+    # El lifespan de la app (precalentamiento, cierre de executors) corre igual que bajo uvicorn
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=args.timeout) as client:
+            await _wait_ready(client, None, 60.0)
+            return await _drive(args, client)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(client: httpx.AsyncClient, process, timeout: float) -> None:
+    """Espera a que /ready responda 200 (precalentamiento terminado)."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+        try:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return
+            if response.json().get("status") == "failed":
+                raise RuntimeError(f"Falló el precalentamiento del servicio: {response.json()}")
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("El servicio no respondió /ready a tiempo")
+
+
+async def _run_remote(args, base_url: str, process=None) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency or args.max_inflight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        if process is not None:
+            await _wait_ready(client, process, 60.0)
+        return await _drive(args, client)
+
+
+def _create_tables() -> None:
+    # El servicio no ejecuta DDL al arrancar: las tablas se crean antes, una sola vez
+    from src.adapters.repositories import db_models  # noqa: F401 (registra los modelos)
+    from src.adapters.repositories.database import Base, get_engine
+
+    Base.metadata.create_all(bind=get_engine())
+    get_engine().dispose()
+
+
+def _run_uvicorn(args) -> dict:
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", "src.adapters.api.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers),
+        "--no-access-log", "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, env=os.environ.copy(), stdout=sys.stderr)
+    try:
+        return asyncio.run(_run_remote(args, f"http://127.0.0.1:{port}", process))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="Clientes concurrentes (lazo cerrado; por defecto 16)")
+    load.add_argument("--rps", type=float, help="Requests por segundo (lazo abierto)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos previos que no se miden")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Pesos por operación")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn (--mode uvicorn)")
+    parser.add_argument("--url", help="Servicio ya levantado (no se crea el stack local)")
+    parser.add_argument("--users", type=int, default=20, help="Usuarios registrados antes de medir")
+    parser.add_argument("--client-ips", type=int, default=65536, help="IPs de cliente distintas")
+    parser.add_argument("--bcrypt-rounds", type=int, help="Costo de bcrypt del stack local")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Tope de requests en vuelo con --rps")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por request en segundos")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if not args.rps and not args.concurrency:
+        args.concurrency = 16
+    try:
+        _parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 1 <= args.client_ips <= CLIENT_NETWORK.num_addresses - 2:
+        parser.error("--client-ips fuera de rango")
+
+    config = {key: value for key, value in vars(args).items() if value is not None}
+    if args.url:
+        report = asyncio.run(_run_remote(args, args.url.rstrip("/")))
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        database = os.path.join(tmp.name, "load_test.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+        os.environ["TRUSTED_PROXIES"] = "127.0.0.1"
+        if args.bcrypt_rounds:
+            os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+        try:
+            # Los mensajes del servicio van a stderr: stdout queda solo para el reporte
+            with redirect_stdout(sys.stderr):
+                _create_tables()
+                report = asyncio.run(_run_inprocess(args)) if args.mode == "inprocess" else _run_uvicorn(args)
+        finally:
+            tmp.cleanup()
+
+    print(json.dumps({"config": config, **report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
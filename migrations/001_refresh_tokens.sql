@@ -0,0 +1,20 @@
+-- 001_refresh_tokens.sql
+-- Tabla de refresh tokens (rotación con detección de reutilización).
+-- Aplicar ANTES de desplegar la versión que emite refresh tokens: sin esta
+-- tabla el precalentamiento falla en el paso "schema", /ready responde 503 y
+-- /login no puede guardar el token de la sesión.
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_hash CHAR(64) NOT NULL,   -- SHA-256 en hexadecimal del token
+    user_id CHAR(36) NOT NULL,
+    family_id CHAR(36) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at DATETIME NULL,
+    used_at DATETIME NULL,
+    revoked_at DATETIME NULL,
+    PRIMARY KEY (token_hash),
+    INDEX ix_refresh_tokens_user_id (user_id),
+    INDEX ix_refresh_tokens_family_id (family_id),
+    INDEX ix_refresh_tokens_expires_at (expires_at),
+    CONSTRAINT fk_refresh_tokens_user_id FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE
+) ENGINE=InnoDB;
@@ -0,0 +1,17 @@
+-- 002_keyset_indexes.sql
+-- Índices del listado paginado por cursor (GET /admin/users y la exportación
+-- NDJSON). Sin ellos cada página ordena y filtra la tabla completa.
+-- Sobre tablas grandes conviene aplicarlo fuera de horario pico: InnoDB crea
+-- los índices en línea (ALGORITHM=INPLACE) sin bloquear las escrituras.
+-- profiles.user_id no necesita uno propio: MySQL ya indexa la clave foránea.
+
+-- El cursor es (created_at, user_id): una fila con created_at NULL no se puede
+-- codificar como cursor ni la alcanza la condición de la página siguiente.
+-- Se completa con la fecha de la migración y la columna pasa a NOT NULL
+-- (reconstruye la tabla en línea, como los índices).
+UPDATE users SET created_at = UTC_TIMESTAMP() WHERE created_at IS NULL;
+ALTER TABLE users MODIFY created_at DATETIME NOT NULL, ALGORITHM=INPLACE, LOCK=NONE;
+
+CREATE INDEX ix_users_created_at_user_id ON users (created_at, user_id) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_profiles_entorno_nivel_educativo ON profiles (entorno, nivel_educativo, user_id) ALGORITHM=INPLACE LOCK=NONE;
+CREATE INDEX ix_profiles_nivel_educativo ON profiles (nivel_educativo, user_id) ALGORITHM=INPLACE LOCK=NONE;
@@ -0,0 +1,213 @@
+# src/adapters/admission.py
+"""
+Control de admisión del hashing de contraseñas.
+
+Cada verificación o hash ocupa un núcleo durante cientos de milisegundos. Sin
+límite, una ola de credential stuffing contra /login o un pico de registros
+encola trabajo sin cota y la latencia crece para todos hasta que los requests
+vencen. El controlador reparte los `slots` del executor de hashing:
+
+- Cola acotada (HASH_QUEUE_MAX) con espera máxima (HASH_QUEUE_MAX_WAIT_MS):
+  lo que no entra o no llega a tiempo se rechaza enseguida con 503 y
+  Retry-After, así la latencia de lo admitido queda acotada.
+- Prioridades: login antes que registro, y ambos antes que los trabajos en
+  lote (re-hash en segundo plano, importaciones). Con la cola llena, un
+  request de mayor prioridad desplaza al último de menor prioridad.
+
+Las métricas (profundidad de la cola, esperas, rechazos) se exponen en
+/internal/admission.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+from src.config import get_settings
+
+# Esperas recientes que se guardan para los percentiles
+_WAIT_SAMPLES = 2048
+_DEFAULT = object()
+
+
+class HashPriority(IntEnum):
+    """Menor valor = mayor prioridad."""
+    LOGIN = 0
+    REGISTER = 1
+    BULK = 2
+
+
+class AdmissionRejected(Exception):
+    """El hashing no pudo admitirse: la cola estaba llena o se superó la espera máxima."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Hashing rechazado ({reason}); reintentar en {retry_after} s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+Waiter = Tuple["asyncio.Future[None]", float]
+
+
+class AdmissionController:
+    """
+    Semáforo con cola de prioridad acotada. Debe usarse desde el event loop;
+    los hilos del threadpool de AnyIO usan slot_from_thread().
+    """
+
+    def __init__(self, slots: int, max_queue: int, max_wait: Optional[float]):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._in_use = 0
+        self._queues: Dict[HashPriority, Deque[Waiter]] = {priority: deque() for priority in HashPriority}
+        self._waits: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self._service_time = 0.25  # Promedio móvil de la duración de cada operación (s)
+        self._admitted = {priority: 0 for priority in HashPriority}
+        self._rejected = {"queue_full": 0, "timeout": 0, "evicted": 0}
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def retry_after(self) -> int:
+        """Segundos estimados hasta que se libere lugar, según la cola actual."""
+        return max(1, math.ceil((self.depth / self.slots + 1) * self._service_time))
+
+    async def acquire(self, priority: HashPriority, max_wait: Any = _DEFAULT) -> None:
+        """Espera un slot; lanza AdmissionRejected si no se admite."""
+        if self._in_use < self.slots and not self.depth:
+            self._in_use += 1
+            self._admit(priority, 0.0)
+            return
+
+        if self.depth >= self.max_queue and not self._evict_below(priority):
+            self._rejected["queue_full"] += 1
+            raise AdmissionRejected("queue_full", self.retry_after())
+
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        waiter = (future, time.monotonic())
+        self._queues[priority].append(waiter)
+        timeout = self.max_wait if max_wait is _DEFAULT else max_wait
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._discard(priority, waiter)
+            self._rejected["timeout"] += 1
+            raise AdmissionRejected("timeout", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()  # El slot llegó junto con la cancelación: se devuelve
+            self._discard(priority, waiter)
+            raise
+        self._admit(priority, time.monotonic() - waiter[1])
+
+    def release(self) -> None:
+        """Libera un slot, entregándolo directamente al siguiente en la cola si lo hay."""
+        for queue in self._queues.values():
+            while queue:
+                future, _ = queue.popleft()
+                if not future.done():
+                    future.set_result(None)
+                    return
+        self._in_use -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: HashPriority, max_wait: Any = _DEFAULT) -> AsyncIterator[None]:
+        await self.acquire(priority, max_wait)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_time = 0.9 * self._service_time + 0.1 * (time.monotonic() - start)
+            self.release()
+
+    @contextmanager
+    def slot_from_thread(self, priority: HashPriority = HashPriority.BULK) -> Iterator[None]:
+        """
+        Slot para código síncrono que corre en un hilo de AnyIO (p. ej. el
+        generador de una StreamingResponse). Los trabajos en lote no se
+        descartan: si se los rechaza, vuelven a intentar pasado Retry-After.
+        La salida puede ocurrir en cualquier hilo (p. ej. el callback de un
+        Future de otro executor): el slot se devuelve a través del event loop.
+        """
+        from anyio import from_thread
+        from anyio.lowlevel import current_token
+
+        token = from_thread.run_sync(current_token)
+        while True:
+            try:
+                from_thread.run(self.acquire, priority, None)
+                break
+            except AdmissionRejected as e:
+                time.sleep(e.retry_after)
+        try:
+            yield
+        finally:
+            from_thread.run_sync(self.release, token=token)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 2) if waits else 0.0
+
+        return {
+            "slots": self.slots,
+            "in_use": self._in_use,
+            "max_queue": self.max_queue,
+            "max_wait_ms": self.max_wait * 1000 if self.max_wait is not None else None,
+            "queue_depth": {priority.name.lower(): len(queue) for priority, queue in self._queues.items()},
+            "admitted": {priority.name.lower(): count for priority, count in self._admitted.items()},
+            "rejected": dict(self._rejected),
+            "wait_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": percentile(1.0)},
+            "service_ms_avg": round(self._service_time * 1000, 2),
+            "retry_after_s": self.retry_after(),
+        }
+
+    def _admit(self, priority: HashPriority, waited: float) -> None:
+        self._admitted[priority] += 1
+        self._waits.append(waited)
+
+    def _evict_below(self, priority: HashPriority) -> bool:
+        """Rechaza al último en espera de menor prioridad que `priority`, si lo hay."""
+        for lower in sorted(HashPriority, reverse=True):
+            if lower <= priority:
+                return False
+            queue = self._queues[lower]
+            while queue:
+                future, _ = queue.pop()
+                if not future.done():
+                    future.set_exception(AdmissionRejected("evicted", self.retry_after()))
+                    self._rejected["evicted"] += 1
+                    return True
+        return False
+
+    def _discard(self, priority: HashPriority, waiter: Waiter) -> None:
+        try:
+            self._queues[priority].remove(waiter)
+        except ValueError:
+            pass  # Ya lo sacó release() o una expulsión
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Controlador del proceso, o None si HASH_ADMISSION_ENABLED está desactivado."""
+    global _controller
+    settings = get_settings()
+    if not settings.hash_admission_enabled:
+        return None
+    if _controller is None:
+        from src.adapters.hashing import _default_workers
+
+        slots = settings.hash_workers or _default_workers()
+        _controller = AdmissionController(
+            slots=slots,
+            max_queue=settings.hash_queue_max or 16 * slots,
+            max_wait=settings.hash_queue_max_wait_ms / 1000 if settings.hash_queue_max_wait_ms else None,
+        )
+    return _controller
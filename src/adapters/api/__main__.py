@@ -0,0 +1,5 @@
+# src/adapters/api/__main__.py
+# python -m src.adapters.api: servidor con preforking (ver server.py)
+from src.adapters.api.server import main
+
+main()
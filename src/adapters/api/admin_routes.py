@@ -0,0 +1,149 @@
+import datetime
+import io
+import json
+import tempfile
+from functools import partial
+from typing import Iterator, Optional
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from src.adapters.api.security import require_admin
+from src.adapters.api.user_routes import get_async_user_repository
+from src.adapters.admission import HashPriority, get_admission_controller
+from src.adapters.bulk_import import detect_format, import_users
+from src.adapters.profiler import ProfilerBusy, capture_profile
+from src.adapters.repositories.database import SessionLocal, get_engine
+from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+from src.config import get_settings
+from src.domain.value_objects.enums import Entorno, NivelEducativo
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.user_repository import UserListFilter
+from src.use_cases.dtos import UserListPageDTO
+from src.use_cases.list_users import ListUsersUseCase
+
+# --- Creación del Router ---
+# Todos los endpoints de administración exigen el header X-Admin-Token
+router = APIRouter(
+    prefix="/admin",
+    tags=["Administración"],
+    dependencies=[Depends(require_admin)]
+)
+
+EXPORT_CHUNK_SIZE = 1000  # Filas que se traen de la BD por vuelta durante la exportación
+MAX_PROFILE_SECONDS = 300  # Duración máxima de un perfilado
+
+
+# --- Inyección de Dependencias ---
+
+def get_user_list_filter(
+    entorno: Optional[Entorno] = None,
+    nivel_educativo: Optional[NivelEducativo] = None,
+    created_from: Optional[datetime.datetime] = Query(None, description="Fecha de alta desde (inclusive)"),
+    created_to: Optional[datetime.datetime] = Query(None, description="Fecha de alta hasta (exclusive)"),
+) -> UserListFilter:
+    return UserListFilter(
+        entorno=entorno, nivel_educativo=nivel_educativo,
+        created_from=created_from, created_to=created_to
+    )
+
+async def get_list_users_use_case(
+    repo: IAsyncUserRepository = Depends(get_async_user_repository)
+) -> ListUsersUseCase:
+    return ListUsersUseCase(user_repository=repo)
+
+
+# --- Definición de Endpoints ---
+
+@router.get("/users", response_model=UserListPageDTO)
+async def list_users(
+    filters: UserListFilter = Depends(get_user_list_filter),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    use_case: ListUsersUseCase = Depends(get_list_users_use_case)
+):
+    """
+    Listado paginado por cursor: para la página siguiente se envía el
+    `next_cursor` de la respuesta anterior (con los mismos filtros).
+    """
+    try:
+        return await use_case.execute_async(filters, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/users/export")
+def export_users(filters: UserListFilter = Depends(get_user_list_filter)):
+    """
+    Exporta todos los usuarios que cumplen los filtros como NDJSON, una línea
+    por usuario, sin cargar el listado en memoria.
+    """
+    def rows() -> Iterator[str]:
+        # Starlette itera este generador en el threadpool, después de que las
+        # dependencias del request se cerraron: abre su propia sesión
+        get_engine()
+        db = SessionLocal()
+        try:
+            use_case = ListUsersUseCase(user_repository=MySQLUserRepository(db))
+            for user in use_case.stream(filters, EXPORT_CHUNK_SIZE):
+                yield user.model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@router.post("/users/import")
+async def import_users_endpoint(request: Request):
+    """
+    Importación masiva de usuarios (alta de escuelas completas).
+
+    El cuerpo es NDJSON (por defecto) o CSV (Content-Type: text/csv) con los
+    campos de /register, una fila por usuario. No aplica el límite de /register.
+    La respuesta es un reporte NDJSON con el resultado de cada fila y un
+    resumen al final, que se va enviando a medida que se procesan los lotes.
+    """
+    fmt = detect_format(request.headers.get("content-type"))
+
+    # El cuerpo se vuelca a un archivo temporal para no retenerlo en memoria
+    upload = tempfile.TemporaryFile()
+    try:
+        async for chunk in request.stream():
+            await to_thread.run_sync(upload.write, chunk)
+        upload.seek(0)
+    except BaseException:
+        upload.close()
+        raise
+
+    controller = get_admission_controller()
+
+    def report() -> Iterator[str]:
+        # Starlette itera este generador en el threadpool; abre su propia sesión
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        try:
+            # Cada hash espera un slot de baja prioridad: login y registro pasan primero
+            admit = partial(controller.slot_from_thread, HashPriority.BULK) if controller else None
+            for item in import_users(lines, fmt, admit=admit):
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            lines.close()
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@router.post("/profile")
+async def profile_endpoint(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Intervalo entre muestras")
+):
+    """
+    Perfila el proceso durante `seconds` muestreando las pilas de todos los
+    hilos mientras atiende tráfico real, y escribe un archivo de "folded
+    stacks" (flamegraph.pl, inferno, speedscope) en PROFILE_DIR. Responde al
+    terminar, con la ruta del archivo. Con varios workers perfila solo el
+    proceso que recibió el request (ver `pid`).
+    """
+    try:
+        return await to_thread.run_sync(
+            capture_profile, seconds, interval_ms / 1000, get_settings().profile_dir or None
+        )
+    except ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Ya hay un perfilado en curso.")
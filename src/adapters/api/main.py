@@ -1,29 +1,81 @@
 # src/adapters/api/main.py
-from fastapi import FastAPI
+import asyncio
+import hashlib
+import json
+import logging
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+from typing import Optional
+from fastapi import FastAPI, Header, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.cors import CORSMiddleware
-from src.adapters.api import user_routes
-from src.adapters.repositories.database import engine, Base
+from src.adapters.api import admin_routes, user_routes
+from src.adapters.repositories.database import get_engine, Base
 from src.adapters.repositories import db_models
 from src.adapters.api.rate_limiter import limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from src.adapters.admission import AdmissionRejected, get_admission_controller
+from src.adapters.hashing import shutdown_hash_executor
+from src.adapters.metrics import RATE_LIMIT_REJECTIONS, REGISTRY, MetricsMiddleware, route_template
+from src.adapters.repositories.async_database import current_async_engine, dispose_async_engine
+from src.adapters.repositories.database import current_engine
+from src.adapters.repositories.pool import pool_status
+from src.adapters.timing import ServerTimingMiddleware
+from src.adapters.security import get_token_cache
+from src.adapters.repositories.cached_user_repository import get_user_cache
+from src.adapters.jwt_keys import get_key_ring
+from src.adapters.warmup import WarmupState, run_warmup
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
 
 # --- Función para crear tablas ---
+# Al arrancar ya no se ejecuta DDL (ver src/adapters/warmup.py); queda para
+# scripts y benchmarks que preparan una base vacía
 def create_db_and_tables():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+
+# --- Ciclo de vida ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El precalentamiento corre en segundo plano: el servidor ya acepta
+    # conexiones (/health responde) y /ready devuelve 503 hasta que termine
+    logger.info("La aplicación está iniciando... Precalentando conexiones, diccionario y hashing.")
+    app.state.warmup = WarmupState()
+    warmup = asyncio.create_task(run_warmup(app.state.warmup))
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup
+        shutdown_hash_executor()
+        await dispose_async_engine()
 
-# --- Evento de Inicio ---
-# Esta es la línea que hay que corregir.
-# Reemplaza los '...' por los argumentos de configuración de la app.
 app = FastAPI(
     title="Servicio de Autenticación - Scriptoria AI",
     description="Microservicio para gestionar usuarios y autenticación.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configurar rate limiting
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    RATE_LIMIT_REJECTIONS.labels(route_template(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+# Hashing saturado: se rechaza enseguida en lugar de encolar sin límite
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "El servicio está saturado, intenta nuevamente en unos segundos."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # Configurar CORS para permitir peticiones desde cualquier origen
 # En producción, deberías restringir esto a dominios específicos
@@ -48,20 +100,113 @@ app.add_middleware(
     ]
 )
 
-@app.on_event("startup")
-def on_startup():
-    print("La aplicación está iniciando... Creando tablas de la base de datos si es necesario.")
-    create_db_and_tables()
+# Fases del request en Server-Timing (opcional, ver src/adapters/timing.py)
+app.add_middleware(ServerTimingMiddleware)
+
+# Latencia por ruta y status (ver /metrics); al ser el más externo, mide todo el stack
+app.add_middleware(MetricsMiddleware)
 
 # --- Inclusión de Rutas ---
 app.include_router(user_routes.router)
+app.include_router(admin_routes.router)
 
 # --- Endpoints de Nivel de Aplicación ---
 @app.get("/health", tags=["Monitoring"])
 def health_check():
     """
-    Verifica que el servicio esté funcionando correctamente.
+    Verifica que el servicio esté funcionando correctamente (liveness).
+    """
+    return {"status": "ok"}
+
+@app.get("/ready", tags=["Monitoring"])
+def readiness_check(request: Request):
+    """
+    Indica si la instancia puede recibir tráfico (readiness): 503 hasta que
+    termina el precalentamiento (esquema, pool de conexiones, diccionario y
+    hashing), con el avance de cada paso.
+    """
+    state = getattr(request.app.state, "warmup", None)
+    if state is None:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "pending"})
+    if state.ready:
+        return state.snapshot()
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=state.snapshot(),
+                        headers={"Retry-After": "1"})
+
+@app.get("/internal/db-pool", tags=["Monitoring"])
+def db_pool_status():
+    """
+    Estado de los pools de conexiones: conexiones prestadas, libres y de
+    overflow, y tiempo de espera acumulado al pedir una conexión.
+    """
+    return {
+        "sync": pool_status(current_engine()),
+        "async": pool_status(current_async_engine()),
+    }
+
+@lru_cache
+def _jwks_document() -> tuple:
+    """Cuerpo y ETag del JWKS: las claves solo cambian al reiniciar, se serializa una vez."""
+    key_ring = get_key_ring()
+    body = json.dumps(key_ring.jwks() if key_ring else {"keys": []}, separators=(",", ":")).encode()
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+@app.get("/.well-known/jwks.json", tags=["Autenticación"])
+def jwks(if_none_match: Optional[str] = Header(None)):
+    """
+    Claves públicas activas (JWK Set) para verificar localmente los tokens
+    firmados con RS256/ES256, identificadas por el `kid` del header del token.
+    Con HS256 la lista está vacía.
+    """
+    body, etag = _jwks_document()
+    headers = {
+        "Cache-Control": f"public, max-age={get_settings().jwks_max_age_seconds}",
+        "ETag": etag,
+    }
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/internal/token-cache", tags=["Monitoring"])
+def token_cache_status():
+    """
+    Estado de la caché de tokens verificados de /validate-token: entradas,
+    aciertos, fallos, desalojos, expiraciones y tasa de aciertos.
+    """
+    stats = get_token_cache().stats()
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+@app.get("/internal/user-cache", tags=["Monitoring"])
+def user_cache_status():
+    """
+    Estado de la caché de usuarios (USER_CACHE_ENABLED): entradas, aciertos,
+    fallos, desalojos y expiraciones de cada índice, cargas coalescidas y
+    tasa de aciertos global.
+    """
+    if not get_settings().user_cache_enabled:
+        return {"enabled": False}
+    stats = get_user_cache().stats()
+    hits = sum(stats[index]["hits"] for index in ("by_id", "by_email", "by_username"))
+    misses = sum(stats[index]["misses"] for index in ("by_id", "by_email", "by_username"))
+    stats["hit_rate"] = round(hits / (hits + misses), 4) if hits + misses else 0.0
+    return {"enabled": True, **stats}
+
+@app.get("/internal/admission", tags=["Monitoring"])
+def admission_status():
+    """
+    Control de admisión del hashing: slots en uso, profundidad de la cola por
+    prioridad, operaciones admitidas y rechazadas, y tiempos de espera.
+    """
+    controller = get_admission_controller()
+    return controller.stats() if controller else {"enabled": False}
+
+@app.get("/metrics", tags=["Monitoring"])
+def metrics():
+    """
+    Métricas en formato de texto de Prometheus: latencia por ruta, hashing,
+    repositorio y JWT, rechazos del rate limiting, pool de conexiones,
+    control de admisión y caché de usuarios.
     """
-    # Se debe importar 'status' para usarlo aquí
-    from fastapi import status
-    return {"status": "ok"}
\ No newline at end of file
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,13 +1,96 @@
 """
 Rate limiting para proteger endpoints críticos contra abuso.
 Implementa límites de velocidad según OWASP recomendaciones.
+
+Los contadores usan ventana deslizante y viven en el storage configurado con
+RATE_LIMIT_STORAGE_URI (ver src/adapters/rate_limit_storage.py), de modo que
+todos los workers comparten el mismo límite.
 """
+import ipaddress
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple, Union
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from starlette.requests import Request
+from src.adapters import rate_limit_storage  # Registra los esquemas sqlite:// y settings://
+from src.config import get_settings
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Saltos de X-Forwarded-For que se examinan como máximo (acota el costo por request)
+MAX_FORWARDED_HOPS = 8
+
+
+@lru_cache(maxsize=4)
+def _parse_trusted_proxies(value: str) -> Tuple[FrozenSet[str], Tuple[IPNetwork, ...]]:
+    """Separa las IPs exactas (búsqueda en un set) de los rangos CIDR."""
+    addresses, networks = set(), []
+    for entry in (item.strip() for item in value.split(",")):
+        if not entry:
+            continue
+        if "/" in entry:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        else:
+            addresses.add(str(ipaddress.ip_address(entry)))
+    return frozenset(addresses), tuple(networks)
+
+
+@lru_cache(maxsize=16384)
+def _is_trusted(address: str, trusted_proxies: str) -> bool:
+    """Memoizada: las direcciones del gateway y de los clientes frecuentes se resuelven en O(1)."""
+    addresses, networks = _parse_trusted_proxies(trusted_proxies)
+    if address in addresses:
+        return True
+    if not networks:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
 
-# Inicializar el rate limiter
-limiter = Limiter(key_func=get_remote_address)
+
+def get_client_ip(request: Request) -> str:
+    """
+    IP real del cliente para el rate limiting.
+
+    Si la conexión viene de un proxy de confianza (TRUSTED_PROXIES: IPs o
+    CIDR separados por comas, p. ej. el gateway), se recorre X-Forwarded-For
+    de derecha a izquierda saltando los proxies de confianza: la primera IP
+    restante es la del cliente. Las entradas más a la izquierda las escribe
+    el propio cliente y no se tienen en cuenta. Sin proxies configurados se
+    usa la IP de la conexión, como antes.
+    """
+    remote = get_remote_address(request)
+    trusted = get_settings().trusted_proxies
+    if not trusted or not _is_trusted(remote, trusted):
+        return remote
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return remote
+    hops = forwarded.rsplit(",", MAX_FORWARDED_HOPS)
+    client: Optional[str] = None
+    for hop in reversed(hops[-MAX_FORWARDED_HOPS:]):
+        hop = hop.strip()
+        if not _is_trusted(hop, trusted):
+            client = hop
+            break
+    if client is None:
+        return remote  # Toda la cadena es de confianza
+    try:
+        return str(ipaddress.ip_address(client))
+    except ValueError:
+        return remote  # Entrada malformada: no se usa como clave
+
+
+# Inicializar el rate limiter (el storage se resuelve en el primer request).
+# Un error del storage no convierte el request en un 500: se registra y el
+# request pasa sin límite (swallow_errors), igual que un lock ocupado en SQLiteStorage
+limiter = Limiter(
+    key_func=get_client_ip, strategy="sliding-window-counter", storage_uri="settings://", swallow_errors=True
+)
 
 # Configuración de límites por endpoint
 # Estos límites son conservadores y pueden ajustarse según necesidades
@@ -20,4 +103,3 @@ LOGIN_LIMIT = "10/minute"  # Máximo 10 intentos de login por minuto por IP
 
 # Límites para otros endpoints
 GENERAL_LIMIT = "100/minute"  # Límite general para otros endpoints
-
@@ -0,0 +1,57 @@
+# src/adapters/api/responses.py
+"""
+Serialización rápida de respuestas (opt-in con FAST_RESPONSES=true).
+
+Por defecto FastAPI toma el DTO que devuelve el endpoint, lo vuelca a dict,
+lo valida de nuevo contra `response_model`, lo pasa por jsonable_encoder y lo
+serializa con el json de la biblioteca estándar. Los DTOs de respuesta de los
+casos de uso ya tienen la forma exacta del `response_model`, así que con este
+modo el endpoint devuelve directamente una FastJSONResponse: orjson recorre
+los DTOs y codifica enums, UUID y datetime de forma nativa, sin la
+revalidación intermedia. El cuerpo resultante es idéntico byte a byte.
+
+`response_model` se mantiene en los decoradores para la documentación
+OpenAPI. Sin orjson instalado el modo queda desactivado.
+
+Ver benchmarks/bench_response_serialization.py.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # orjson no conoce los modelos de pydantic: se serializan sus campos
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse serializada con orjson, que acepta DTOs de pydantic como contenido."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def fast_responses_enabled() -> bool:
+    return orjson is not None and get_settings().fast_responses
+
+
+def respond(dto: BaseModel, status_code: int = 200):
+    """
+    Respuesta de un endpoint cuyo `response_model` es el tipo de `dto`: con
+    FAST_RESPONSES se serializa directamente con orjson; si no, se devuelve
+    el DTO para el camino estándar de FastAPI.
+    """
+    if fast_responses_enabled():
+        return FastJSONResponse(dto, status_code=status_code)
+    return dto
@@ -1,9 +1,10 @@
 # src/adapters/api/security.py
+import hmac
 import uuid
 from fastapi import Depends, HTTPException, status, Header
 from typing import Optional
-from jose import JWTError, jwt
-from src.config import settings
+from src.config import get_settings
+from src.adapters.security import verify_access_token
 
 def get_current_user_id_from_context(
     x_user_context: Optional[str] = Header(None, alias="X-User-Context")
@@ -63,22 +64,16 @@ def get_current_user_id(
     # Prioridad 2: Decodificar JWT directamente (fallback para desarrollo/testing)
     if authorization and authorization.startswith("Bearer "):
         token = authorization.split(" ")[1]
-        try:
-            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-            user_id_str = payload.get("sub")
-            if user_id_str is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token JWT inválido: falta 'sub'",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            return uuid.UUID(user_id_str)
-        except JWTError:
+        # Misma verificación (y caché) que /validate-token
+        user_id_str = verify_access_token(token)
+        if user_id_str is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token JWT inválido",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        try:
+            return uuid.UUID(user_id_str)
         except (ValueError, TypeError):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -92,3 +87,17 @@ def get_current_user_id(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def require_admin(
+    x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")
+) -> None:
+    """
+    Protege los endpoints de administración comparando el header X-Admin-Token
+    con ADMIN_TOKEN. Si no hay token configurado, los endpoints quedan deshabilitados.
+    """
+    expected = get_settings().admin_token
+    if not expected or not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requieren credenciales de administrador."
+        )
@@ -0,0 +1,398 @@
+# src/adapters/api/server.py
+"""
+Servidor de producción con preforking.
+
+Con `uvicorn --workers N` cada worker importa la aplicación por su cuenta y
+repite la carga de todo lo que es de solo lectura. Aquí un proceso maestro
+importa la app y precarga una sola vez:
+    - el índice de contraseñas comunes (mmap, ya precargado en la caché de páginas)
+    - el llavero JWT
+    - la política de hashing (la calibración de HASH_TARGET_MS corre una vez,
+      no en cada worker)
+y después hace fork de los workers, que comparten esas páginas por
+copy-on-write. `gc.freeze()` mueve los objetos precargados a la generación
+permanente del recolector: el GC de los workers no los recorre ni escribe en
+sus encabezados, así que las páginas siguen compartidas.
+
+El maestro no mantiene conexiones a la BD ni crea el executor de hashing:
+cada worker crea su propio motor, pool y executor después del fork, durante el
+precalentamiento de su lifespan (ver src/adapters/warmup.py). El socket se
+abre en el maestro y todos los workers aceptan conexiones de él.
+
+Señales del proceso maestro:
+    SIGHUP           reinicio ordenado: levanta una generación nueva de
+                     workers y, cuando todos terminan el precalentamiento,
+                     detiene los anteriores (que terminan sus requests en
+                     curso). Si un worker nuevo falla, se conservan los
+                     anteriores. Los workers nuevos salen del mismo maestro:
+                     para desplegar código nuevo se arranca otro maestro en el
+                     mismo puerto (SO_REUSEPORT) y se detiene el anterior
+    SIGTERM/SIGINT   apagado ordenado (--graceful-timeout por worker)
+
+Un worker que termina de forma inesperada se reemplaza.
+
+Uso:
+    python -m src.adapters.api [--host 0.0.0.0] [--port 8000] [--workers N]
+        [--graceful-timeout 30] [--ready-timeout 120] [--log-level info]
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from src.adapters.hashing import _default_workers
+from src.adapters.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Mensajes de un worker al maestro por su pipe al terminar el precalentamiento
+READY, FAILED = b"R", b"F"
+
+# Un worker que muere antes de este plazo se reemplaza con una pausa, para
+# no entrar en un bucle de forks si falla al arrancar
+_MIN_WORKER_LIFETIME = 1.0
+
+_HANDLED_SIGNALS = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD)
+
+
+def preload(workers: int):
+    """
+    Importa la app y carga en el maestro los datos de solo lectura que
+    heredan los workers. Devuelve la app.
+    """
+    from src.adapters.api.main import app, create_db_and_tables
+    from src.adapters.common_passwords import get_common_passwords
+    from src.adapters.jwt_keys import get_key_ring
+    from src.adapters.password_hashers import get_hash_policy
+    from src.adapters.repositories.database import current_engine
+    from src.config import get_settings
+
+    settings = get_settings()
+    # Cada worker tiene su propio executor de hashing: se reparten los núcleos
+    # en lugar de crear un hilo por núcleo en cada worker
+    if not settings.hash_workers:
+        settings.hash_workers = max(1, _default_workers() // workers)
+        logger.info("HASH_WORKERS=%d por worker", settings.hash_workers)
+    if workers > 1 and settings.rate_limit_storage_uri.startswith("memory://"):
+        logger.warning(
+            "RATE_LIMIT_STORAGE_URI=memory:// con %d workers: cada worker lleva sus propios "
+            "contadores. Usa sqlite:////ruta/rl.db para compartirlos.", workers
+        )
+    if workers > 1 and settings.user_cache_enabled:
+        logger.warning(
+            "USER_CACHE_ENABLED con %d workers: la caché es por worker y las invalidaciones no se "
+            "propagan; los demás workers pueden servir datos desactualizados hasta "
+            "USER_CACHE_TTL_SECONDS=%.0f s.", workers, settings.user_cache_ttl_seconds
+        )
+
+    index = get_common_passwords()
+    index.prefetch()
+    get_key_ring()
+    policy = get_hash_policy()
+    logger.info("Precargado: %d contraseñas comunes, política de hashing %s", len(index), policy)
+
+    if settings.db_create_tables:
+        # Una sola vez antes del fork: los workers competirían por el DDL
+        create_db_and_tables()
+        settings.db_create_tables = False
+    if current_engine() is not None:
+        # Las conexiones no se comparten entre procesos: cada worker abre las suyas
+        current_engine().dispose()
+    if threading.active_count() > 1:
+        logger.warning("El maestro tiene %d hilos antes del fork", threading.active_count())
+    return app
+
+
+def _listen(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+async def _report_warmup(app, fd: int) -> None:
+    """Avisa al maestro por el pipe cuando termina el precalentamiento del worker."""
+    try:
+        while True:
+            state = getattr(app.state, "warmup", None)
+            if state is not None and state.status in ("ready", "failed"):
+                os.write(fd, READY if state.ready else FAILED)
+                return
+            await asyncio.sleep(0.05)
+    finally:
+        os.close(fd)
+
+
+def serve_worker(app, sock: socket.socket, ready_fd: int, args) -> int:
+    """Cuerpo del worker después del fork: sirve la app con uvicorn sobre el socket heredado."""
+    import uvicorn
+
+    gc.enable()
+    if args.workers > 1:
+        # Los contadores son de este proceso: el pid separa las series de cada worker
+        REGISTRY.set_const_labels(pid=str(os.getpid()))
+    lifespan_context = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with lifespan_context(app) as state:
+            reporter = asyncio.create_task(_report_warmup(app, ready_fd))
+            try:
+                yield state
+            finally:
+                reporter.cancel()
+
+    app.router.lifespan_context = lifespan
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        log_config=None,  # Los logs de uvicorn van a la configuración del maestro
+        log_level=args.log_level,
+        access_log=args.access_log,
+        # La IP del cliente la resuelve get_client_ip con TRUSTED_PROXIES
+        proxy_headers=False,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+    return 0 if server.started else 3
+
+
+class Worker:
+    __slots__ = ("pid", "generation", "ready_fd", "started", "ready")
+
+    def __init__(self, pid: int, generation: int, ready_fd: int):
+        self.pid = pid
+        self.generation = generation
+        self.ready_fd: Optional[int] = ready_fd
+        self.started = time.monotonic()
+        self.ready = False
+
+
+class Arbiter:
+    """Proceso maestro: mantiene `num_workers` workers de la generación vigente."""
+
+    def __init__(self, app, sock: socket.socket, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.num_workers = args.workers
+        self.workers: Dict[int, Worker] = {}
+        self.generation = 0  # Generación que atiende el tráfico
+        self.last_generation = 0
+        self.reload_generation: Optional[int] = None  # Reinicio ordenado en curso
+        self.reload_started = 0.0
+        self.next_spawn = 0.0
+        self.stopping = False
+        self._signals: List[int] = []
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    # --- Señales ---
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def _install_signals(self) -> None:
+        os.set_blocking(self._wakeup_w, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        for signum in _HANDLED_SIGNALS:
+            signal.signal(signum, self._on_signal)
+
+    # --- Workers ---
+
+    def spawn(self, generation: int) -> None:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                os.close(ready_r)
+                self._reset_in_child()
+                code = serve_worker(self.app, self.sock, ready_w, self.args)
+            except BaseException:
+                logger.exception("El worker %d terminó con un error", os.getpid())
+            finally:
+                logging.shutdown()
+                os._exit(code)
+        os.close(ready_w)
+        self.workers[pid] = Worker(pid, generation, ready_r)
+        logger.info("Worker %d iniciado (generación %d)", pid, generation)
+
+    def _reset_in_child(self) -> None:
+        signal.set_wakeup_fd(-1)
+        for signum in _HANDLED_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        for worker in self.workers.values():
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+
+    def _read_ready(self, fd: int) -> None:
+        worker = next(w for w in self.workers.values() if w.ready_fd == fd)
+        message = os.read(fd, 1)
+        os.close(fd)
+        worker.ready_fd = None
+        if message == READY:
+            worker.ready = True
+            logger.info("Worker %d listo", worker.pid)
+        elif worker.generation == self.reload_generation:
+            self._abort_reload(f"el worker {worker.pid} no completó el precalentamiento")
+        elif worker.generation == self.generation:
+            logger.error("El worker %d no completó el precalentamiento: su /ready responde 503", worker.pid)
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+            code = os.waitstatus_to_exitcode(status)
+            if worker.generation == self.reload_generation:
+                self._abort_reload(f"el worker {pid} terminó con código {code} antes de quedar listo")
+            elif self.stopping or worker.generation != self.generation:
+                logger.info("Worker %d detenido", pid)
+            else:
+                logger.warning("Worker %d terminó inesperadamente con código %d", pid, code)
+                if time.monotonic() - worker.started < _MIN_WORKER_LIFETIME:
+                    self.next_spawn = time.monotonic() + _MIN_WORKER_LIFETIME
+
+    def _kill(self, workers, signum: int) -> None:
+        for worker in workers:
+            try:
+                os.kill(worker.pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _generation(self, generation: Optional[int]) -> List[Worker]:
+        return [w for w in self.workers.values() if w.generation == generation]
+
+    def _maintain(self) -> None:
+        if self.reload_generation is None and time.monotonic() >= self.next_spawn:
+            for _ in range(self.num_workers - len(self._generation(self.generation))):
+                self.spawn(self.generation)
+
+    # --- Reinicio ordenado ---
+
+    def reload(self) -> None:
+        if self.reload_generation is not None:
+            logger.warning("SIGHUP ignorado: ya hay un reinicio en curso")
+            return
+        logger.info("Reinicio ordenado: levantando %d workers nuevos", self.num_workers)
+        self.last_generation += 1
+        self.reload_generation = self.last_generation
+        self.reload_started = time.monotonic()
+        for _ in range(self.num_workers):
+            self.spawn(self.reload_generation)
+
+    def _check_reload(self) -> None:
+        if self.reload_generation is None:
+            return
+        new = self._generation(self.reload_generation)
+        if len(new) == self.num_workers and all(w.ready for w in new):
+            old = [w for w in self.workers.values() if w.generation != self.reload_generation]
+            logger.info("Workers nuevos listos: deteniendo %d workers anteriores", len(old))
+            self.generation, self.reload_generation = self.reload_generation, None
+            self._kill(old, signal.SIGTERM)
+        elif time.monotonic() - self.reload_started > self.args.ready_timeout:
+            self._abort_reload(f"los workers nuevos no estuvieron listos en {self.args.ready_timeout:.0f} s")
+
+    def _abort_reload(self, reason: str) -> None:
+        logger.error("Reinicio cancelado (%s): se conservan los workers anteriores", reason)
+        self._kill(self._generation(self.reload_generation), signal.SIGTERM)
+        self.reload_generation = None
+
+    # --- Bucle principal ---
+
+    def run(self) -> int:
+        self._install_signals()
+        logger.info("Maestro %d escuchando en %s:%d con %d workers",
+                    os.getpid(), self.args.host, self.args.port, self.num_workers)
+        self._maintain()
+        while True:
+            fds = [self._wakeup_r] + [w.ready_fd for w in self.workers.values() if w.ready_fd is not None]
+            readable, _, _ = select.select(fds, [], [], 1.0)
+            for fd in readable:
+                if fd == self._wakeup_r:
+                    os.read(self._wakeup_r, 4096)
+                else:
+                    self._read_ready(fd)
+            self._reap()
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum == signal.SIGHUP:
+                    self.reload()
+                elif signum in (signal.SIGTERM, signal.SIGINT):
+                    return self.stop()
+            self._check_reload()
+            self._maintain()
+
+    def stop(self) -> int:
+        logger.info("Apagando %d workers", len(self.workers))
+        self.stopping = True
+        self._kill(self.workers.values(), signal.SIGTERM)
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        if self.workers:
+            logger.warning("Forzando la salida de %d workers", len(self.workers))
+            self._kill(self.workers.values(), signal.SIGKILL)
+            while self.workers:
+                self._reap()
+                time.sleep(0.05)
+        self.sock.close()
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.adapters.api", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = número de núcleos disponibles")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--graceful-timeout", type=float, default=30.0,
+                        help="Segundos que un worker espera a los requests en curso al detenerse")
+    parser.add_argument("--ready-timeout", type=float, default=120.0,
+                        help="Plazo para que los workers nuevos de un reinicio terminen el precalentamiento")
+    parser.add_argument("--log-level", default="info", choices=["debug", "info", "warning", "error"])
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args(argv)
+    args.workers = args.workers or _default_workers()
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s",
+    )
+
+    # Lo que se crea durante la precarga vive todo el proceso: el GC no lo
+    # recorre antes del fork, y después queda congelado
+    gc.disable()
+    app = preload(args.workers)
+    sock = _listen(args.host, args.port, args.backlog)
+    gc.collect()
+    gc.freeze()
+    sys.exit(Arbiter(app, sock, args).run())
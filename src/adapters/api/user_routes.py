@@ -1,24 +1,46 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Request, Header, Response
-from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends, Request, Header, Response
+from functools import partial
+from typing import AsyncIterator, Optional, Union
 import uuid
+from anyio import to_thread
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from src.adapters.api.rate_limiter import limiter, REGISTER_LIMIT, LOGIN_LIMIT
+from src.adapters.api.rate_limiter import limiter, REGISTER_LIMIT, LOGIN_LIMIT, GENERAL_LIMIT
 from src.adapters.api.security import get_current_user_id_from_context
+from src.adapters.api.responses import respond
+from src.adapters.security import verify_access_token
+from src.adapters.password_rehash import rehash_password
+from src.adapters.admission import AdmissionRejected
+from src.adapters.password_service import get_password_service
 # Importaciones de Casos de Uso
 from src.use_cases.register_user import RegisterUserUseCase
 from src.use_cases.login_user import LoginUserUseCase
 from src.use_cases.get_user import GetUserUseCase
 from src.use_cases.update_user import UpdateUserUseCase
 from src.use_cases.delete_user import DeleteUserUseCase
+from src.use_cases.refresh_token import RefreshAccessTokenUseCase
 # Importaciones de DTOs
 from src.use_cases.dtos import (
     RegisterUserRequestDTO, UserResponseDTO, LoginRequestDTO, LoginResponseDTO,
-    UserDetailResponseDTO, UpdateUserRequestDTO
+    UserDetailResponseDTO, UpdateUserRequestDTO, RefreshTokenRequestDTO
 )
 # Importación del Repositorio
 from src.adapters.repositories.user_repository import InMemoryUserRepository
 from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
-from src.adapters.repositories.database import get_db
+from src.adapters.repositories.async_sql_user_repository import AsyncSQLUserRepository
+from src.adapters.repositories.threaded_user_repository import ThreadedUserRepository
+from src.adapters.repositories.sql_refresh_token_repository import SQLRefreshTokenRepository
+from src.adapters.repositories.async_sql_refresh_token_repository import AsyncSQLRefreshTokenRepository
+from src.adapters.repositories.threaded_refresh_token_repository import ThreadedRefreshTokenRepository
+from src.adapters.repositories.cached_user_repository import (
+    AsyncCachedUserRepository, CachedUserRepository, get_user_cache
+)
+from src.adapters.repositories.database import LazySession, get_db
+from src.adapters.repositories.async_database import get_async_db
+from src.config import get_settings
+from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.async_refresh_token_repository import IAsyncRefreshTokenRepository
 
 # --- Creación del Router ---
 router = APIRouter(
@@ -28,31 +50,92 @@ router = APIRouter(
 
 # --- Inyección de Dependencias ---
 
-def get_user_repository(db: Session = Depends(get_db)) -> MySQLUserRepository:
-    return MySQLUserRepository(db=db)
+def get_user_repository(db: Session = Depends(get_db)) -> IUserRepository:
+    repository = MySQLUserRepository(db=db)
+    # La caché se activa con USER_CACHE_ENABLED, sin cambios de código
+    if get_settings().user_cache_enabled:
+        return CachedUserRepository(repository, get_user_cache())
+    return repository
+
+async def get_request_db() -> AsyncIterator[Union[AsyncSession, LazySession]]:
+    """
+    Sesión del request: AsyncSession con DB_ASYNC activo, o la sesión síncrona
+    perezosa en caso contrario. FastAPI la resuelve una vez por request, así
+    que todos los repositorios del request comparten la misma conexión.
+    """
+    if get_settings().db_async:
+        async for db in get_async_db():
+            yield db
+        return
+
+    db_dependency = get_db()
+    db = next(db_dependency)
+    try:
+        yield db
+    finally:
+        # Si la sesión nunca se usó no hay conexión que devolver al pool
+        if db.started:
+            await to_thread.run_sync(db_dependency.close)
+        else:
+            db_dependency.close()
+
+async def get_async_user_repository(
+    db: Union[AsyncSession, LazySession] = Depends(get_request_db)
+) -> IAsyncUserRepository:
+    """
+    Repositorio asíncrono usado por los endpoints. Con DB_ASYNC activo usa
+    AsyncSession (las esperas a la BD no ocupan hilos); si no, adapta el
+    repositorio síncrono ejecutando cada llamada en el threadpool.
+    """
+    settings = get_settings()
+    if settings.db_async:
+        repository: IAsyncUserRepository = AsyncSQLUserRepository(db=db)
+        if settings.user_cache_enabled:
+            repository = AsyncCachedUserRepository(repository, get_user_cache())
+        return repository
+    return ThreadedUserRepository(get_user_repository(db))
+
+async def get_async_refresh_token_repository(
+    db: Union[AsyncSession, LazySession] = Depends(get_request_db)
+) -> IAsyncRefreshTokenRepository:
+    if get_settings().db_async:
+        return AsyncSQLRefreshTokenRepository(db=db)
+    return ThreadedRefreshTokenRepository(SQLRefreshTokenRepository(db=db))
 
 # Actualiza las funciones "get_use_case" para que dependan del repositorio
-def get_register_user_use_case(
-    repo: MySQLUserRepository = Depends(get_user_repository)
+async def get_register_user_use_case(
+    repo: IAsyncUserRepository = Depends(get_async_user_repository)
 ) -> RegisterUserUseCase:
-    return RegisterUserUseCase(user_repository=repo)
+    return RegisterUserUseCase(user_repository=repo, password_service=get_password_service())
 
-def get_login_user_use_case(
-    repo: MySQLUserRepository = Depends(get_user_repository)
+async def get_login_user_use_case(
+    background_tasks: BackgroundTasks,
+    repo: IAsyncUserRepository = Depends(get_async_user_repository),
+    refresh_repo: IAsyncRefreshTokenRepository = Depends(get_async_refresh_token_repository)
 ) -> LoginUserUseCase:
-    return LoginUserUseCase(user_repository=repo)
+    # El re-hash por cambio de política corre después de enviar la respuesta
+    rehash_scheduler = partial(background_tasks.add_task, rehash_password) if get_settings().rehash_on_login else None
+    return LoginUserUseCase(
+        user_repository=repo, password_service=get_password_service(),
+        refresh_token_repository=refresh_repo, rehash_scheduler=rehash_scheduler
+    )
+
+async def get_refresh_access_token_use_case(
+    refresh_repo: IAsyncRefreshTokenRepository = Depends(get_async_refresh_token_repository)
+) -> RefreshAccessTokenUseCase:
+    return RefreshAccessTokenUseCase(refresh_token_repository=refresh_repo)
 
-def get_update_user_use_case(
-    repo: MySQLUserRepository = Depends(get_user_repository)
+async def get_update_user_use_case(
+    repo: IAsyncUserRepository = Depends(get_async_user_repository)
     ) -> UpdateUserUseCase:
     return UpdateUserUseCase(user_repository=repo)
 
-def get_delete_user_use_case(repo: MySQLUserRepository = Depends(get_user_repository)
+async def get_delete_user_use_case(repo: IAsyncUserRepository = Depends(get_async_user_repository)
     ) -> DeleteUserUseCase:
     return DeleteUserUseCase(user_repository=repo)
 
-def get_user_use_case(
-    repo: MySQLUserRepository = Depends(get_user_repository)
+async def get_user_use_case(
+    repo: IAsyncUserRepository = Depends(get_async_user_repository)
 ) -> GetUserUseCase:
     return GetUserUseCase(user_repository=repo)
 
@@ -66,7 +149,7 @@ def get_db_user_repository() -> InMemoryUserRepository:
 # Línea correcta
 @router.post("/register", response_model=UserResponseDTO, status_code=status.HTTP_201_CREATED)
 @limiter.limit(REGISTER_LIMIT)
-def register_user(
+async def register_user(
     request: Request,
     register_request: RegisterUserRequestDTO, 
     use_case: RegisterUserUseCase = Depends(get_register_user_use_case)
@@ -90,8 +173,11 @@ def register_user(
             register_request.email = register_request.email.strip()
         
         # Ejecutar el caso de uso que aplicará todas las validaciones
-        user_response = use_case.execute(register_request)
-        return user_response
+        # El hash bcrypt se ejecuta en el executor dedicado, sin ocupar el threadpool de AnyIO
+        user_response = await use_case.execute_async(register_request)
+        return respond(user_response, status.HTTP_201_CREATED)
+    except AdmissionRejected:
+        raise  # 503 con Retry-After (manejador en main.py)
     except ValueError as e:
         # Errores de validación de negocio (Value Objects, duplicados, etc.)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -105,18 +191,35 @@ def register_user(
 
 @router.post("/login", response_model=LoginResponseDTO)
 @limiter.limit(LOGIN_LIMIT)
-def login(
+async def login(
     request: Request,
     login_request: LoginRequestDTO,
     use_case: LoginUserUseCase = Depends(get_login_user_use_case)
 ):
     try:
-        return use_case.execute(login_request)
+        return respond(await use_case.execute_async(login_request))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+
+@router.post("/token/refresh", response_model=LoginResponseDTO)
+@limiter.limit(GENERAL_LIMIT)
+async def refresh_access_token(
+    request: Request,
+    refresh_request: RefreshTokenRequestDTO,
+    use_case: RefreshAccessTokenUseCase = Depends(get_refresh_access_token_use_case)
+):
+    """
+    Renueva el access token sin volver a enviar la contraseña. Devuelve
+    también un refresh token nuevo: el enviado deja de ser válido, y volver
+    a usarlo revoca la sesión completa.
+    """
+    try:
+        return respond(await use_case.execute_async(refresh_request))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @router.get("/users/{user_id}", response_model=UserDetailResponseDTO)
-def get_user(
+async def get_user(
     user_id: uuid.UUID,
     context_user_id: uuid.UUID = Depends(get_current_user_id_from_context),
     use_case: GetUserUseCase = Depends(get_user_use_case)
@@ -133,7 +236,7 @@ def get_user(
         )
     
     try:
-        return use_case.execute(user_id)
+        return respond(await use_case.execute_async(user_id))
     except FileNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -143,7 +246,7 @@ def get_user(
         )
 
 @router.put("/users/{user_id}", response_model=UserDetailResponseDTO)
-def update_user(
+async def update_user(
     user_id: uuid.UUID, 
     request: UpdateUserRequestDTO,
     context_user_id: uuid.UUID = Depends(get_current_user_id_from_context),
@@ -174,7 +277,7 @@ def update_user(
             update_data['username'] = update_data['username'].strip()
             
         validated_request = UpdateUserRequestDTO(**update_data)
-        return use_case.execute(user_id, validated_request)
+        return respond(await use_case.execute_async(user_id, validated_request))
     except FileNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except ValueError as e:
@@ -187,7 +290,7 @@ def update_user(
         )
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: uuid.UUID,
     context_user_id: uuid.UUID = Depends(get_current_user_id_from_context),
     use_case: DeleteUserUseCase = Depends(get_delete_user_use_case)
@@ -204,7 +307,7 @@ def delete_user(
         )
     
     try:
-        use_case.execute(user_id)
+        await use_case.execute_async(user_id)
         return # FastAPI manejará la respuesta 204
     except FileNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -215,7 +318,7 @@ def delete_user(
         )
 
 @router.get("/validate-token")
-def validate_token(
+async def validate_token(
     authorization: Optional[str] = Header(None)
 ):
     """
@@ -224,28 +327,20 @@ def validate_token(
     
     Este endpoint permite que el gateway valide el JWT y extraiga el user_id
     sin que los microservicios tengan que decodificar el token nuevamente.
+    Los tokens ya verificados se resuelven desde caché hasta su expiración,
+    sin pasar por el threadpool ni repetir la verificación de la firma.
     """
     if not authorization or not authorization.startswith("Bearer "):
         response = Response(status_code=401)
         return response
     
     token = authorization.split(" ")[1]
-    try:
-        from jose import JWTError, jwt
-        from src.config import settings
-        
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        user_id = payload.get("sub")
-        
-        if not user_id:
-            response = Response(status_code=401)
-            return response
-        
-        # Retornar respuesta con header X-User-Id para que nginx lo capture
-        response = Response(status_code=200)
-        response.headers["X-User-Id"] = user_id
-        return response
-        
-    except JWTError:
+    user_id = verify_access_token(token)
+    if not user_id:
         response = Response(status_code=401)
-        return response
\ No newline at end of file
+        return response
+
+    # Retornar respuesta con header X-User-Id para que nginx lo capture
+    response = Response(status_code=200)
+    response.headers["X-User-Id"] = user_id
+    return response
\ No newline at end of file
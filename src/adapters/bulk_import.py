@@ -0,0 +1,134 @@
+# src/adapters/bulk_import.py
+"""
+Importación masiva de usuarios desde NDJSON o CSV.
+
+Cada fila tiene los campos de RegisterUserRequestDTO. El archivo se lee como
+un flujo y se procesa por lotes (ver BulkImportUsersUseCase), por lo que
+importar 100k filas usa la misma memoria que importar un lote. El resultado
+es un reporte NDJSON con una línea por fila y un resumen final.
+
+Uso desde la línea de comandos:
+    python -m src.adapters.bulk_import alumnos.csv [--format csv] [--report reporte.ndjson]
+"""
+import argparse
+import csv
+import json
+import sys
+from functools import partial
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, Optional
+from src.adapters.hashing import _default_workers, create_bulk_hash_executor
+from src.adapters.password_hashers import get_hash_policy, hash_password
+from src.adapters.password_service import get_password_service
+from src.adapters.repositories.database import SessionLocal, get_engine
+from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+from src.config import get_settings
+from src.use_cases.bulk_import_users import BulkImportRow, BulkImportUsersUseCase
+from src.use_cases.dtos import BulkImportSummaryDTO
+
+FORMATS = ("ndjson", "csv")
+
+
+def detect_format(name: Optional[str]) -> str:
+    """Formato a partir de un nombre de archivo o Content-Type; NDJSON por defecto."""
+    return "csv" if name and "csv" in name.lower() else "ndjson"
+
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[BulkImportRow]:
+    """
+    Convierte las líneas del archivo en filas (número de línea, datos). Una
+    línea ilegible se entrega como ValueError para reportarla sin detener la
+    importación.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, ValueError("La línea no es JSON válido")
+            continue
+        if not isinstance(data, dict):
+            yield line_number, ValueError("La línea debe ser un objeto JSON")
+            continue
+        yield line_number, data
+
+
+def import_users(
+    lines: Iterable[str],
+    fmt: str,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    admit: Optional[Callable[[], ContextManager[None]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Importa los usuarios de `lines` y produce el reporte fila por fila; el
+    último elemento es {"summary": {...}}. Abre su propia sesión y su propio
+    pool de procesos de hashing, y los libera al terminar. `admit` se toma
+    por cada hash en curso (ver BulkImportUsersUseCase).
+    """
+    settings = get_settings()
+    get_engine()
+    summary = BulkImportSummaryDTO()
+    processes = (workers if workers is not None else settings.bulk_import_workers) or _default_workers()
+    executor = create_bulk_hash_executor(processes)
+    db = SessionLocal()
+    try:
+        use_case = BulkImportUsersUseCase(
+            MySQLUserRepository(db),
+            executor,
+            get_password_service(),
+            partial(hash_password, policy=get_hash_policy()),
+            batch_size=batch_size or settings.bulk_import_batch_size,
+            admit=admit,
+            hash_concurrency=processes,
+        )
+        for result in use_case.execute(read_rows(lines, fmt)):
+            summary.total += 1
+            if result.status == "created":
+                summary.created += 1
+            else:
+                summary.failed += 1
+            yield result.model_dump(exclude_none=True)
+        yield {"summary": summary.model_dump()}
+    finally:
+        db.close()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Archivo NDJSON o CSV ('-' para leer de stdin)")
+    parser.add_argument("--format", choices=FORMATS, help="Por defecto se deduce de la extensión")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--workers", type=int, help="Procesos de hashing (0 = núcleos disponibles)")
+    parser.add_argument("--report", help="Archivo para el reporte NDJSON (por defecto stdout)")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    report = open(args.report, "w", encoding="utf-8") if args.report else sys.stdout
+    try:
+        for item in import_users(source, fmt, args.batch_size, args.workers):
+            report.write(json.dumps(item, ensure_ascii=False) + "\n")
+            if "summary" in item:
+                summary = item["summary"]
+                print(
+                    f"Importación terminada: {summary['created']} creados, "
+                    f"{summary['failed']} con errores de {summary['total']} filas.",
+                    file=sys.stderr,
+                )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if report is not sys.stdout:
+            report.close()
+
+
+if __name__ == "__main__":
+    main()
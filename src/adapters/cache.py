@@ -0,0 +1,191 @@
+# src/adapters/cache.py
+"""
+Primitivas de caché en memoria compartidas por los adaptadores.
+
+- LRUTTLCache: caché acotada por número de entradas (LRU) con expiración
+  por entrada y contadores de aciertos, fallos y desalojos.
+- SingleFlight / AsyncSingleFlight: coalescencia de llamadas concurrentes,
+  de modo que varios hilos (o corrutinas) que piden la misma clave ejecutan
+  una sola carga.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """Caché LRU con TTL, segura para uso desde varios hilos."""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser mayor que cero")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Lee una entrada sin actualizar el orden LRU ni los contadores."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Guarda un valor. `expires_at` (reloj monotónico) tiene prioridad sobre el
+        TTL por defecto de la caché.
+        """
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Garantiza que, para una misma clave, solo un hilo ejecute la función de
+    carga; los demás esperan y reciben el mismo resultado (o excepción).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Ejecuta `fn` una sola vez por clave. Devuelve (resultado, compartido)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class _LeaderCancelled(Exception):
+    """El líder de AsyncSingleFlight fue cancelado antes de obtener un resultado."""
+
+
+class AsyncSingleFlight:
+    """
+    Equivalente de SingleFlight para corrutinas que comparten un event loop.
+
+    Si se cancela al líder (p. ej. se desconectó su cliente), los que
+    esperaban no heredan la cancelación: el primero en despertar vuelve a
+    ejecutar `fn` como nuevo líder y el resto lo espera a él.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Espera `fn()` una sola vez por clave. Devuelve (resultado, compartido)."""
+        counted = False
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            if not counted:
+                self.coalesced += 1
+                counted = True
+            try:
+                return await asyncio.shield(future), True
+            except _LeaderCancelled:
+                continue
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # No se cancela el futuro compartido: los seguidores reintentan
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Evita el aviso de excepción no recuperada si nadie esperaba
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
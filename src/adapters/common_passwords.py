@@ -0,0 +1,173 @@
+# src/adapters/common_passwords.py
+"""
+Índice compacto del diccionario de contraseñas comunes.
+
+En lugar de cargar el CSV con pandas en un `set` por cada worker, el
+diccionario se compila una sola vez a un archivo binario ordenado que se
+abre con `mmap`. El sistema operativo comparte esas páginas entre todos
+los procesos y la búsqueda es binaria sobre el archivo.
+
+Formato del archivo (enteros en el orden de bytes nativo):
+    - magic: 8 bytes (b"CPWIDX01")
+    - count: uint32 con el número de entradas
+    - offsets: (count + 1) uint32, inicio de cada entrada dentro del blob
+    - blob: entradas UTF-8 concatenadas, ordenadas por bytes y sin duplicados
+
+Compilar el índice (en el despliegue, nunca al atender requests):
+    python -m src.adapters.common_passwords 1millionPasswords.csv common_passwords.idx
+"""
+import csv
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CPWIDX01"
+_HEADER = struct.Struct("=8sI")
+
+
+class CommonPasswordIndex:
+    """Conjunto de solo lectura respaldado por un archivo mapeado en memoria."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"'{path}' no es un índice de contraseñas válido")
+        self._offsets = memoryview(self._mm)[_HEADER.size:_HEADER.size + 4 * (self._count + 1)].cast("I")
+        self._blob_start = _HEADER.size + 4 * (self._count + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, password: object) -> bool:
+        if not isinstance(password, str):
+            return False
+        key = password.encode("utf-8")
+        offsets, mm, base = self._offsets, self._mm, self._blob_start
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = mm[base + offsets[mid]:base + offsets[mid + 1]]
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def prefetch(self) -> None:
+        """Pide al sistema operativo que lea el archivo completo a la caché de páginas."""
+        if hasattr(mmap, "MADV_WILLNEED"):
+            self._mm.madvise(mmap.MADV_WILLNEED)
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._mm.close()
+
+
+class _EmptyIndex:
+    """Sustituto cuando no hay diccionario disponible: nada es común."""
+
+    def __len__(self) -> int:
+        return 0
+
+    def __contains__(self, password: object) -> bool:
+        return False
+
+    def prefetch(self) -> None:
+        pass
+
+
+def read_csv_passwords(csv_path: str, column: int = 1) -> Iterator[str]:
+    """Lee la columna de contraseñas del CSV original (sin encabezado)."""
+    with open(csv_path, newline="", encoding="utf-8", errors="replace") as f:
+        for row in csv.reader(f):
+            if len(row) > column and row[column]:
+                yield row[column]
+
+
+def build_index(passwords: Iterable[str], output_path: str) -> int:
+    """
+    Compila las contraseñas a un índice ordenado y lo escribe de forma atómica.
+    Devuelve el número de entradas únicas.
+    """
+    entries = sorted({p.encode("utf-8") for p in passwords})
+    offsets = array("I", [0])
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry))
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(entries)))
+            f.write(offsets.tobytes())
+            for entry in entries:
+                f.write(entry)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(entries)
+
+
+_index: Optional[object] = None
+_index_lock = threading.Lock()
+
+
+def get_common_passwords():
+    """
+    Devuelve el índice de contraseñas comunes del proceso, abriéndolo en el
+    primer uso (normalmente en la precarga o el precalentamiento). Solo abre
+    un índice ya compilado: compilarlo desde el CSV tarda segundos y aquí
+    podría ocurrir en el event loop, dentro de un request.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _open_index()
+    return _index
+
+
+def _open_index():
+    settings = get_settings()
+    index_path = settings.common_passwords_index
+    try:
+        index = CommonPasswordIndex(index_path)
+        logger.info("Cargadas %d contraseñas comunes del diccionario.", len(index))
+        return index
+    except FileNotFoundError:
+        if os.path.exists(settings.common_passwords_csv):
+            logger.warning(
+                "No se encontró '%s'. Compílalo con: python -m src.adapters.common_passwords %s %s. "
+                "Hasta entonces la verificación de diccionario no funcionará.",
+                index_path, settings.common_passwords_csv, index_path
+            )
+        else:
+            logger.warning("No se encontró '%s'. La verificación de diccionario no funcionará.", index_path)
+    except Exception:
+        logger.exception("Error al cargar el diccionario de contraseñas")
+    return _EmptyIndex()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m src.adapters.common_passwords <origen.csv> <destino.idx>")
+        sys.exit(2)
+    total = build_index(read_csv_passwords(sys.argv[1]), sys.argv[2])
+    print(f"Índice generado en '{sys.argv[2]}' con {total} contraseñas.")
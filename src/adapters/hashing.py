@@ -0,0 +1,80 @@
+# src/adapters/hashing.py
+"""
+Executor dedicado para el hashing de contraseñas.
+
+bcrypt es CPU-bound (~250 ms por operación), por lo que no debe competir
+con el threadpool de AnyIO que atiende el resto de los requests. Las
+operaciones se ejecutan en un pool propio (hilos o procesos) cuyo tamaño
+se configura desde Settings.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from src.adapters.admission import HashPriority, get_admission_controller
+from src.adapters.timing import phase, record_phase
+from src.config import get_settings
+
+_executor: Optional[Executor] = None
+
+
+def _default_workers() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_hash_executor() -> Executor:
+    """Devuelve (creándolo si es necesario) el executor de hashing del proceso."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        workers = settings.hash_workers or _default_workers()
+        if settings.hash_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        elif settings.hash_executor == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hashing")
+        else:
+            raise ValueError(f"Tipo de executor de hashing no soportado: {settings.hash_executor}")
+    return _executor
+
+
+async def run_hashing(func: Callable[..., Any], *args: Any, priority: HashPriority = HashPriority.BULK) -> Any:
+    """
+    Ejecuta una función de hashing en el executor dedicado y espera su resultado.
+    La función y sus argumentos deben ser serializables si se usa un pool de procesos.
+    Con el control de admisión activo, antes espera un slot según `priority`
+    (puede lanzar AdmissionRejected). En Server-Timing la espera del slot se
+    registra como "hash.wait" y la ejecución como "hash".
+    """
+    loop = asyncio.get_running_loop()
+    controller = get_admission_controller()
+    if controller is None:
+        with phase("hash"):
+            return await loop.run_in_executor(get_hash_executor(), partial(func, *args))
+    start = time.perf_counter()
+    async with controller.slot(priority):
+        record_phase("hash.wait", time.perf_counter() - start)
+        with phase("hash"):
+            return await loop.run_in_executor(get_hash_executor(), partial(func, *args))
+
+
+def create_bulk_hash_executor(workers: int = 0) -> ProcessPoolExecutor:
+    """
+    Pool de procesos propio de una importación masiva: reparte el hashing de
+    miles de contraseñas entre núcleos sin ocupar el executor de los requests.
+    El llamador es responsable de cerrarlo.
+    """
+    return ProcessPoolExecutor(max_workers=workers or _default_workers())
+
+
+def shutdown_hash_executor() -> None:
+    """Libera los workers del executor de hashing (al apagar la aplicación)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
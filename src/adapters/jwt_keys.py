@@ -0,0 +1,93 @@
+# src/adapters/jwt_keys.py
+"""
+Claves de firma de los JWT.
+
+Con ALGORITHM=HS256 (o HS384/HS512) los tokens se firman con SECRET_KEY, como
+siempre. Con un algoritmo asimétrico (RS256/RS384/RS512, ES256/ES384/ES512) las
+claves se leen de los archivos PEM listados en JWT_KEY_FILES:
+
+- El primer archivo debe contener una clave privada: es la que firma.
+- Los siguientes pueden ser claves privadas o públicas y solo se usan para
+  verificar. Para rotar, se antepone la clave nueva y se deja la anterior
+  hasta que expiren los tokens que firmó.
+
+Cada clave se identifica por su huella JWK (RFC 7638), que viaja en el header
+`kid` del token. Las claves públicas se publican en /.well-known/jwks.json
+para que el gateway y otros servicios verifiquen los tokens localmente.
+"""
+import base64
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from src.config import Settings, get_settings
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+# Miembros requeridos de cada tipo de clave para la huella (RFC 7638, sección 3.2)
+_THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y")}
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    return algorithm.upper() in ASYMMETRIC_ALGORITHMS
+
+
+def jwk_thumbprint(public_jwk: Dict[str, Any]) -> str:
+    members = {name: public_jwk[name] for name in _THUMBPRINT_MEMBERS[public_jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class SigningKey:
+    """Una clave del llavero: la clave de jose para verificar y, si es privada, para firmar."""
+
+    def __init__(self, pem: bytes, algorithm: str):
+        from jose import jwk  # Carga diferida, como en el resto de los usos de jose
+
+        key = jwk.construct(pem, algorithm)
+        self.algorithm = algorithm
+        self.is_private = b"PRIVATE KEY" in pem
+        self.private_key = key if self.is_private else None
+        self.public_key = key.public_key() if self.is_private else key
+        public_jwk = self.public_key.to_dict()
+        self.kid = jwk_thumbprint(public_jwk)
+        self.public_jwk = {**public_jwk, "kid": self.kid, "use": "sig", "alg": algorithm}
+
+
+class KeyRing:
+    """Claves activas: la primera firma; todas verifican."""
+
+    def __init__(self, algorithm: str, keys: List[SigningKey]):
+        if not keys or not keys[0].is_private:
+            raise ValueError("El primer archivo de JWT_KEY_FILES debe contener una clave privada")
+        self.algorithm = algorithm
+        self.keys = keys
+        self.signing_key = keys[0]
+        self._by_kid = {key.kid: key for key in keys}
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        return self._by_kid.get(kid) if kid else None
+
+    def jwks(self) -> Dict[str, Any]:
+        return {"keys": [key.public_jwk for key in self.keys]}
+
+
+def load_key_ring(settings: Settings) -> Optional[KeyRing]:
+    """Llavero según Settings, o None si los tokens se firman con SECRET_KEY (HS*)."""
+    algorithm = settings.algorithm.upper()
+    if not is_asymmetric(algorithm):
+        return None
+    paths = [path.strip() for path in settings.jwt_key_files.split(",") if path.strip()]
+    if not paths:
+        raise ValueError(f"ALGORITHM={algorithm} requiere al menos un archivo PEM en JWT_KEY_FILES")
+    keys = []
+    for path in paths:
+        with open(path, "rb") as pem_file:
+            keys.append(SigningKey(pem_file.read(), algorithm))
+    return KeyRing(algorithm, keys)
+
+
+@lru_cache
+def get_key_ring() -> Optional[KeyRing]:
+    """Llavero del proceso (se lee una sola vez; get_key_ring.cache_clear() lo recarga)."""
+    return load_key_ring(get_settings())
@@ -0,0 +1,391 @@
+# src/adapters/metrics.py
+"""
+Métricas en proceso con exposición en formato de texto de Prometheus (/metrics).
+
+Contadores e histogramas mínimos, sin dependencias: registrar una observación
+es una búsqueda en un dict (o ninguna, si el hijo con sus labels ya está
+resuelto), un bisect sobre los buckets y dos sumas bajo un lock. Las métricas
+que ya existen en otro lado (pool de conexiones, control de admisión, caché de
+usuarios) no se duplican: se leen al momento del scrape con un collector.
+
+Los histogramas de hashing se registran en el proceso que hashea: con
+HASH_EXECUTOR=process las operaciones que corren en el pool de procesos no
+aparecen aquí.
+
+Todo el registro es por proceso. Con varios workers cada scrape responde un
+worker cualquiera y muestra solo sus contadores, que ni se suman con los de
+los demás ni continúan los del worker anterior. El servidor con preforking
+(python -m src.adapters.api) agrega a cada muestra el label `pid` del worker:
+así cada serie es de un solo proceso y los totales se obtienen con
+`sum without (pid) (...)`, siempre que se scrapee cada worker. Con
+`uvicorn --workers N` no hay label y las series de distintos workers se
+mezclan: en ese caso /metrics solo es confiable con un worker.
+
+Ver benchmarks/bench_metrics_overhead.py para el costo en el camino caliente.
+"""
+import bisect
+import threading
+import time
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.adapters.timing import record_phase
+
+# Segundos; cubren desde un decode de JWT (~50 µs) hasta un bcrypt bajo carga
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# (nombre, labels, valor)
+Sample = Tuple[str, Dict[str, str], float]
+# (nombre, tipo, ayuda, muestras)
+MetricFamily = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_buckets", "counts", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # El último es +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Hijo para esa combinación de labels (conviene resolverlo una vez y guardarlo)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def collect(self) -> MetricFamily:
+        samples = [
+            (self.name, self._labels(values), child.value)
+            for values, child in list(self._children.items())
+        ]
+        return self.name, self.kind, self.documentation, samples
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def collect(self) -> MetricFamily:
+        samples: List[Sample] = []
+        for values, child in list(self._children.items()):
+            labels = self._labels(values)
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return self.name, self.kind, self.documentation, samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self.const_labels: Dict[str, str] = {}
+
+    def set_const_labels(self, **labels: str) -> None:
+        """Labels que se agregan a todas las muestras al renderizar (p. ej. el pid del worker)."""
+        self.const_labels = dict(labels)
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """`collector` se invoca en cada scrape y devuelve familias ya calculadas."""
+        self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, kind, documentation, samples in self.collect():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                if self.const_labels:
+                    labels = {**labels, **self.const_labels}
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Duración de los requests HTTP por ruta y status.",
+    ("method", "route", "status"),
+))
+PASSWORD_HASH_SECONDS = REGISTRY.register(Histogram(
+    "password_hash_duration_seconds", "Duración de cada hash o verificación de contraseña.",
+    ("operation", "algorithm"),
+))
+REPOSITORY_SECONDS = REGISTRY.register(Histogram(
+    "repository_operation_duration_seconds", "Duración de los métodos del repositorio de usuarios.",
+    ("repository", "method"),
+))
+JWT_SECONDS = REGISTRY.register(Histogram(
+    "jwt_operation_duration_seconds", "Duración de la firma y verificación de JWT.", ("operation",),
+))
+RATE_LIMIT_REJECTIONS = REGISTRY.register(Counter(
+    "rate_limit_rejections_total", "Requests rechazados por el rate limiting (429).", ("route",),
+))
+
+
+def timed(histogram: Histogram, *labelvalues: str, phase: Optional[str] = None) -> Callable:
+    """
+    Decorador que registra la duración de la función (síncrona o async) en
+    `histogram` y, si se indica `phase`, también como fase de Server-Timing.
+    """
+    def decorator(fn: Callable) -> Callable:
+        child = histogram.labels(*(labelvalues or (fn.__name__,)))
+
+        def observe(start: float) -> None:
+            elapsed = time.perf_counter() - start
+            child.observe(elapsed)
+            if phase is not None:
+                record_phase(phase, elapsed)
+
+        if iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(start)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(start)
+        return wrapper
+    return decorator
+
+
+def observe_repository(repository: str) -> Callable:
+    """Decorador de métodos de repositorio: labels (repository, nombre del método), fase db.<método>."""
+    def decorator(fn: Callable) -> Callable:
+        return timed(REPOSITORY_SECONDS, repository, fn.__name__, phase=f"db.{fn.__name__}")(fn)
+    return decorator
+
+
+_route_paths: Dict[object, str] = {}
+
+
+def route_template(scope) -> str:
+    """
+    Plantilla de la ruta del request (/users/{user_id}), no el path real, para
+    acotar la cardinalidad. El router deja el endpoint en scope["endpoint"];
+    lo que no coincidió con ninguna ruta se agrupa en "<unmatched>".
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "<unmatched>"
+    path = _route_paths.get(endpoint)
+    if path is None:
+        for route in scope["app"].routes:
+            if hasattr(route, "endpoint"):
+                _route_paths[route.endpoint] = route.path
+        path = _route_paths.setdefault(endpoint, "<unmatched>")
+    return path
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide cada request por método, plantilla de ruta y status."""
+
+    def __init__(self, app):
+        self.app = app
+        self._children: Dict[Tuple[str, str, str], _HistogramChild] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            key = (scope["method"], route_template(scope), str(status))
+            child = self._children.get(key)
+            if child is None:
+                child = self._children.setdefault(key, HTTP_REQUEST_SECONDS.labels(*key))
+            child.observe(time.perf_counter() - start)
+
+
+# --- Collectors: estado leído en cada scrape ---
+
+def _db_pool_families() -> List[MetricFamily]:
+    from src.adapters.repositories.async_database import current_async_engine
+    from src.adapters.repositories.database import current_engine
+    from src.adapters.repositories.pool import pool_status
+
+    connections: List[Sample] = []
+    checkouts: List[Sample] = []
+    timeouts: List[Sample] = []
+    wait: List[Sample] = []
+    for engine_name, engine in (("sync", current_engine()), ("async", current_async_engine())):
+        status = pool_status(engine)
+        if status is None:
+            continue
+        for state in ("size", "checked_out", "idle", "overflow"):
+            if state in status:
+                connections.append(("db_pool_connections", {"engine": engine_name, "state": state}, status[state]))
+        if "wait" in status:
+            labels = {"engine": engine_name}
+            checkouts.append(("db_pool_checkouts_total", labels, status["wait"]["checkouts"]))
+            timeouts.append(("db_pool_checkout_timeouts_total", labels, status["wait"]["timeouts"]))
+            wait.append(("db_pool_checkout_wait_seconds_total", labels, status["wait"]["total_ms"] / 1000))
+    return [
+        ("db_pool_connections", "gauge", "Conexiones del pool por estado.", connections),
+        ("db_pool_checkouts_total", "counter", "Conexiones pedidas al pool.", checkouts),
+        ("db_pool_checkout_timeouts_total", "counter", "Pedidos al pool que vencieron.", timeouts),
+        ("db_pool_checkout_wait_seconds_total", "counter", "Tiempo total esperando una conexión.", wait),
+    ]
+
+
+def _admission_families() -> List[MetricFamily]:
+    from src.adapters.admission import get_admission_controller
+
+    controller = get_admission_controller()
+    if controller is None:
+        return []
+    stats = controller.stats()
+    return [
+        ("hash_admission_queue_depth", "gauge", "Operaciones de hashing en espera por prioridad.",
+         [("hash_admission_queue_depth", {"priority": p}, n) for p, n in stats["queue_depth"].items()]),
+        ("hash_admission_in_use", "gauge", "Slots de hashing ocupados.",
+         [("hash_admission_in_use", {}, stats["in_use"])]),
+        ("hash_admission_admitted_total", "counter", "Operaciones de hashing admitidas.",
+         [("hash_admission_admitted_total", {"priority": p}, n) for p, n in stats["admitted"].items()]),
+        ("hash_admission_rejected_total", "counter", "Operaciones de hashing rechazadas (503).",
+         [("hash_admission_rejected_total", {"reason": r}, n) for r, n in stats["rejected"].items()]),
+    ]
+
+
+def _user_cache_families() -> List[MetricFamily]:
+    from src.adapters.repositories.cached_user_repository import current_user_cache
+
+    cache = current_user_cache()
+    if cache is None:
+        return []
+    stats = cache.stats()
+    indexes = [(index, stats[index]) for index in ("by_id", "by_email", "by_username")]
+    families: List[MetricFamily] = [
+        ("user_cache_entries", "gauge", "Entradas de la caché de usuarios por índice.",
+         [("user_cache_entries", {"index": index}, s["entries"]) for index, s in indexes]),
+    ]
+    for counter, documentation in (
+        ("hits", "Búsquedas resueltas por la caché de usuarios."),
+        ("misses", "Búsquedas de la caché de usuarios que fueron al repositorio."),
+        ("evictions", "Entradas desalojadas por capacidad (LRU)."),
+        ("expirations", "Entradas vencidas por TTL."),
+    ):
+        name = f"user_cache_{counter}_total"
+        families.append((name, "counter", documentation,
+                         [(name, {"index": index}, s[counter]) for index, s in indexes]))
+    families.append(("user_cache_coalesced_total", "counter",
+                     "Cargas concurrentes de un mismo usuario resueltas por una sola consulta.",
+                     [("user_cache_coalesced_total", {}, stats["coalesced"])]))
+    return families
+
+
+REGISTRY.add_collector(_db_pool_families)
+REGISTRY.add_collector(_admission_families)
+REGISTRY.add_collector(_user_cache_families)
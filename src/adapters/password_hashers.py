@@ -0,0 +1,292 @@
+# src/adapters/password_hashers.py
+"""
+Registro de algoritmos de hash de contraseñas y política de costo vigente.
+
+- Cada hash guardado se reconoce por su formato: bcrypt ($2a$/$2b$/$2y$, a
+  cualquier costo) o argon2id ($argon2id$, requiere el paquete opcional
+  `argon2-cffi`). Así conviven hashes de políticas anteriores con los nuevos.
+- La política (algoritmo y parámetros) sale de Settings. Con HASH_TARGET_MS
+  se calibra en el arranque: se elige el costo que más se acerca a esa
+  latencia en el hardware actual sin superarla.
+- needs_rehash() indica si un hash quedó desactualizado respecto de la
+  política; el login lo re-hashea en segundo plano tras verificarlo.
+
+Todas las funciones de nivel de módulo y HashPolicy son serializables, de modo
+que pueden ejecutarse en el pool de procesos de hashing.
+
+Para ver el costo que correspondería a una latencia objetivo:
+    python -m src.adapters.password_hashers --target-ms 250 [--algorithm argon2id]
+"""
+import argparse
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, NamedTuple, Optional
+
+from src.adapters.metrics import PASSWORD_HASH_SECONDS
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_MAX_BYTES = 72
+
+
+class HashPolicy(NamedTuple):
+    """Algoritmo y parámetros con los que se hashean las contraseñas nuevas."""
+    algorithm: str = "bcrypt"  # "bcrypt" o "argon2id"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+
+
+def truncate_to_bcrypt_limit(plain_password: str) -> bytes:
+    """
+    Convierte la contraseña a bytes truncando a 72 bytes (límite de bcrypt),
+    sin dejar caracteres multibyte cortados.
+    """
+    password_bytes = plain_password.encode('utf-8')
+    if len(password_bytes) > BCRYPT_MAX_BYTES:
+        # errors="ignore" descarta el carácter multibyte que quedó cortado
+        password_bytes = password_bytes[:BCRYPT_MAX_BYTES].decode('utf-8', errors='ignore').encode('utf-8')
+    return password_bytes
+
+
+class PasswordHasher(ABC):
+    name: str
+
+    @abstractmethod
+    def identify(self, hashed_value: str) -> bool:
+        """Indica si el hash tiene el formato de este algoritmo."""
+
+    @abstractmethod
+    def hash(self, plain_password: str, policy: HashPolicy) -> str:
+        pass
+
+    @abstractmethod
+    def verify(self, plain_password: str, hashed_value: str) -> bool:
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, hashed_value: str, policy: HashPolicy) -> bool:
+        """Indica si los parámetros del hash difieren de los de la política."""
+
+
+class BcryptHasher(PasswordHasher):
+    name = "bcrypt"
+    _FORMAT = re.compile(r"^\$2[aby]\$(\d{2})\$")
+
+    def identify(self, hashed_value: str) -> bool:
+        return self._FORMAT.match(hashed_value) is not None
+
+    def hash(self, plain_password: str, policy: HashPolicy) -> str:
+        import bcrypt  # Carga diferida: solo se necesita al hashear
+        salt = bcrypt.gensalt(rounds=policy.bcrypt_rounds)
+        return bcrypt.hashpw(truncate_to_bcrypt_limit(plain_password), salt).decode('utf-8')
+
+    def verify(self, plain_password: str, hashed_value: str) -> bool:
+        import bcrypt
+        return bcrypt.checkpw(truncate_to_bcrypt_limit(plain_password), hashed_value.encode('utf-8'))
+
+    def needs_rehash(self, hashed_value: str, policy: HashPolicy) -> bool:
+        return int(self._FORMAT.match(hashed_value).group(1)) != policy.bcrypt_rounds
+
+
+class Argon2idHasher(PasswordHasher):
+    name = "argon2id"
+    _PARAMS = re.compile(r"^\$argon2id\$v=\d+\$m=(\d+),t=(\d+),p=(\d+)\$")
+
+    @staticmethod
+    def _library():
+        try:
+            import argon2
+        except ImportError:
+            raise RuntimeError("argon2id requiere el paquete opcional 'argon2-cffi' (pip install argon2-cffi)")
+        return argon2
+
+    def identify(self, hashed_value: str) -> bool:
+        return hashed_value.startswith("$argon2id$")
+
+    def hash(self, plain_password: str, policy: HashPolicy) -> str:
+        argon2 = self._library()
+        hasher = argon2.PasswordHasher(
+            time_cost=policy.argon2_time_cost,
+            memory_cost=policy.argon2_memory_cost,
+            parallelism=policy.argon2_parallelism,
+            type=argon2.Type.ID,
+        )
+        return hasher.hash(plain_password)
+
+    def verify(self, plain_password: str, hashed_value: str) -> bool:
+        argon2 = self._library()
+        try:
+            return argon2.PasswordHasher().verify(hashed_value, plain_password)
+        except argon2.exceptions.VerificationError:
+            return False
+        except argon2.exceptions.InvalidHashError:
+            return False
+
+    def needs_rehash(self, hashed_value: str, policy: HashPolicy) -> bool:
+        match = self._PARAMS.match(hashed_value)
+        if match is None:
+            return True
+        memory_cost, time_cost, parallelism = (int(value) for value in match.groups())
+        return (memory_cost, time_cost, parallelism) != (
+            policy.argon2_memory_cost, policy.argon2_time_cost, policy.argon2_parallelism
+        )
+
+
+HASHERS: Dict[str, PasswordHasher] = {
+    hasher.name: hasher for hasher in (BcryptHasher(), Argon2idHasher())
+}
+
+
+def identify_hasher(hashed_value: str) -> Optional[PasswordHasher]:
+    """Algoritmo de un hash guardado, o None si el formato no se reconoce."""
+    for hasher in HASHERS.values():
+        if hasher.identify(hashed_value):
+            return hasher
+    return None
+
+
+def hash_password(plain_password: str, policy: Optional[HashPolicy] = None) -> str:
+    """Hashea con la política indicada (o la vigente del proceso)."""
+    policy = policy or get_hash_policy()
+    try:
+        hasher = HASHERS[policy.algorithm]
+    except KeyError:
+        raise ValueError(f"Algoritmo de hash no soportado: {policy.algorithm}")
+    start = time.perf_counter()
+    try:
+        return hasher.hash(plain_password, policy)
+    finally:
+        PASSWORD_HASH_SECONDS.labels("hash", hasher.name).observe(time.perf_counter() - start)
+
+
+def verify_password(plain_password: str, hashed_value: str) -> bool:
+    """Verifica contra un hash de cualquier algoritmo registrado; False si el formato es desconocido."""
+    hasher = identify_hasher(hashed_value or "")
+    if hasher is None:
+        return False
+    start = time.perf_counter()
+    try:
+        return hasher.verify(plain_password, hashed_value)
+    finally:
+        PASSWORD_HASH_SECONDS.labels("verify", hasher.name).observe(time.perf_counter() - start)
+
+
+def needs_rehash(hashed_value: str, policy: Optional[HashPolicy] = None) -> bool:
+    """Indica si el hash debe regenerarse para cumplir la política (algoritmo o parámetros distintos)."""
+    policy = policy or get_hash_policy()
+    hasher = identify_hasher(hashed_value or "")
+    if hasher is None:
+        return False  # Formato desconocido: no se puede verificar, tampoco re-hashear
+    return hasher.name != policy.algorithm or hasher.needs_rehash(hashed_value, policy)
+
+
+# --- Calibración ---
+
+def _best_time(fn: Callable[[], object], repeat: int = 2) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+    """
+    Mayor costo de bcrypt cuyo hash tarda como máximo `target_ms` en este
+    equipo (cada ronda adicional duplica el tiempo). Nunca baja de `min_rounds`.
+    """
+    policy = HashPolicy(algorithm="bcrypt", bcrypt_rounds=min_rounds)
+    elapsed = _best_time(lambda: BcryptHasher().hash("Calibracion-2024!", policy))
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 * 1000 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    return rounds
+
+
+def calibrate_argon2_time_cost(
+    target_ms: float, memory_cost: int, parallelism: int, max_time_cost: int = 10
+) -> int:
+    """Mayor time_cost de argon2id (con memoria y paralelismo fijos) que no supera `target_ms`."""
+    time_cost = 1
+    while time_cost < max_time_cost:
+        policy = HashPolicy(
+            algorithm="argon2id", argon2_time_cost=time_cost + 1,
+            argon2_memory_cost=memory_cost, argon2_parallelism=parallelism,
+        )
+        if _best_time(lambda: Argon2idHasher().hash("Calibracion-2024!", policy)) * 1000 > target_ms:
+            break
+        time_cost += 1
+    return time_cost
+
+
+_policy: Optional[HashPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def build_hash_policy(target_ms: Optional[float] = None, algorithm: Optional[str] = None) -> HashPolicy:
+    """Política según Settings; calibra el costo si hay latencia objetivo."""
+    settings = get_settings()
+    target_ms = settings.hash_target_ms if target_ms is None else target_ms
+    algorithm = algorithm or settings.hash_algorithm
+    policy = HashPolicy(
+        algorithm=algorithm,
+        bcrypt_rounds=settings.bcrypt_rounds,
+        argon2_time_cost=settings.argon2_time_cost,
+        argon2_memory_cost=settings.argon2_memory_cost,
+        argon2_parallelism=settings.argon2_parallelism,
+    )
+    if algorithm not in HASHERS:
+        raise ValueError(f"Algoritmo de hash no soportado: {algorithm}")
+    if target_ms and algorithm == "bcrypt":
+        policy = policy._replace(bcrypt_rounds=calibrate_bcrypt_rounds(target_ms))
+    elif target_ms and algorithm == "argon2id":
+        policy = policy._replace(argon2_time_cost=calibrate_argon2_time_cost(
+            target_ms, policy.argon2_memory_cost, policy.argon2_parallelism
+        ))
+    return policy
+
+
+def get_hash_policy() -> HashPolicy:
+    """Política vigente del proceso; la calibración, si corresponde, se hace una sola vez."""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                policy = build_hash_policy()
+                if get_settings().hash_target_ms:
+                    logger.info("Política de hashing calibrada: %s", _describe(policy))
+                _policy = policy
+    return _policy
+
+
+def _describe(policy: HashPolicy) -> str:
+    if policy.algorithm == "bcrypt":
+        return f"bcrypt rounds={policy.bcrypt_rounds}"
+    return (f"argon2id t={policy.argon2_time_cost} m={policy.argon2_memory_cost} KiB "
+            f"p={policy.argon2_parallelism}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibra el costo del hash de contraseñas en este equipo.")
+    parser.add_argument("--target-ms", type=float, required=True)
+    parser.add_argument("--algorithm", choices=sorted(HASHERS))
+    args = parser.parse_args()
+
+    try:
+        policy = build_hash_policy(args.target_ms, args.algorithm)
+        elapsed = _best_time(lambda: hash_password("Calibracion-2024!", policy), repeat=3)
+    except RuntimeError as e:
+        parser.error(str(e))
+    print(f"{_describe(policy)} -> {elapsed * 1000:.0f} ms por hash (objetivo: {args.target_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
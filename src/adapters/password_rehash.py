@@ -0,0 +1,68 @@
+# src/adapters/password_rehash.py
+"""
+Re-hash de contraseñas en segundo plano tras un login exitoso.
+
+Cuando la política de hashing cambia (más rondas de bcrypt, paso a argon2id),
+los hashes guardados se actualizan de forma gradual: el login, que es el único
+momento en que se conoce la contraseña en texto plano, agenda esta tarea
+después de responder. El UPDATE es condicional sobre el hash anterior, así que
+si el usuario cambió la contraseña entretanto, el re-hash se descarta.
+"""
+import logging
+import uuid
+
+from anyio import to_thread
+
+from src.adapters.admission import AdmissionRejected, HashPriority
+from src.adapters.hashing import run_hashing
+from src.adapters.password_hashers import get_hash_policy, hash_password
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _update_sync(user_id: uuid.UUID, old_hash: str, new_hash: str) -> bool:
+    from src.adapters.repositories.database import SessionLocal, get_engine
+    from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+
+    get_engine()
+    with SessionLocal() as db:
+        return MySQLUserRepository(db).update_password_hash(user_id, old_hash, new_hash)
+
+
+async def _update_async(user_id: uuid.UUID, old_hash: str, new_hash: str) -> bool:
+    from src.adapters.repositories.async_database import AsyncSessionLocal, get_async_engine
+    from src.adapters.repositories.async_sql_user_repository import AsyncSQLUserRepository
+
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        return await AsyncSQLUserRepository(db).update_password_hash(user_id, old_hash, new_hash)
+
+
+async def rehash_password(user_id: uuid.UUID, plain_password: str, old_hash: str) -> None:
+    """
+    Hashea la contraseña con la política vigente y reemplaza el hash anterior.
+    Corre después de la respuesta, cuando la sesión del request ya se cerró,
+    por eso abre su propia sesión.
+    """
+    settings = get_settings()
+    try:
+        new_hash = await run_hashing(
+            hash_password, plain_password, get_hash_policy(), priority=HashPriority.BULK
+        )
+        if settings.db_async:
+            updated = await _update_async(user_id, old_hash, new_hash)
+        else:
+            updated = await to_thread.run_sync(_update_sync, user_id, old_hash, new_hash)
+    except AdmissionRejected as e:
+        # Descarte esperado bajo carga (prioridad BULK): no es un error
+        logger.info("Re-hash del usuario %s postergado: %s", user_id, e.reason)
+        return
+    except Exception:
+        # El login ya respondió: un fallo aquí solo posterga el re-hash al próximo login
+        logger.exception("No se pudo re-hashear la contraseña del usuario %s", user_id)
+        return
+
+    if updated and settings.user_cache_enabled:
+        from src.adapters.repositories.cached_user_repository import get_user_cache
+        get_user_cache().invalidate(user_id)
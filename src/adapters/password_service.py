@@ -0,0 +1,40 @@
+# src/adapters/password_service.py
+"""
+Implementación de IPasswordService sobre los adaptadores de contraseñas: el
+índice de contraseñas comunes, los hashers registrados (con la política
+vigente) y el executor de hashing con control de admisión.
+"""
+from functools import lru_cache
+
+from src.adapters.admission import HashPriority
+from src.adapters.common_passwords import get_common_passwords
+from src.adapters.hashing import run_hashing
+from src.adapters.password_hashers import get_hash_policy, hash_password, needs_rehash, verify_password
+from src.ports.services.password_service import IPasswordService
+
+
+class PasswordService(IPasswordService):
+
+    def is_common(self, plain_password: str) -> bool:
+        return plain_password in get_common_passwords()
+
+    def hash(self, plain_password: str) -> str:
+        return hash_password(plain_password)
+
+    def verify(self, plain_password: str, hashed_value: str) -> bool:
+        return verify_password(plain_password, hashed_value)
+
+    def needs_rehash(self, hashed_value: str) -> bool:
+        return needs_rehash(hashed_value)
+
+    async def hash_async(self, plain_password: str) -> str:
+        # La política viaja con la tarea para no recalibrar en un pool de procesos
+        return await run_hashing(hash_password, plain_password, get_hash_policy(), priority=HashPriority.REGISTER)
+
+    async def verify_async(self, plain_password: str, hashed_value: str) -> bool:
+        return await run_hashing(verify_password, plain_password, hashed_value, priority=HashPriority.LOGIN)
+
+
+@lru_cache
+def get_password_service() -> PasswordService:
+    return PasswordService()
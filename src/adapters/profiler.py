@@ -0,0 +1,114 @@
+# src/adapters/profiler.py
+"""
+Profiler por muestreo sobre el tráfico real (POST /admin/profile).
+
+Durante N segundos un hilo toma, cada `interval`, la pila de todos los hilos
+del proceso con sys._current_frames() y cuenta cuántas veces aparece cada
+pila. El resultado se escribe en formato "folded stacks" (una línea por pila,
+marcos de la raíz a la hoja separados por ';' y el conteo al final), el que
+consumen flamegraph.pl, inferno y speedscope.
+
+No requiere instrumentar el código ni reiniciar el servicio; el costo es el
+del hilo de muestreo (decenas de µs por muestra). Con HASH_EXECUTOR=process
+el hashing corre en otros procesos y no aparece en las pilas.
+"""
+import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_running = threading.Lock()  # Un solo perfilado a la vez por proceso
+
+
+class ProfilerBusy(Exception):
+    """Ya hay un perfilado en curso en este proceso."""
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(ROOT + os.sep):
+        return os.path.relpath(filename, ROOT)
+    marker = filename.rfind("site-packages" + os.sep)
+    if marker != -1:
+        return filename[marker + len("site-packages") + 1:]
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}  # code object -> etiqueta del marco
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> None:
+        """Muestrea durante `seconds` (bloquea el hilo que lo llama)."""
+        deadline = time.perf_counter() + seconds
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            self.sample()
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.perf_counter()  # Atrasado: no acumular muestras pendientes
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def capture_profile(seconds: float, interval: float, directory: Optional[str] = None) -> dict:
+    """
+    Perfila el proceso durante `seconds` y escribe las pilas en un archivo
+    .folded dentro de `directory` (por defecto el directorio temporal).
+    Lanza ProfilerBusy si ya hay otro perfilado en curso.
+    """
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        profiler = SamplingProfiler(interval)
+        started = datetime.datetime.now()
+        profiler.run(seconds)
+    finally:
+        _running.release()
+
+    directory = directory or tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"profile-{started:%Y%m%d-%H%M%S}-{os.getpid()}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profiler.folded())
+    return {
+        "file": path,
+        "pid": os.getpid(),
+        "seconds": seconds,
+        "interval_ms": interval * 1000,
+        "samples": profiler.samples,
+        "stacks": len(profiler.stacks),
+    }
@@ -0,0 +1,255 @@
+# src/adapters/rate_limit_storage.py
+"""
+Almacenamiento de los contadores del rate limiting.
+
+slowapi delega en los storages de `limits`: cualquier clase que implemente
+`Storage` + `SlidingWindowCounterSupport` sirve para la estrategia de ventana
+deslizante (memory://, redis://, memcached://... o las de este módulo). El
+backend se elige con RATE_LIMIT_STORAGE_URI:
+
+- memory://                       contadores por proceso (un solo worker)
+- sqlite:////var/run/auth/rl.db   archivo SQLite compartido por todos los
+                                  workers del host (mismo formato de URL que
+                                  DATABASE_URL: tres barras = ruta relativa)
+- redis://host:6379               compartido entre hosts
+
+SQLiteStorage resuelve cada verificación con una transacción sobre dos filas
+(ventana anterior y actual) buscadas por clave primaria: costo O(1) y
+atómico entre procesos, sin la carrera de "incrementar y revertir".
+
+slowapi verifica los límites de forma síncrona, en el event loop de los
+endpoints asíncronos: la espera del lock de escritura se acota a
+`timeout` (100 ms). Si vence, el request se admite sin contarlo y se
+registra un aviso (fail-open): el rate limiting es una defensa contra el
+abuso, y un lock disputado por un instante no justifica un 500 ni frenar
+el event loop del worker.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+from typing import Optional, Tuple
+
+from limits.storage import SlidingWindowCounterSupport, Storage, storage_from_string
+from limits.storage.base import TimestampedSlidingWindow
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Cada cuántas escrituras se purgan los contadores vencidos, y cuántos como máximo por vez
+_PURGE_EVERY = 1000
+_PURGE_BATCH = 500
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Contadores en un archivo SQLite (modo WAL) compartido por los procesos del host."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, timeout: float = 0.1, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1][1:]
+        if self.path in ("", ":memory:"):
+            # Una base en memoria es distinta en cada conexión (una por hilo): no se comparte nada
+            raise ValueError(
+                f"RATE_LIMIT_STORAGE_URI={uri!r} requiere la ruta de un archivo, p. ej. sqlite:////var/run/auth/rl.db"
+            )
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)")
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # Una conexión por hilo y por proceso: una conexión heredada tras un
+        # fork no debe usarse en el hijo
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _count(self, db: sqlite3.Connection, key: str, now: float) -> Tuple[int, float]:
+        row = db.execute("SELECT count, expires_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            return 0, now
+        return row
+
+    def _incr(self, db: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        self._writes += 1
+        return db.execute(
+            "INSERT INTO rate_limits (key, count, expires_at) VALUES (?1, ?2, ?3 + ?4)"
+            " ON CONFLICT (key) DO UPDATE SET"
+            "  count = CASE WHEN expires_at <= ?3 THEN ?2 ELSE count + ?2 END,"
+            "  expires_at = CASE WHEN expires_at <= ?3 THEN ?3 + ?4 ELSE expires_at END"
+            " RETURNING count",
+            (key, amount, now, expiry),
+        ).fetchone()[0]
+
+    def _maybe_purge(self, db: sqlite3.Connection, now: float) -> None:
+        """
+        Cada _PURGE_EVERY escrituras borra hasta _PURGE_BATCH contadores vencidos,
+        en su propia transacción: no alarga la de la verificación. Si el lock
+        está tomado se omite; lo hará una escritura posterior.
+        """
+        if self._writes < _PURGE_EVERY:
+            return
+        self._writes = 0
+        try:
+            db.execute(
+                "DELETE FROM rate_limits WHERE key IN"
+                " (SELECT key FROM rate_limits WHERE expires_at <= ? LIMIT ?)",
+                (now, _PURGE_BATCH),
+            )
+        except sqlite3.OperationalError as e:
+            logger.debug("Purga de contadores omitida: %s", e)
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        db = self._connection()
+        now = time.time()
+        with db:
+            count = self._incr(db, key, expiry, amount, now)
+        self._maybe_purge(db, now)
+        return count
+
+    def get(self, key: str) -> int:
+        return self._count(self._connection(), key, time.time())[0]
+
+    def get_expiry(self, key: str) -> float:
+        return self._count(self._connection(), key, time.time())[1]
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        return self._connection().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def _window(self, db: sqlite3.Connection, key: str, expiry: int, now: float) -> Tuple[int, float, int, float]:
+        # Mismo cálculo que MemoryStorage: la ventana anterior pesa según lo que le queda de vida
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._count(db, previous_key, now)[0]
+        current_count = self._count(db, current_key, now)[0]
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        db = self._connection()
+        now = time.time()
+        # BEGIN IMMEDIATE toma el lock de escritura antes de leer: la lectura y el
+        # incremento son atómicos entre todos los workers
+        try:
+            db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            # Lock ocupado más de `timeout`: se admite sin contar (ver el docstring del módulo)
+            logger.warning("Rate limiting omitido para %s: %s", key, e)
+            return True
+        try:
+            previous_count, previous_ttl, current_count, _ = self._window(db, key, expiry, now)
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                acquired = False
+            else:
+                _, current_key = self.sliding_window_keys(key, expiry, now)
+                self._incr(db, current_key, 2 * expiry, amount, now)
+                acquired = True
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self._maybe_purge(db, now)
+        return acquired
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        return self._window(self._connection(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        for window_key in self.sliding_window_keys(key, expiry, time.time()):
+            self.clear(window_key)
+
+
+class ConfiguredStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Storage que se resuelve con RATE_LIMIT_STORAGE_URI en el primer uso.
+    El limiter se crea al importar el módulo de rutas; así la configuración
+    no se lee como efecto secundario del import.
+    """
+
+    STORAGE_SCHEME = ["settings"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._options = options
+        self._storage = None
+        self._lock = threading.Lock()
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            with self._lock:
+                if self._storage is None:
+                    self._storage = storage_from_string(get_settings().rate_limit_storage_uri, **self._options)
+        return self._storage
+
+    @property
+    def base_exceptions(self):
+        return self.storage.base_exceptions
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.storage.incr(key, expiry, amount)
+
+    def get(self, key: str) -> int:
+        return self.storage.get(key)
+
+    def get_expiry(self, key: str) -> float:
+        return self.storage.get_expiry(key)
+
+    def check(self) -> bool:
+        return self.storage.check()
+
+    def reset(self) -> Optional[int]:
+        return self.storage.reset()
+
+    def clear(self, key: str) -> None:
+        self.storage.clear(key)
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        return self.storage.acquire_sliding_window_entry(key, limit, expiry, amount)
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        return self.storage.get_sliding_window(key, expiry)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.storage.clear_sliding_window(key, expiry)
+
+
+def check_configured_storage() -> str:
+    """
+    Resuelve RATE_LIMIT_STORAGE_URI y verifica que el storage responda (al
+    arrancar: una URI inválida falla aquí y no en el primer request limitado).
+    """
+    uri = get_settings().rate_limit_storage_uri
+    if not storage_from_string(uri).check():
+        raise RuntimeError(f"El storage del rate limiting no responde: {uri.split('://', 1)[0]}://")
+    return uri.split("://", 1)[0]
@@ -0,0 +1,44 @@
+# src/adapters/refresh_token_purge.py
+"""
+Purga de refresh tokens que ya no sirven.
+
+Cada login y cada renovación insertan una fila en refresh_tokens y ninguna
+se borra en el flujo normal. Este comando elimina las que vencieron o cuya
+familia fue revocada; las usadas que siguen vigentes se conservan porque
+son las que permiten detectar una reutilización. Pensado para ejecutarse
+periódicamente (p. ej. un cron diario):
+
+    python -m src.adapters.refresh_token_purge [--keep-days 7] [--batch-size 1000]
+"""
+import argparse
+import datetime
+import logging
+
+from src.adapters.repositories.database import SessionLocal, get_engine
+from src.adapters.repositories.sql_refresh_token_repository import SQLRefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+def purge_refresh_tokens(keep_days: int = 0, batch_size: int = 1000) -> int:
+    """Borra los tokens vencidos o revocados hace más de `keep_days` días; devuelve cuántos borró."""
+    get_engine()
+    before = datetime.datetime.utcnow() - datetime.timedelta(days=keep_days)
+    with SessionLocal() as db:
+        purged = SQLRefreshTokenRepository(db).purge(before, batch_size)
+    logger.info("Refresh tokens purgados: %d (vencidos o revocados antes de %s)", purged, before.isoformat())
+    return purged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep-days", type=int, default=0, help="Conserva los vencidos o revocados en los últimos N días")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas borradas por transacción")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    purge_refresh_tokens(args.keep_days, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# src/adapters/repositories/async_database.py
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from src.config import get_settings
+from src.adapters.repositories.pool import engine_options
+
+# Motor asíncrono (aiomysql en producción, aiosqlite en local). Se crea en el primer uso.
+_async_engine = None
+
+# expire_on_commit=False: tras el commit no se recargan atributos de forma implícita,
+# algo que en modo asíncrono provocaría I/O fuera de un await.
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def get_async_engine():
+    """Devuelve el motor asíncrono de la aplicación, creándolo en la primera llamada."""
+    global _async_engine
+    if _async_engine is None:
+        settings = get_settings()
+        url = settings.get_async_db_url()
+        _async_engine = create_async_engine(url, **engine_options(url, settings, asynchronous=True))
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+def current_async_engine():
+    """Devuelve el motor asíncrono si ya fue creado, sin crearlo."""
+    return _async_engine
+
+async def dispose_async_engine() -> None:
+    """Cierra las conexiones del motor asíncrono (al apagar la aplicación)."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+# --- Dependencia de FastAPI para obtener una sesión asíncrona de BD ---
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,61 @@
+# src/adapters/repositories/async_sql_refresh_token_repository.py
+import datetime
+from typing import Optional
+import uuid
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.ports.repositories.async_refresh_token_repository import IAsyncRefreshTokenRepository
+from src.domain.entities.refresh_token import RefreshToken
+from src.adapters.repositories.db_models import RefreshTokenDB
+from src.adapters.repositories.mappers import model_to_refresh_token, refresh_token_to_model
+from src.adapters.repositories.sql_refresh_token_repository import purgeable
+
+class AsyncSQLRefreshTokenRepository(IAsyncRefreshTokenRepository):
+    """Repositorio de refresh tokens sobre AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, token: RefreshToken) -> None:
+        self.db.add(refresh_token_to_model(token))
+        await self.db.commit()
+
+    async def find_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        return model_to_refresh_token(await self.db.get(RefreshTokenDB, token_hash))
+
+    async def rotate(self, token_hash: str, replacement: RefreshToken, used_at: datetime.datetime) -> bool:
+        result = await self.db.execute(
+            update(RefreshTokenDB)
+            .where(
+                RefreshTokenDB.token_hash == token_hash,
+                RefreshTokenDB.used_at.is_(None),
+                RefreshTokenDB.revoked_at.is_(None),
+            )
+            .values(used_at=used_at)
+        )
+        if result.rowcount != 1:
+            await self.db.rollback()
+            return False
+        self.db.add(refresh_token_to_model(replacement))
+        await self.db.commit()
+        return True
+
+    async def revoke_family(self, family_id: uuid.UUID, revoked_at: datetime.datetime) -> None:
+        await self.db.execute(
+            update(RefreshTokenDB)
+            .where(RefreshTokenDB.family_id == str(family_id), RefreshTokenDB.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+        )
+        await self.db.commit()
+
+    async def purge(self, before: datetime.datetime, batch_size: int = 1000) -> int:
+        purged = 0
+        while True:
+            hashes = (await self.db.scalars(
+                select(RefreshTokenDB.token_hash).where(purgeable(before)).limit(batch_size)
+            )).all()
+            if not hashes:
+                return purged
+            await self.db.execute(delete(RefreshTokenDB).where(RefreshTokenDB.token_hash.in_(hashes)))
+            await self.db.commit()
+            purged += len(hashes)
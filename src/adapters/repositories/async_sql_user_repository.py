@@ -0,0 +1,122 @@
+# src/adapters/repositories/async_sql_user_repository.py
+from typing import AsyncIterator, Optional, List
+import uuid
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.user_repository import (
+    UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
+from src.domain.entities.user import User
+from src.adapters.repositories.db_models import UserDB
+from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+from src.adapters.repositories.listing import build_page, user_listing_statement
+from src.adapters.metrics import observe_repository
+from src.adapters.repositories.mappers import (
+    model_to_entity, entity_to_model, apply_entity_to_model, duplicate_user_error
+)
+
+class AsyncSQLUserRepository(IAsyncUserRepository):
+    """Repositorio SQL sobre AsyncSession: las esperas a la BD no ocupan hilos."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @observe_repository("async_sql")
+    async def save(self, user: User) -> None:
+        self.db.add(entity_to_model(user))
+        try:
+            await self._commit()
+        except UserAlreadyExistsError as e:
+            # Qué índice falla primero depende del motor; como siempre, el email tiene prioridad
+            if e.field == "username" and await self.exists_by_email(user.email.value):
+                raise UserAlreadyExistsError("email") from e
+            raise
+
+    async def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        # Reutiliza la inserción por lotes síncrona sobre la conexión de la AsyncSession
+        return await self.db.run_sync(lambda session: MySQLUserRepository(session).save_many(users))
+
+    async def exists_by_email(self, email: str) -> bool:
+        return await self.db.scalar(select(exists().where(UserDB.email == email)))
+
+    async def exists_by_username(self, username: str) -> bool:
+        return await self.db.scalar(select(exists().where(UserDB.username == username)))
+
+    @observe_repository("async_sql")
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        return model_to_entity(await self._first(UserDB.user_id == str(user_id)))
+
+    @observe_repository("async_sql")
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return model_to_entity(await self._first(UserDB.email == email))
+
+    @observe_repository("async_sql")
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        result = await self.db.execute(
+            select(UserDB.user_id, UserDB.password_hash).where(UserDB.email == email).limit(1)
+        )
+        row = result.first()
+        return UserCredentials(uuid.UUID(row.user_id), row.password_hash) if row else None
+
+    @observe_repository("async_sql")
+    async def find_by_username(self, username: str) -> Optional[User]:
+        return model_to_entity(await self._first(UserDB.username == username))
+
+    async def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        result = await self.db.scalars(user_listing_statement(filters, after).limit(limit + 1))
+        return build_page([model_to_entity(model) for model in result], limit)
+
+    async def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> AsyncIterator[User]:
+        statement = user_listing_statement(filters).execution_options(yield_per=chunk_size)
+        result = await self.db.stream_scalars(statement)
+        async for model in result:
+            yield model_to_entity(model)
+
+    async def find_all(self) -> List[User]:
+        result = await self.db.scalars(select(UserDB).options(joinedload(UserDB.profile)))
+        return [model_to_entity(model) for model in result.unique()]
+
+    @observe_repository("async_sql")
+    async def update(self, user: User) -> None:
+        user_model = await self._first(UserDB.user_id == str(user.user_id))
+        if user_model:
+            apply_entity_to_model(user, user_model)
+            await self._commit()
+
+    async def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        result = await self.db.execute(
+            update(UserDB)
+            .where(UserDB.user_id == str(user_id), UserDB.password_hash == expected_hash)
+            .values(password_hash=new_hash)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    @observe_repository("async_sql")
+    async def delete(self, user_id: uuid.UUID) -> None:
+        # El perfil se carga junto al usuario: en modo asíncrono no hay carga perezosa
+        # para resolver el cascade del borrado.
+        user_model = await self._first(UserDB.user_id == str(user_id))
+        if user_model:
+            await self.db.delete(user_model)
+            await self.db.commit()
+
+    async def _commit(self) -> None:
+        try:
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            duplicate = duplicate_user_error(e)
+            if duplicate is None:
+                raise
+            raise duplicate from e
+
+    async def _first(self, condition) -> Optional[UserDB]:
+        statement = select(UserDB).options(joinedload(UserDB.profile)).where(condition).limit(1)
+        result = await self.db.scalars(statement)
+        return result.first()
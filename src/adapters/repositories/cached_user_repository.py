@@ -0,0 +1,285 @@
+# src/adapters/repositories/cached_user_repository.py
+"""
+Caché de usuarios de lectura a través (USER_CACHE_ENABLED) sobre los repositorios.
+
+La caché vive en cada proceso. Las invalidaciones tras una escritura solo
+alcanzan al proceso que la hizo: con varios workers (uvicorn --workers o
+python -m src.adapters.api) los demás siguen sirviendo el usuario anterior,
+o uno ya borrado, hasta que vence USER_CACHE_TTL_SECONDS. Activarla con
+varios workers implica aceptar esa desactualización acotada por el TTL.
+"""
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+import uuid
+from src.adapters.cache import AsyncSingleFlight, LRUTTLCache, SingleFlight
+from src.config import get_settings
+from src.domain.entities.user import User
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.user_repository import (
+    IUserRepository, UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
+
+
+class UserCache:
+    """
+    Almacén de la caché de usuarios compartido por todos los requests del proceso.
+
+    Las entidades se guardan una sola vez, indexadas por id; los índices por
+    email y username apuntan al id. Al resolver por un índice secundario se
+    comprueba que la entidad siga teniendo ese email/username, de modo que un
+    cambio de username nunca devuelve datos de la clave anterior.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.by_id = LRUTTLCache(max_entries, ttl_seconds)
+        self.by_email = LRUTTLCache(max_entries, ttl_seconds)
+        self.by_username = LRUTTLCache(max_entries, ttl_seconds)
+        self.single_flight = SingleFlight()
+        self.async_single_flight = AsyncSingleFlight()
+        # Cada invalidación incrementa la generación; una carga que empezó antes
+        # de una escritura no puede volver a poblar la caché con datos viejos.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        user = self.by_id.get(user_id)
+        # Cada llamador recibe su propia copia: las entidades son mutables
+        return user.model_copy(deep=True) if user is not None else None
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        return self._resolve(self.by_email, email, lambda user: user.email.value == email)
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        return self._resolve(self.by_username, username, lambda user: user.username == username)
+
+    def put(self, user: User, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            # Se guarda una copia para que el llamador pueda mutar la suya
+            self.by_id.set(user.user_id, user.model_copy(deep=True))
+            self.by_email.set(user.email.value, user.user_id)
+            self.by_username.set(user.username, user.user_id)
+
+    def invalidate(self, user_id: uuid.UUID, *users: Optional[User]) -> None:
+        with self._lock:
+            self._generation += 1
+            cached = self.by_id.peek(user_id)
+            for user in (cached, *users):
+                if user is not None:
+                    self.by_email.delete(user.email.value)
+                    self.by_username.delete(user.username)
+            self.by_id.delete(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            for cache in (self.by_id, self.by_email, self.by_username):
+                cache.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "by_id": self.by_id.stats(),
+            "by_email": self.by_email.stats(),
+            "by_username": self.by_username.stats(),
+            "coalesced": self.single_flight.coalesced + self.async_single_flight.coalesced,
+        }
+
+    def _resolve(self, index: LRUTTLCache, key: str, matches: Callable[[User], bool]) -> Optional[User]:
+        user_id = index.get(key)
+        if user_id is None:
+            return None
+        user = self.by_id.get(user_id)
+        if user is None or not matches(user):
+            index.delete(key)
+            return None
+        return user.model_copy(deep=True)
+
+
+_user_cache: Optional[UserCache] = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> UserCache:
+    """Devuelve la caché de usuarios del proceso, creándola según Settings."""
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                settings = get_settings()
+                _user_cache = UserCache(settings.user_cache_max_entries, settings.user_cache_ttl_seconds)
+    return _user_cache
+
+
+def current_user_cache() -> Optional[UserCache]:
+    """Devuelve la caché de usuarios si ya fue creada, sin crearla (útil para métricas)."""
+    return _user_cache
+
+
+class CachedUserRepository(IUserRepository):
+    """
+    Decorador de lectura a través (read-through) sobre cualquier IUserRepository.
+    Las escrituras se delegan y después invalidan las entradas afectadas.
+    """
+
+    def __init__(self, inner: IUserRepository, cache: UserCache):
+        self.inner = inner
+        self.cache = cache
+
+    def save(self, user: User) -> None:
+        self.inner.save(user)
+        self.cache.invalidate(user.user_id, user)
+
+    def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        errors = self.inner.save_many(users)
+        for user, error in zip(users, errors):
+            if error is None:
+                self.cache.invalidate(user.user_id, user)
+        return errors
+
+    def exists_by_email(self, email: str) -> bool:
+        return self.inner.exists_by_email(email)
+
+    def exists_by_username(self, username: str) -> bool:
+        return self.inner.exists_by_username(username)
+
+    def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        return self.cache.get_by_id(user_id) or self._load(("id", user_id), lambda: self.inner.find_by_id(user_id))
+
+    def find_by_email(self, email: str) -> Optional[User]:
+        return self.cache.get_by_email(email) or self._load(("email", email), lambda: self.inner.find_by_email(email))
+
+    def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        # La proyección de credenciales ya es barata: no se cachea
+        return self.inner.find_credentials_by_email(email)
+
+    def find_by_username(self, username: str) -> Optional[User]:
+        return self.cache.get_by_username(username) or self._load(
+            ("username", username), lambda: self.inner.find_by_username(username)
+        )
+
+    def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        # Los listados no se cachean
+        return self.inner.find_page(filters, limit, after)
+
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> Iterator[User]:
+        return self.inner.iter_all(filters, chunk_size)
+
+    def find_all(self) -> List[User]:
+        # Los listados completos no se cachean
+        return self.inner.find_all()
+
+    def update(self, user: User) -> None:
+        self.inner.update(user)
+        self.cache.invalidate(user.user_id, user)
+
+    def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        updated = self.inner.update_password_hash(user_id, expected_hash, new_hash)
+        self.cache.invalidate(user_id)
+        return updated
+
+    def delete(self, user_id: uuid.UUID) -> None:
+        self.inner.delete(user_id)
+        self.cache.invalidate(user_id)
+
+    def _load(self, key: tuple, loader: Callable[[], Optional[User]]) -> Optional[User]:
+        generation = self.cache.generation
+
+        def load() -> Optional[User]:
+            user = loader()
+            if user is not None:
+                self.cache.put(user, generation)
+            return user
+
+        user, shared = self.cache.single_flight.do(key, load)
+        # Cada llamador recibe su propia copia: las entidades son mutables
+        if user is not None and shared:
+            return user.model_copy(deep=True)
+        return user
+
+
+class AsyncCachedUserRepository(IAsyncUserRepository):
+    """Decorador read-through sobre IAsyncUserRepository; comparte el almacén con CachedUserRepository."""
+
+    def __init__(self, inner: IAsyncUserRepository, cache: UserCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def save(self, user: User) -> None:
+        await self.inner.save(user)
+        self.cache.invalidate(user.user_id, user)
+
+    async def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        errors = await self.inner.save_many(users)
+        for user, error in zip(users, errors):
+            if error is None:
+                self.cache.invalidate(user.user_id, user)
+        return errors
+
+    async def exists_by_email(self, email: str) -> bool:
+        return await self.inner.exists_by_email(email)
+
+    async def exists_by_username(self, username: str) -> bool:
+        return await self.inner.exists_by_username(username)
+
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        return self.cache.get_by_id(user_id) or await self._load(
+            ("id", user_id), lambda: self.inner.find_by_id(user_id)
+        )
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return self.cache.get_by_email(email) or await self._load(
+            ("email", email), lambda: self.inner.find_by_email(email)
+        )
+
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        return await self.inner.find_credentials_by_email(email)
+
+    async def find_by_username(self, username: str) -> Optional[User]:
+        return self.cache.get_by_username(username) or await self._load(
+            ("username", username), lambda: self.inner.find_by_username(username)
+        )
+
+    async def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        return await self.inner.find_page(filters, limit, after)
+
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> AsyncIterator[User]:
+        return self.inner.iter_all(filters, chunk_size)
+
+    async def find_all(self) -> List[User]:
+        return await self.inner.find_all()
+
+    async def update(self, user: User) -> None:
+        await self.inner.update(user)
+        self.cache.invalidate(user.user_id, user)
+
+    async def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        updated = await self.inner.update_password_hash(user_id, expected_hash, new_hash)
+        self.cache.invalidate(user_id)
+        return updated
+
+    async def delete(self, user_id: uuid.UUID) -> None:
+        await self.inner.delete(user_id)
+        self.cache.invalidate(user_id)
+
+    async def _load(self, key: tuple, loader: Callable[[], Awaitable[Optional[User]]]) -> Optional[User]:
+        generation = self.cache.generation
+
+        async def load() -> Optional[User]:
+            user = await loader()
+            if user is not None:
+                self.cache.put(user, generation)
+            return user
+
+        user, shared = await self.cache.async_single_flight.do(key, load)
+        if user is not None and shared:
+            return user.model_copy(deep=True)
+        return user
@@ -1,22 +1,76 @@
 # src/adapters/repositories/database.py
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from src.config import settings
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from src.config import get_settings
+from src.adapters.repositories.pool import engine_options
 
-# Creamos el "motor" que conecta SQLAlchemy con la base de datos
-engine = create_engine(settings.get_db_url())
+# El "motor" que conecta SQLAlchemy con la base de datos se crea en el primer uso,
+# de modo que importar este módulo no carga el driver ni lee la configuración.
+_engine = None
 
 # SessionLocal es una fábrica de sesiones. Cada instancia será una sesión de base de datos.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Se enlaza al motor cuando éste se crea en get_engine().
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base es una clase base para nuestros modelos ORM.
 Base = declarative_base()
 
+def get_engine():
+    """Devuelve el motor de la aplicación, creándolo en la primera llamada."""
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        url = settings.get_db_url()
+        _engine = create_engine(url, **engine_options(url, settings))
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+def current_engine():
+    """Devuelve el motor si ya fue creado, sin crearlo (útil para métricas)."""
+    return _engine
+
+def __getattr__(name: str):
+    # Compatibilidad con `from src.adapters.repositories.database import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession:
+    """
+    Proxy de Session que crea la sesión real en el primer uso. Los requests que
+    se rechazan antes de tocar el repositorio (p. ej. 403 por autorización)
+    nunca crean la sesión ni piden una conexión al pool.
+    """
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory=SessionLocal):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            get_engine()
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
 # --- Dependencia de FastAPI para obtener una sesión de BD ---
 def get_db():
-    db = SessionLocal()
+    db = LazySession()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,5 +1,5 @@
 # src/adapters/repositories/db_models.py
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.mysql import CHAR
 import uuid
@@ -15,17 +15,41 @@ class UserDB(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     age = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # NOT NULL: es parte del cursor del listado (ver migrations/002_keyset_indexes.sql)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
     
     # Relación uno a uno con el perfil
     profile = relationship("ProfileDB", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    # Al borrar el usuario se borran sus refresh tokens
+    refresh_tokens = relationship("RefreshTokenDB", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Orden del listado paginado por cursor y filtro por rango de created_at
+        Index("ix_users_created_at_user_id", "created_at", "user_id"),
+    )
 
 class ProfileDB(Base):
     __tablename__ = "profiles"
     profile_id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(CHAR(36), ForeignKey("users.user_id"), nullable=False)
+    user_id = Column(CHAR(36), ForeignKey("users.user_id"), index=True, nullable=False)
     rol = Column(SQLAlchemyEnum(Rol), default=Rol.ALUMNO)
     entorno = Column(SQLAlchemyEnum(Entorno), nullable=False)
     nivel_educativo = Column(SQLAlchemyEnum(NivelEducativo), nullable=False)
     
-    user = relationship("UserDB", back_populates="profile")
\ No newline at end of file
+    user = relationship("UserDB", back_populates="profile")
+
+    __table_args__ = (
+        # Filtros del listado; incluyen user_id para resolver el JOIN desde el índice
+        Index("ix_profiles_entorno_nivel_educativo", "entorno", "nivel_educativo", "user_id"),
+        Index("ix_profiles_nivel_educativo", "nivel_educativo", "user_id"),
+    )
+
+class RefreshTokenDB(Base):
+    __tablename__ = "refresh_tokens"
+    token_hash = Column(CHAR(64), primary_key=True)  # SHA-256 en hexadecimal del token
+    user_id = Column(CHAR(36), ForeignKey("users.user_id", ondelete="CASCADE"), index=True, nullable=False)
+    family_id = Column(CHAR(36), index=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)  # Purga de tokens vencidos
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
@@ -0,0 +1,43 @@
+# src/adapters/repositories/listing.py
+"""
+Consulta del listado de usuarios compartida por los repositorios SQL (sync y async).
+
+El listado se ordena por (created_at, user_id) y se pagina por cursor: cada
+página continúa después de la última fila de la anterior, apoyándose en el
+índice ix_users_created_at_user_id, en lugar de usar OFFSET.
+"""
+from typing import List, Optional
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.orm import contains_eager
+from src.adapters.repositories.db_models import UserDB, ProfileDB
+from src.domain.entities.user import User
+from src.ports.repositories.user_repository import UserCursor, UserListFilter, UserPage
+
+
+def user_listing_statement(filters: UserListFilter, after: Optional[UserCursor] = None) -> Select:
+    # Un solo JOIN, que sirve a la vez para filtrar y para cargar el perfil
+    statement = select(UserDB).outerjoin(UserDB.profile).options(contains_eager(UserDB.profile))
+    if filters.entorno is not None:
+        statement = statement.where(ProfileDB.entorno == filters.entorno)
+    if filters.nivel_educativo is not None:
+        statement = statement.where(ProfileDB.nivel_educativo == filters.nivel_educativo)
+    if filters.created_from is not None:
+        statement = statement.where(UserDB.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(UserDB.created_at < filters.created_to)
+    if after is not None:
+        # Equivale a (created_at, user_id) > (after.created_at, after.user_id)
+        statement = statement.where(or_(
+            UserDB.created_at > after.created_at,
+            and_(UserDB.created_at == after.created_at, UserDB.user_id > str(after.user_id)),
+        ))
+    return statement.order_by(UserDB.created_at, UserDB.user_id)
+
+
+def build_page(users: List[User], limit: int) -> UserPage:
+    """Arma la página a partir de `limit + 1` filas: la fila extra indica que hay más."""
+    if len(users) <= limit:
+        return UserPage(users, None)
+    users = users[:limit]
+    last = users[-1]
+    return UserPage(users, UserCursor(last.created_at, last.user_id))
@@ -0,0 +1,152 @@
+# src/adapters/repositories/mappers.py
+"""Conversión entre modelos SQLAlchemy y entidades de dominio, compartida por los repositorios SQL."""
+from typing import Any, Dict, Optional, Tuple
+import re
+import uuid
+from sqlalchemy.exc import IntegrityError
+from src.domain.entities.user import User
+from src.domain.entities.profile import Profile
+from src.domain.entities.refresh_token import RefreshToken
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.password import Password
+from src.adapters.repositories.db_models import UserDB, ProfileDB, RefreshTokenDB
+from src.ports.repositories.user_repository import UserAlreadyExistsError
+
+def model_to_entity(model: UserDB) -> Optional[User]:
+    if not model:
+        return None
+        
+    # Los datos de la BD ya fueron validados al guardarse, por lo que se
+    # construyen las entidades sin volver a ejecutar validadores (model_construct).
+    user_id = uuid.UUID(model.user_id)
+
+    # Reconstruye el objeto de valor Password desde el hash almacenado
+    password_vo = Password.from_hash(model.password_hash)
+    
+    profile_entity = None
+    if model.profile:
+        profile_entity = Profile.model_construct(
+            profile_id=uuid.UUID(model.profile.profile_id),
+            user_id=user_id,
+            rol=model.profile.rol,
+            entorno=model.profile.entorno,
+            nivel_educativo=model.profile.nivel_educativo
+        )
+    
+    user_entity = User.model_construct(
+        user_id=user_id,
+        username=model.username,
+        age=model.age,
+        email=Email.model_construct(value=model.email),
+        password=password_vo,
+        profile=profile_entity,
+        created_at=model.created_at
+    )
+    return user_entity
+
+def entity_to_model(user: User) -> UserDB:
+    """Convierte una entidad de dominio a un modelo SQLAlchemy."""
+    profile_db = ProfileDB(
+        profile_id=str(user.profile.profile_id),
+        user_id=str(user.user_id),
+        rol=user.profile.rol,
+        entorno=user.profile.entorno,
+        nivel_educativo=user.profile.nivel_educativo
+    )
+    
+    user_db = UserDB(
+        user_id=str(user.user_id),
+        username=user.username,
+        email=user.email.value,
+        password_hash=user.password.hashed_value,
+        age=user.age,
+        created_at=user.created_at,
+        profile=profile_db
+    )
+    return user_db
+
+def entity_to_rows(user: User) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Filas (users, profiles) de una entidad como diccionarios, para inserciones
+    masivas con executemany sin instanciar modelos ORM.
+    """
+    user_id = str(user.user_id)
+    user_row = {
+        "user_id": user_id,
+        "username": user.username,
+        "email": user.email.value,
+        "password_hash": user.password.hashed_value,
+        "age": user.age,
+        "created_at": user.created_at,
+    }
+    profile_row = {
+        "profile_id": str(user.profile.profile_id),
+        "user_id": user_id,
+        "rol": user.profile.rol,
+        "entorno": user.profile.entorno,
+        "nivel_educativo": user.profile.nivel_educativo,
+    }
+    return user_row, profile_row
+
+# Formas de la violación de un índice único (no de NOT NULL u otras restricciones):
+# SQLite: "UNIQUE constraint failed: users.email"
+# MySQL (1062): "Duplicate entry 'x' for key 'users.ix_users_email'"; el valor
+# duplicado puede contener cualquier texto, por eso se toma la última clave
+_SQLITE_UNIQUE_RE = re.compile(r"UNIQUE constraint failed: ([\w., ]+)")
+_MYSQL_DUPLICATE_RE = re.compile(r"Duplicate entry '.*' for key '([^']+)'", re.DOTALL)
+
+def duplicate_user_error(error: IntegrityError) -> Optional[UserAlreadyExistsError]:
+    """
+    Traduce la violación de los índices únicos users.email / users.username a
+    UserAlreadyExistsError. Devuelve None si el IntegrityError es de otro tipo.
+    """
+    message = str(error.orig)
+    match = _SQLITE_UNIQUE_RE.search(message)
+    if match is not None:
+        columns = {column.strip() for column in match.group(1).split(",")}
+        if "users.email" in columns:
+            return UserAlreadyExistsError("email")
+        if "users.username" in columns:
+            return UserAlreadyExistsError("username")
+        return None
+    match = _MYSQL_DUPLICATE_RE.search(message)
+    if match is not None:
+        key = match.group(1)
+        if key.startswith("users.") or "." not in key:
+            if "email" in key:
+                return UserAlreadyExistsError("email")
+            if "username" in key:
+                return UserAlreadyExistsError("username")
+    return None
+
+def apply_entity_to_model(user: User, user_model: UserDB) -> None:
+    """Copia los campos actualizables de la entidad al modelo persistido."""
+    user_model.username = user.username
+    user_model.age = user.age
+    if user_model.profile:
+        user_model.profile.entorno = user.profile.entorno
+        user_model.profile.nivel_educativo = user.profile.nivel_educativo
+
+def refresh_token_to_model(token: RefreshToken) -> RefreshTokenDB:
+    return RefreshTokenDB(
+        token_hash=token.token_hash,
+        user_id=str(token.user_id),
+        family_id=str(token.family_id),
+        expires_at=token.expires_at,
+        created_at=token.created_at,
+        used_at=token.used_at,
+        revoked_at=token.revoked_at
+    )
+
+def model_to_refresh_token(model: RefreshTokenDB) -> Optional[RefreshToken]:
+    if not model:
+        return None
+    return RefreshToken.model_construct(
+        token_hash=model.token_hash,
+        user_id=uuid.UUID(model.user_id),
+        family_id=uuid.UUID(model.family_id),
+        expires_at=model.expires_at,
+        created_at=model.created_at,
+        used_at=model.used_at,
+        revoked_at=model.revoked_at
+    )
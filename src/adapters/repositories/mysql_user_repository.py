@@ -1,102 +1,162 @@
 # src/adapters/repositories/mysql_user_repository.py
-from typing import Optional, List
+from typing import Iterator, Optional, List
 import uuid
+from sqlalchemy import exists, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
-from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.user_repository import (
+    IUserRepository, UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
 from src.domain.entities.user import User
-from src.domain.entities.profile import Profile
-from src.domain.value_objects.email import Email
-from src.domain.value_objects.password import Password
 from src.adapters.repositories.db_models import UserDB, ProfileDB
+from src.adapters.repositories.listing import build_page, user_listing_statement
+from src.adapters.metrics import observe_repository
+from src.adapters.repositories.mappers import (
+    model_to_entity, entity_to_model, entity_to_rows, apply_entity_to_model, duplicate_user_error
+)
 
 class MySQLUserRepository(IUserRepository):
     
     def __init__(self, db: Session):
         self.db = db
 
+    @observe_repository("mysql")
     def save(self, user: User) -> None:
+        # Un único INSERT: los duplicados los detectan los índices únicos de la BD
         user_model = self._entity_to_model(user)
         self.db.add(user_model)
-        self.db.commit()
+        try:
+            self._commit()
+        except UserAlreadyExistsError as e:
+            # Qué índice falla primero depende del motor; como siempre, el email tiene prioridad
+            if e.field == "username" and self.exists_by_email(user.email.value):
+                raise UserAlreadyExistsError("email") from e
+            raise
+
+    def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        """
+        Inserta el lote con dos executemany (users y profiles) en una sola
+        transacción. Los duplicados se descartan antes con una consulta por
+        columna única; si aun así una escritura concurrente provoca un
+        IntegrityError, el lote se reintenta fila por fila.
+        """
+        errors: List[Optional[UserAlreadyExistsError]] = [None] * len(users)
+        emails = [user.email.value for user in users]
+        usernames = [user.username for user in users]
+        taken_emails = {email for (email,) in self.db.query(UserDB.email).filter(UserDB.email.in_(emails))}
+        taken_usernames = {
+            username for (username,) in self.db.query(UserDB.username).filter(UserDB.username.in_(usernames))
+        }
+
+        pending = []
+        for index, user in enumerate(users):
+            # También se detectan duplicados dentro del propio lote
+            if emails[index] in taken_emails:
+                errors[index] = UserAlreadyExistsError("email")
+            elif usernames[index] in taken_usernames:
+                errors[index] = UserAlreadyExistsError("username")
+            else:
+                taken_emails.add(emails[index])
+                taken_usernames.add(usernames[index])
+                pending.append(index)
+        if not pending:
+            return errors
+
+        rows = [entity_to_rows(users[index]) for index in pending]
+        try:
+            self.db.execute(insert(UserDB), [user_row for user_row, _ in rows])
+            self.db.execute(insert(ProfileDB), [profile_row for _, profile_row in rows])
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            for index in pending:
+                try:
+                    self.save(users[index])
+                except UserAlreadyExistsError as e:
+                    errors[index] = e
+        return errors
+
+    def exists_by_email(self, email: str) -> bool:
+        return self.db.query(exists().where(UserDB.email == email)).scalar()
 
+    def exists_by_username(self, username: str) -> bool:
+        return self.db.query(exists().where(UserDB.username == username)).scalar()
+
+    @observe_repository("mysql")
     def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         user_model = self.db.query(UserDB).options(joinedload(UserDB.profile)).filter(UserDB.user_id == str(user_id)).first()
         return self._model_to_entity(user_model) if user_model else None
 
+    @observe_repository("mysql")
     def find_by_email(self, email: str) -> Optional[User]:
         user_model = self.db.query(UserDB).options(joinedload(UserDB.profile)).filter(UserDB.email == email).first()
         return self._model_to_entity(user_model) if user_model else None
 
+    @observe_repository("mysql")
+    def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        # Solo dos columnas por el índice de email: sin JOIN al perfil ni hidratación
+        row = self.db.query(UserDB.user_id, UserDB.password_hash).filter(UserDB.email == email).first()
+        return UserCredentials(uuid.UUID(row.user_id), row.password_hash) if row else None
+
+    @observe_repository("mysql")
     def find_by_username(self, username: str) -> Optional[User]:
         user_model = self.db.query(UserDB).options(joinedload(UserDB.profile)).filter(UserDB.username == username).first()
         return self._model_to_entity(user_model) if user_model else None
     
+    def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        user_models = self.db.scalars(user_listing_statement(filters, after).limit(limit + 1)).all()
+        return build_page([self._model_to_entity(model) for model in user_models], limit)
+
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> Iterator[User]:
+        # yield_per usa un cursor del lado del servidor y trae las filas de a chunk_size
+        statement = user_listing_statement(filters).execution_options(yield_per=chunk_size)
+        for model in self.db.scalars(statement):
+            yield self._model_to_entity(model)
+
     def find_all(self) -> List[User]:
         user_models = self.db.query(UserDB).options(joinedload(UserDB.profile)).all()
         return [self._model_to_entity(model) for model in user_models]
     
+    @observe_repository("mysql")
     def update(self, user: User) -> None:
         user_model = self.db.query(UserDB).filter(UserDB.user_id == str(user.user_id)).first()
         if user_model:
             # Actualizar campos
-            user_model.username = user.username
-            user_model.age = user.age
-            if user_model.profile:
-                user_model.profile.entorno = user.profile.entorno
-                user_model.profile.nivel_educativo = user.profile.nivel_educativo
-            self.db.commit()
-    
+            apply_entity_to_model(user, user_model)
+            self._commit()
+
+    def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        # UPDATE condicional: si la contraseña cambió mientras tanto, gana el cambio
+        result = self.db.execute(
+            update(UserDB)
+            .where(UserDB.user_id == str(user_id), UserDB.password_hash == expected_hash)
+            .values(password_hash=new_hash)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    @observe_repository("mysql")
     def delete(self, user_id: uuid.UUID) -> None:
         user_model = self.db.query(UserDB).filter(UserDB.user_id == str(user_id)).first()
         if user_model:
             self.db.delete(user_model)
             self.db.commit()
 
+    def _commit(self) -> None:
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            duplicate = duplicate_user_error(e)
+            if duplicate is None:
+                raise
+            raise duplicate from e
+
     def _model_to_entity(self, model: UserDB) -> Optional[User]:
-        if not model:
-            return None
-            
-        # Reconstruye el objeto de valor Password desde el hash almacenado
-        password_vo = Password.from_hash(model.password_hash)
-        
-        profile_entity = None
-        if model.profile:
-            profile_entity = Profile(
-                profile_id=uuid.UUID(model.profile.profile_id),
-                user_id=uuid.UUID(model.user_id),
-                rol=model.profile.rol,
-                entorno=model.profile.entorno,
-                nivel_educativo=model.profile.nivel_educativo
-            )
-        
-        user_entity = User(
-            user_id=uuid.UUID(model.user_id),
-            username=model.username,
-            age=model.age,
-            email=Email(value=model.email),
-            password=password_vo,
-            profile=profile_entity,
-            created_at=model.created_at
-        )
-        return user_entity
+        return model_to_entity(model)
 
     def _entity_to_model(self, user: User) -> UserDB:
         """Convierte una entidad de dominio a un modelo SQLAlchemy."""
-        profile_db = ProfileDB(
-            profile_id=str(user.profile.profile_id),
-            user_id=str(user.user_id),
-            rol=user.profile.rol,
-            entorno=user.profile.entorno,
-            nivel_educativo=user.profile.nivel_educativo
-        )
-        
-        user_db = UserDB(
-            user_id=str(user.user_id),
-            username=user.username,
-            email=user.email.value,
-            password_hash=user.password.hashed_value,
-            age=user.age,
-            created_at=user.created_at,
-            profile=profile_db
-        )
-        return user_db
\ No newline at end of file
+        return entity_to_model(user)
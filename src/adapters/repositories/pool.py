@@ -0,0 +1,119 @@
+# src/adapters/repositories/pool.py
+"""
+Pool de conexiones configurable y observable.
+
+Las opciones del pool salen de Settings y los pools registran cuánto tiempo
+esperan los requests para obtener una conexión, además de lo que ya expone
+SQLAlchemy (conexiones prestadas, libres y de overflow).
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from src.config import Settings
+
+
+class PoolWaitStats:
+    """Estadísticas acumuladas del tiempo de espera al pedir una conexión al pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "timeouts": self.timeouts,
+                "avg_ms": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3),
+                "total_ms": round(self.total_seconds * 1000, 3),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Mide cada checkout del pool (espera + apertura de conexión si hace falta)."""
+
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        # engine.dispose() recrea el pool: se conservan las estadísticas acumuladas
+        new_pool = super().recreate()
+        new_pool.wait_stats = self.wait_stats
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+def engine_options(url: str, settings: Settings, asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos de create_engine/create_async_engine para el pool. Las bases
+    SQLite en memoria usan el pool propio de SQLAlchemy (una sola conexión).
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    poolclass: Type[Pool] = InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def pool_status(engine: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """Estado actual del pool de un motor (sync o async), o None si no se ha creado."""
+    if engine is None:
+        return None
+    pool = getattr(engine, "sync_engine", engine).pool
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["wait"] = wait_stats.snapshot()
+    return status
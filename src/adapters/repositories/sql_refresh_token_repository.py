@@ -0,0 +1,68 @@
+# src/adapters/repositories/sql_refresh_token_repository.py
+import datetime
+from typing import Optional
+import uuid
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+from src.ports.repositories.refresh_token_repository import IRefreshTokenRepository
+from src.domain.entities.refresh_token import RefreshToken
+from src.adapters.repositories.db_models import RefreshTokenDB
+from src.adapters.repositories.mappers import model_to_refresh_token, refresh_token_to_model
+
+
+def purgeable(before: datetime.datetime):
+    """Condición de los tokens que ya no sirven para renovar ni para detectar reutilización."""
+    return or_(RefreshTokenDB.expires_at < before, RefreshTokenDB.revoked_at < before)
+
+
+class SQLRefreshTokenRepository(IRefreshTokenRepository):
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(self, token: RefreshToken) -> None:
+        self.db.add(refresh_token_to_model(token))
+        self.db.commit()
+
+    def find_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        # Búsqueda por clave primaria
+        return model_to_refresh_token(self.db.get(RefreshTokenDB, token_hash))
+
+    def rotate(self, token_hash: str, replacement: RefreshToken, used_at: datetime.datetime) -> bool:
+        # UPDATE condicional: de dos requests concurrentes con el mismo token, solo uno lo marca
+        result = self.db.execute(
+            update(RefreshTokenDB)
+            .where(
+                RefreshTokenDB.token_hash == token_hash,
+                RefreshTokenDB.used_at.is_(None),
+                RefreshTokenDB.revoked_at.is_(None),
+            )
+            .values(used_at=used_at)
+        )
+        if result.rowcount != 1:
+            self.db.rollback()
+            return False
+        self.db.add(refresh_token_to_model(replacement))
+        self.db.commit()
+        return True
+
+    def revoke_family(self, family_id: uuid.UUID, revoked_at: datetime.datetime) -> None:
+        self.db.execute(
+            update(RefreshTokenDB)
+            .where(RefreshTokenDB.family_id == str(family_id), RefreshTokenDB.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+        )
+        self.db.commit()
+
+    def purge(self, before: datetime.datetime, batch_size: int = 1000) -> int:
+        # Por lotes: un único DELETE sobre una tabla grande bloquea filas demasiado tiempo
+        purged = 0
+        while True:
+            hashes = self.db.scalars(
+                select(RefreshTokenDB.token_hash).where(purgeable(before)).limit(batch_size)
+            ).all()
+            if not hashes:
+                return purged
+            self.db.execute(delete(RefreshTokenDB).where(RefreshTokenDB.token_hash.in_(hashes)))
+            self.db.commit()
+            purged += len(hashes)
@@ -0,0 +1,29 @@
+# src/adapters/repositories/threaded_refresh_token_repository.py
+import datetime
+from typing import Optional
+import uuid
+from anyio import to_thread
+from src.ports.repositories.async_refresh_token_repository import IAsyncRefreshTokenRepository
+from src.ports.repositories.refresh_token_repository import IRefreshTokenRepository
+from src.domain.entities.refresh_token import RefreshToken
+
+class ThreadedRefreshTokenRepository(IAsyncRefreshTokenRepository):
+    """Adapta un IRefreshTokenRepository síncrono al puerto asíncrono (threadpool de AnyIO)."""
+
+    def __init__(self, inner: IRefreshTokenRepository):
+        self.inner = inner
+
+    async def add(self, token: RefreshToken) -> None:
+        await to_thread.run_sync(self.inner.add, token)
+
+    async def find_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        return await to_thread.run_sync(self.inner.find_by_hash, token_hash)
+
+    async def rotate(self, token_hash: str, replacement: RefreshToken, used_at: datetime.datetime) -> bool:
+        return await to_thread.run_sync(self.inner.rotate, token_hash, replacement, used_at)
+
+    async def revoke_family(self, family_id: uuid.UUID, revoked_at: datetime.datetime) -> None:
+        await to_thread.run_sync(self.inner.revoke_family, family_id, revoked_at)
+
+    async def purge(self, before: datetime.datetime, batch_size: int = 1000) -> int:
+        return await to_thread.run_sync(self.inner.purge, before, batch_size)
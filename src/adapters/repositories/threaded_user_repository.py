@@ -0,0 +1,71 @@
+# src/adapters/repositories/threaded_user_repository.py
+from typing import AsyncIterator, Optional, List
+import uuid
+from anyio import to_thread
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.user_repository import (
+    IUserRepository, UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
+from src.domain.entities.user import User
+
+class ThreadedUserRepository(IAsyncUserRepository):
+    """
+    Adapta un IUserRepository síncrono al puerto asíncrono ejecutando cada
+    llamada en el threadpool de AnyIO. Es el camino usado cuando DB_ASYNC
+    está desactivado.
+    """
+
+    def __init__(self, inner: IUserRepository):
+        self.inner = inner
+
+    async def save(self, user: User) -> None:
+        await to_thread.run_sync(self.inner.save, user)
+
+    async def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        return await to_thread.run_sync(self.inner.save_many, users)
+
+    async def exists_by_email(self, email: str) -> bool:
+        return await to_thread.run_sync(self.inner.exists_by_email, email)
+
+    async def exists_by_username(self, username: str) -> bool:
+        return await to_thread.run_sync(self.inner.exists_by_username, username)
+
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        return await to_thread.run_sync(self.inner.find_by_id, user_id)
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return await to_thread.run_sync(self.inner.find_by_email, email)
+
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        return await to_thread.run_sync(self.inner.find_credentials_by_email, email)
+
+    async def find_by_username(self, username: str) -> Optional[User]:
+        return await to_thread.run_sync(self.inner.find_by_username, username)
+
+    async def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        return await to_thread.run_sync(self.inner.find_page, filters, limit, after)
+
+    async def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> AsyncIterator[User]:
+        # Un generador síncrono no puede cruzar hilos: se recorre página por página
+        after = None
+        while True:
+            page = await self.find_page(filters, chunk_size, after)
+            for user in page.users:
+                yield user
+            if page.next_cursor is None:
+                return
+            after = page.next_cursor
+
+    async def find_all(self) -> List[User]:
+        return await to_thread.run_sync(self.inner.find_all)
+
+    async def update(self, user: User) -> None:
+        await to_thread.run_sync(self.inner.update, user)
+
+    async def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        return await to_thread.run_sync(self.inner.update_password_hash, user_id, expected_hash, new_hash)
+
+    async def delete(self, user_id: uuid.UUID) -> None:
+        await to_thread.run_sync(self.inner.delete, user_id)
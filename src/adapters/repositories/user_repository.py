@@ -1,7 +1,9 @@
 # src/adapters/repositories/user_repository.py
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
 import uuid
-from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.user_repository import (
+    IUserRepository, UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
 from src.domain.entities.user import User
 
 class InMemoryUserRepository(IUserRepository):
@@ -11,8 +13,19 @@ class InMemoryUserRepository(IUserRepository):
 
     def save(self, user: User) -> None:
         print(f"Guardando usuario {user.username} en memoria.")
+        # Emula las restricciones únicas de la BD
+        if self.exists_by_email(user.email.value):
+            raise UserAlreadyExistsError("email")
+        if self.exists_by_username(user.username):
+            raise UserAlreadyExistsError("username")
         self._users[user.user_id] = user
 
+    def exists_by_email(self, email: str) -> bool:
+        return self.find_by_email(email) is not None
+
+    def exists_by_username(self, username: str) -> bool:
+        return self.find_by_username(username) is not None
+
     # --- MÉTODO FALTANTE AÑADIDO AQUÍ ---
     def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         print(f"Buscando usuario con ID {user_id} en memoria.")
@@ -26,12 +39,51 @@ class InMemoryUserRepository(IUserRepository):
                 return user
         return None
 
+    def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        errors: List[Optional[UserAlreadyExistsError]] = []
+        for user in users:
+            try:
+                self.save(user)
+                errors.append(None)
+            except UserAlreadyExistsError as e:
+                errors.append(e)
+        return errors
+
+    def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        user = self.find_by_email(email)
+        return UserCredentials(user.user_id, user.password.hashed_value) if user else None
+
     def find_by_username(self, username: str) -> Optional[User]:
         for user in self._users.values():
             if user.username == username:
                 return user
         return None
         
+    def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        users = []
+        for user in self.iter_all(filters):
+            if after is not None and (user.created_at, str(user.user_id)) <= (after.created_at, str(after.user_id)):
+                continue
+            if len(users) == limit:
+                last = users[-1]
+                return UserPage(users, UserCursor(last.created_at, last.user_id))
+            users.append(user)
+        return UserPage(users, None)
+
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> Iterator[User]:
+        for user in sorted(self._users.values(), key=lambda u: (u.created_at, str(u.user_id))):
+            if filters.entorno is not None and user.profile.entorno != filters.entorno:
+                continue
+            if filters.nivel_educativo is not None and user.profile.nivel_educativo != filters.nivel_educativo:
+                continue
+            if filters.created_from is not None and user.created_at < filters.created_from:
+                continue
+            if filters.created_to is not None and user.created_at >= filters.created_to:
+                continue
+            yield user
+
     def find_all(self) -> List[User]:
         return list(self._users.values())
 
@@ -44,6 +96,13 @@ class InMemoryUserRepository(IUserRepository):
             # raise FileNotFoundError("Usuario no encontrado para actualizar.")
             pass # Por ahora lo dejamos pasar
 
+    def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        user = self._users.get(user_id)
+        if user is None or user.password.hashed_value != expected_hash:
+            return False
+        user.password.hashed_value = new_hash
+        return True
+
     def delete(self, user_id: uuid.UUID) -> None:
         if user_id in self._users:
             print(f"Eliminando usuario con ID {user_id} de la memoria.")
@@ -1,10 +1,21 @@
 # src/adapters/security.py
+import hashlib
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from src.config import settings # Importamos nuestra configuración centralizada
+from typing import Optional, Tuple
+from src.adapters.cache import LRUTTLCache
+from src.adapters.jwt_keys import get_key_ring
+from src.adapters.metrics import JWT_SECONDS, timed
+from src.config import get_settings # Importamos nuestra configuración centralizada
 
+@timed(JWT_SECONDS, "encode", phase="jwt.encode")
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    # python-jose (y cryptography) se cargan en el primer uso, no al arrancar
+    from jose import jwt
+
+    settings = get_settings()
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -12,6 +23,97 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
\ No newline at end of file
+
+    key_ring = get_key_ring()
+    if key_ring is None:
+        encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    else:
+        # Firma asimétrica: el `kid` indica a los verificadores qué clave pública usar
+        signing_key = key_ring.signing_key
+        encoded_jwt = jwt.encode(
+            to_encode, signing_key.private_key, algorithm=key_ring.algorithm, headers={"kid": signing_key.kid}
+        )
+    return encoded_jwt
+
+def generate_refresh_token() -> Tuple[str, str]:
+    """
+    Genera un refresh token opaco (256 bits aleatorios). Devuelve el valor para
+    el cliente y su hash SHA-256, que es lo único que se guarda en la BD.
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    # Un hash rápido es suficiente: el token es aleatorio, no una contraseña
+    return hashlib.sha256(token.encode()).hexdigest()
+
+@timed(JWT_SECONDS, "decode", phase="jwt.decode")
+def decode_access_token(token: str) -> dict:
+    """
+    Verifica la firma y la expiración de un token y devuelve sus claims.
+    Lanza JWTError si el token no es válido.
+    """
+    from jose import JWTError, jwt
+
+    settings = get_settings()
+    key_ring = get_key_ring()
+    if key_ring is None:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+    header = jwt.get_unverified_header(token)
+    if settings.jwt_accept_hs256 and header.get("alg") == "HS256":
+        return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    kid = header.get("kid")
+    if not isinstance(kid, str):
+        # El header no está verificado: un `kid` que no es texto se rechaza antes de buscarlo
+        raise JWTError("El token no indica una clave válida (kid)")
+    verification_key = key_ring.get(kid)
+    if verification_key is None:
+        raise JWTError("El token no fue firmado con una clave activa")
+    return jwt.decode(token, verification_key.public_key, algorithms=[key_ring.algorithm])
+
+
+# --- Verificación de tokens ---
+# El gateway valida el mismo token en cada request que proxea. Los tokens ya
+# verificados se guardan por su digest (nunca el token en claro) junto a su
+# `sub`, hasta su `exp`: las validaciones repetidas no vuelven a verificar la firma.
+
+_token_cache: Optional[LRUTTLCache] = None
+_token_cache_lock = threading.Lock()
+
+def get_token_cache() -> LRUTTLCache:
+    """Devuelve la caché de tokens verificados del proceso, creándola según Settings."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = LRUTTLCache(get_settings().token_cache_max_entries)
+    return _token_cache
+
+def verify_access_token(token: str) -> Optional[str]:
+    """
+    Verifica un access token y devuelve su claim `sub`, o None si el token es
+    inválido, expiró o no tiene `sub`.
+    """
+    settings = get_settings()
+    cache = get_token_cache() if settings.token_cache_enabled else None
+    if cache is not None:
+        key = hashlib.sha256(token.encode()).digest()
+        user_id = cache.get(key)
+        if user_id is not None:
+            return user_id
+
+    from jose import JWTError
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return None
+    user_id = payload.get("sub")
+    if not user_id:
+        return None
+
+    # Solo se cachean tokens con `exp`: la entrada vence junto con el token
+    exp = payload.get("exp")
+    if cache is not None and isinstance(exp, (int, float)):
+        cache.set(key, user_id, expires_at=time.monotonic() + (exp - time.time()))
+    return user_id
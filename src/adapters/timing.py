@@ -0,0 +1,104 @@
+# src/adapters/timing.py
+"""
+Fases por request emitidas en el header Server-Timing.
+
+El código instrumentado marca fases con `with phase("vo.email"): ...` o
+record_phase(nombre, segundos). Fuera de un request medido el costo es una
+lectura de ContextVar; dentro, las duraciones se suman por nombre y el
+middleware las agrega a la respuesta, por ejemplo:
+
+    Server-Timing: dto;dur=0.41, vo.email;dur=0.08, hash.wait;dur=0.01,
+                   hash;dur=402.3, db.save;dur=3.9, total;dur=409.7
+
+La medición es opcional: se activa para todos los requests con
+SERVER_TIMING_ENABLED=true, o para uno solo enviando el header
+`X-Server-Timing` con el ADMIN_TOKEN (los tiempos por fase revelan, p. ej.,
+si un email existe, por eso no se exponen a cualquiera).
+"""
+import hmac
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from src.config import get_settings
+
+
+class PhaseRecorder:
+    """Duraciones acumuladas por fase, en el orden en que aparecieron."""
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_recorder: ContextVar[Optional[PhaseRecorder]] = ContextVar("server_timing_recorder", default=None)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - start)
+
+
+def _requested(scope) -> bool:
+    settings = get_settings()
+    if settings.server_timing_enabled:
+        return True
+    if not settings.admin_token:
+        return False
+    for name, value in scope["headers"]:
+        if name == b"x-server-timing":
+            return hmac.compare_digest(value, settings.admin_token.encode())
+    return False
+
+
+class ServerTimingMiddleware:
+    """Middleware ASGI: activa el registro de fases y agrega Server-Timing al iniciar la respuesta."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        recorder = PhaseRecorder()
+        token = _recorder.set(recorder)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Las fases posteriores (tareas en segundo plano) ya no llegan al header
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", recorder.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _recorder.reset(token)
@@ -0,0 +1,200 @@
+# src/adapters/warmup.py
+"""
+Precalentamiento del proceso antes de recibir tráfico.
+
+Tras un despliegue, los primeros requests pagaban la apertura de las
+conexiones a la BD, la carga del diccionario de contraseñas y la
+inicialización del hashing (incluida la calibración de la política). El
+lifespan de la app (src/adapters/api/main.py) lanza `run_warmup` en segundo
+plano y /ready responde 503 hasta que termina, de modo que el balanceador
+solo envía tráfico a instancias listas:
+
+    1. schema: verifica que las tablas, columnas e índices de los modelos
+       existan, sin ejecutar DDL (con DB_CREATE_TABLES=true crea las tablas
+       que falten, para desarrollo local; ver migrations/README.md)
+    2. db_pool: abre WARMUP_DB_CONNECTIONS conexiones del pool a la vez
+       (0 = DB_POOL_SIZE) y las devuelve al pool; también el motor
+       asíncrono si DB_ASYNC está activo
+    3. common_passwords: abre el índice del diccionario y lo precarga en la
+       caché de páginas
+    4. rate_limit: verifica RATE_LIMIT_STORAGE_URI y que el storage responda
+    5. hashing: resuelve la política (calibra si HASH_TARGET_MS > 0) y hace
+       un hash y una verificación en el executor de hashing
+
+/health sigue respondiendo 200 mientras tanto (el proceso está vivo).
+"""
+import asyncio
+import logging
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import QueuePool
+
+from src.adapters.common_passwords import get_common_passwords
+from src.adapters.hashing import get_hash_executor
+from src.adapters.password_hashers import get_hash_policy, hash_password, verify_password
+from src.adapters.rate_limit_storage import check_configured_storage
+from src.adapters.repositories import db_models  # noqa: F401 (registra los modelos en Base)
+from src.adapters.repositories.async_database import get_async_engine
+from src.adapters.repositories.database import Base, get_engine
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_WARMUP_PASSWORD = "Precalentamiento-2024!"
+
+
+class SchemaMismatch(RuntimeError):
+    """La base de datos no tiene las tablas, columnas o índices que esperan los modelos."""
+
+
+class WarmupState:
+    """Avance del precalentamiento: estado, duración de cada paso y error, si lo hubo."""
+
+    def __init__(self):
+        self.status = "pending"  # pending -> running -> ready | failed
+        self.steps: Dict[str, float] = {}
+        self.failed_step: Optional[str] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {
+            "status": self.status,
+            "steps_ms": {name: round(seconds * 1000, 1) for name, seconds in self.steps.items()},
+        }
+        if self.failed_step is not None:
+            snapshot["failed_step"] = self.failed_step
+        if self.started is not None and self.finished is not None:
+            snapshot["total_ms"] = round((self.finished - self.started) * 1000, 1)
+        return snapshot
+
+
+def missing_schema(engine) -> List[str]:
+    """
+    Tablas, columnas e índices de los modelos que no existen en la BD
+    ("tabla", "tabla.columna" o "tabla.índice"). Solo consulta el catálogo: no
+    ejecuta DDL. Un índice cuenta como presente si hay otro con las mismas
+    columnas, aunque se llame distinto (p. ej. el que MySQL crea para una
+    clave foránea).
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            missing.append(table.name)
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(f"{table.name}.{column.name}" for column in table.columns if column.name not in columns)
+        indexed = {tuple(index["column_names"]) for index in inspector.get_indexes(table.name)}
+        missing.extend(
+            f"{table.name}.{index.name}" for index in sorted(table.indexes, key=lambda index: index.name)
+            if tuple(column.name for column in index.columns) not in indexed
+        )
+    return missing
+
+
+def verify_schema() -> int:
+    engine = get_engine()
+    if get_settings().db_create_tables:
+        Base.metadata.create_all(bind=engine)
+    missing = missing_schema(engine)
+    if missing:
+        raise SchemaMismatch(f"Faltan en la base de datos: {', '.join(missing)}")
+    return len(Base.metadata.tables)
+
+
+def _warm_connections(engine) -> int:
+    """Cantidad de conexiones a abrir, acotada al tamaño del pool."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, QueuePool):
+        return 1  # SQLite en memoria: una sola conexión
+    wanted = get_settings().warmup_db_connections or pool.size()
+    return max(1, min(wanted, pool.size()))
+
+
+def warm_db_pool() -> int:
+    """Abre las conexiones a la vez (para que sean distintas) y las devuelve al pool."""
+    engine = get_engine()
+    count = _warm_connections(engine)
+    with ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+    return count
+
+
+async def warm_async_db_pool() -> int:
+    engine = get_async_engine()
+    count = _warm_connections(engine)
+    connections = [await engine.connect() for _ in range(count)]
+    try:
+        for connection in connections:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return count
+
+
+def warm_common_passwords() -> int:
+    index = get_common_passwords()
+    index.prefetch()
+    _WARMUP_PASSWORD in index  # Primera búsqueda: recorre el camino de la búsqueda binaria
+    return len(index)
+
+
+def _hash_and_verify(policy) -> bool:
+    return verify_password(_WARMUP_PASSWORD, hash_password(_WARMUP_PASSWORD, policy))
+
+
+async def warm_hashing():
+    """
+    La política se resuelve fuera del event loop (la calibración hashea
+    varias veces). El hash de prueba va directo al executor, sin pasar por el
+    control de admisión: todavía no hay requests con los que competir.
+    """
+    policy = await asyncio.to_thread(get_hash_policy)
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(get_hash_executor(), _hash_and_verify, policy):
+        raise RuntimeError("La verificación del hash de prueba falló")
+    return policy
+
+
+async def run_warmup(state: WarmupState) -> None:
+    """Ejecuta los pasos en orden; ante un error el estado queda en "failed" y se registra en el log."""
+    settings = get_settings()
+    steps = [
+        ("schema", lambda: asyncio.to_thread(verify_schema)),
+        ("db_pool", lambda: asyncio.to_thread(warm_db_pool)),
+    ]
+    if settings.db_async:
+        steps.append(("db_pool_async", warm_async_db_pool))
+    steps += [
+        ("common_passwords", lambda: asyncio.to_thread(warm_common_passwords)),
+        ("rate_limit", lambda: asyncio.to_thread(check_configured_storage)),
+        ("hashing", warm_hashing),
+    ]
+
+    state.status = "running"
+    state.started = time.perf_counter()
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            result = await step()
+        except Exception:
+            state.status, state.failed_step = "failed", name
+            state.finished = time.perf_counter()
+            logger.exception("Falló el precalentamiento en el paso '%s'; /ready seguirá respondiendo 503", name)
+            return
+        state.steps[name] = time.perf_counter() - start
+        logger.info("Precalentamiento: %s listo en %.0f ms (%s)", name, state.steps[name] * 1000, result)
+    state.status = "ready"
+    state.finished = time.perf_counter()
+    logger.info("Precalentamiento completo en %.0f ms", (state.finished - state.started) * 1000)
@@ -1,4 +1,6 @@
 # src/config.py
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,19 +10,113 @@ class Settings(BaseSettings):
     db_password: str
     db_name: str
     db_port: int
+    database_url: Optional[str] = None  # Sobrescribe la URL de MySQL (ej. sqlite:///./local.db)
+
+    # Pool de conexiones (aplica al motor síncrono y al asíncrono)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Segundos de espera máxima por una conexión
+    db_pool_recycle: int = 1800  # Segundos antes de reciclar una conexión
+    db_pool_pre_ping: bool = True
+    # Al arrancar solo se verifica que el esquema exista (sin DDL); con esto se
+    # crean las tablas que falten (desarrollo local)
+    db_create_tables: bool = False
+    warmup_db_connections: int = 0  # Conexiones que se abren al arrancar; 0 = db_pool_size
+
+    # Acceso asíncrono a la BD (AsyncSession)
+    db_async: bool = False
+    async_database_url: Optional[str] = None  # ej. sqlite+aiosqlite:///./local.db
 
     # JWT
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    # Con ALGORITHM asimétrico (RS256, ES256...): archivos PEM separados por comas.
+    # El primero firma; el resto solo verifica (rotación). Ver src/adapters/jwt_keys.py
+    jwt_key_files: str = ""
+    jwt_accept_hs256: bool = False  # Acepta tokens HS256 previos durante la migración
+    jwks_max_age_seconds: int = 300  # Cache-Control de /.well-known/jwks.json
+    refresh_token_expire_days: int = 30  # Cada rotación emite un token con este plazo
+
+    # Hashing de contraseñas
+    hash_executor: str = "thread"  # "thread" o "process"
+    hash_workers: int = 0  # 0 = número de núcleos disponibles
+    hash_algorithm: str = "bcrypt"  # "bcrypt" o "argon2id" (requiere argon2-cffi)
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    # Latencia objetivo por hash en ms: si es > 0, el costo (rondas de bcrypt o
+    # time_cost de argon2id) se calibra al arrancar en lugar de usar el fijo
+    hash_target_ms: float = 0.0
+    rehash_on_login: bool = True  # Re-hashea en segundo plano los hashes con otra política
+    # Control de admisión: cola acotada con prioridades (login > registro > lotes)
+    hash_admission_enabled: bool = True
+    hash_queue_max: int = 0  # Operaciones en espera; 0 = 16 por worker de hashing
+    hash_queue_max_wait_ms: float = 1000.0  # Espera máxima antes de responder 503; 0 = sin límite
+
+    # Diccionario de contraseñas comunes
+    common_passwords_index: str = "common_passwords.idx"
+    common_passwords_csv: str = "1millionPasswords.csv"  # Origen del índice (se compila con el CLI del módulo)
+
+    # Caché de usuarios (lectura a través sobre el repositorio). Es por proceso:
+    # con varios workers, una escritura solo invalida la caché del worker que la
+    # atendió y los demás pueden servir el dato anterior hasta el TTL
+    user_cache_enabled: bool = False
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: float = 60.0
+
+    # Caché de tokens ya verificados (/validate-token)
+    token_cache_enabled: bool = True
+    token_cache_max_entries: int = 100000
+
+    # Administración (endpoints /admin/*); sin token configurado quedan deshabilitados
+    admin_token: Optional[str] = None
+
+    # Rate limiting: storage de los contadores (memory:// es por proceso; con
+    # varios workers usar sqlite:////ruta/rl.db o redis://...) y proxies de
+    # confianza (IPs o CIDR separados por comas) cuyo X-Forwarded-For se respeta
+    rate_limit_storage_uri: str = "memory://"
+    trusted_proxies: str = ""
+
+    # Diagnóstico: fases por request en el header Server-Timing (para todos los
+    # requests; sin esto solo se emite si X-Server-Timing trae el ADMIN_TOKEN)
+    # y directorio de los perfiles de POST /admin/profile ("" = temporal del sistema)
+    server_timing_enabled: bool = False
+    profile_dir: str = ""
+
+    # Respuestas de los endpoints de usuario serializadas con orjson, sin la
+    # revalidación contra response_model (ver src/adapters/api/responses.py)
+    fast_responses: bool = False
+
+    # Importación masiva de usuarios
+    bulk_import_batch_size: int = 500  # Filas por transacción (executemany)
+    bulk_import_workers: int = 0  # Procesos de hashing; 0 = número de núcleos disponibles
 
     def get_db_url(self) -> str:
         """Genera la URL de conexión para SQLAlchemy."""
+        if self.database_url:
+            return self.database_url
         # Cambiamos 'mysqlclient' por 'pymysql'
         return f"mysql+pymysql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+    def get_async_db_url(self) -> str:
+        """Genera la URL de conexión para el motor asíncrono de SQLAlchemy."""
+        if self.async_database_url:
+            return self.async_database_url
+        return f"mysql+aiomysql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
     class Config:
         env_file = ".env" # Le dice a Pydantic que cargue las variables desde el archivo .env
 
-# Instancia única que será usada en toda la aplicación
-settings = Settings()
\ No newline at end of file
+# Instancia única que será usada en toda la aplicación.
+# Se crea en el primer uso y no como efecto secundario de importar el módulo.
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
+def __getattr__(name: str):
+    # Compatibilidad con `from src.config import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,28 @@
+import uuid
+import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class RefreshToken(BaseModel):
+    """
+    Refresh token emitido en el login. Solo se guarda el hash del token: el
+    valor en claro lo conoce únicamente el cliente.
+
+    Cada uso lo rota (se marca como usado y se emite uno nuevo de la misma
+    familia). Presentar un token ya usado delata una filtración y revoca
+    toda la familia.
+    """
+    token_hash: str
+    user_id: uuid.UUID
+    family_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    expires_at: datetime.datetime
+    created_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
+    used_at: Optional[datetime.datetime] = None
+    revoked_at: Optional[datetime.datetime] = None
+
+    def is_expired(self, now: datetime.datetime) -> bool:
+        return self.expires_at <= now
+
+    def is_spent(self) -> bool:
+        """Ya se usó para rotar o su familia fue revocada."""
+        return self.used_at is not None or self.revoked_at is not None
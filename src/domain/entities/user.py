@@ -1,14 +1,13 @@
 import uuid
 import datetime
 from typing import Optional
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic import BaseModel, ConfigDict, Field
 from src.domain.value_objects.email import Email
 from src.domain.value_objects.password import Password
 from src.domain.entities.profile import Profile
 from src.domain.value_objects.enums import Entorno, NivelEducativo
 
-class User(BaseSettings):
+class User(BaseModel):
     user_id: uuid.UUID = Field(default_factory=uuid.uuid4)
     username: str
     age: int
@@ -17,9 +16,10 @@ class User(BaseSettings):
     profile: Optional[Profile] = None 
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
 
-    class Config:
-        arbitrary_types_allowed = True
-        validate_assignment = True # Importante para que las actualizaciones validen
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        validate_assignment=True # Importante para que las actualizaciones validen
+    )
 
     def update_details(self, username: str = None, age: int = None):
         """Actualiza los detalles básicos del usuario."""
@@ -0,0 +1,212 @@
+# src/domain/validation.py
+"""
+Motor de validación compartido por los DTOs de request y los objetos de valor.
+
+Reúne en un solo lugar las reglas de email, username y contraseña, con los
+mismos mensajes de error de siempre:
+    - los patrones se compilan una vez al importar el módulo
+    - las clases de caracteres de una contraseña (minúsculas, mayúsculas,
+      dígitos, símbolos, control) se obtienen en una sola pasada con
+      str.translate, en lugar de un re.search por clase
+    - el email de los DTOs se valida sin email-validator cuando la dirección
+      es ASCII simple (el caso normal); el resto pasa por la validación de
+      EmailStr de pydantic, con su normalización y sus mensajes
+
+Los DTOs aplican las reglas de formato del request (error 422) y los objetos
+de valor las reglas de dominio (error 400), como hasta ahora.
+"""
+import re
+from typing import FrozenSet, NamedTuple
+
+from email_validator import SPECIAL_USE_DOMAIN_NAMES
+from pydantic.networks import validate_email as _pydantic_validate_email
+
+# --- Clases de caracteres ---
+
+LOWER, UPPER, DIGIT, SYMBOL, CONTROL = "l", "u", "d", "s", "c"
+
+_CLASS_TABLE = {}
+for _code in range(128):
+    _char = chr(_code)
+    if "a" <= _char <= "z":
+        _CLASS_TABLE[_code] = LOWER
+    elif "A" <= _char <= "Z":
+        _CLASS_TABLE[_code] = UPPER
+    elif "0" <= _char <= "9":
+        _CLASS_TABLE[_code] = DIGIT
+    elif _code < 32 or _code == 127:
+        _CLASS_TABLE[_code] = CONTROL
+    else:
+        _CLASS_TABLE[_code] = SYMBOL
+del _code, _char
+
+_ALPHANUMERIC = frozenset((LOWER, UPPER, DIGIT))
+
+
+def char_classes(value: str) -> FrozenSet[str]:
+    """
+    Clases de caracteres presentes en `value`. Los caracteres no ASCII no se
+    traducen y quedan tal cual en el conjunto: cuentan como símbolos.
+    """
+    return frozenset(value.translate(_CLASS_TABLE))
+
+
+def has_symbol(classes: FrozenSet[str]) -> bool:
+    """Equivale a re.search(r'[^a-zA-Z0-9]', valor)."""
+    return not classes <= _ALPHANUMERIC
+
+
+def password_pool_size(classes: FrozenSet[str]) -> int:
+    """Tamaño del alfabeto que usa la contraseña, para el cálculo de entropía."""
+    pool = 0
+    if LOWER in classes: pool += 26
+    if UPPER in classes: pool += 26
+    if DIGIT in classes: pool += 10
+    if has_symbol(classes): pool += 32  # Símbolos comunes
+    return pool
+
+
+def sanitize(value) -> str:
+    """Sanitización común: convierte a str y quita espacios de los extremos."""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value).strip()
+
+
+# --- Contraseñas ---
+
+PASSWORD_MIN_LENGTH = 8
+PASSWORD_MAX_LENGTH = 128
+
+
+class PasswordCheck(NamedTuple):
+    value: str  # Contraseña sanitizada
+    classes: FrozenSet[str]
+
+
+def _check_password_length(value: str) -> None:
+    if len(value) < PASSWORD_MIN_LENGTH:
+        raise ValueError('La contraseña debe tener al menos 8 caracteres')
+    if len(value) > PASSWORD_MAX_LENGTH:
+        raise ValueError('La contraseña no puede tener más de 128 caracteres')
+
+
+def check_password_policy(value: str) -> str:
+    """
+    Política de contraseñas del request (MSTG-AUTH-5): longitud 8-128 y al
+    menos una mayúscula, una minúscula y un número. Devuelve el valor sanitizado.
+    """
+    value = sanitize(value)
+    _check_password_length(value)
+    classes = char_classes(value)
+    if UPPER not in classes:
+        raise ValueError('La contraseña debe contener al menos una mayúscula')
+    if LOWER not in classes:
+        raise ValueError('La contraseña debe contener al menos una minúscula')
+    if DIGIT not in classes:
+        raise ValueError('La contraseña debe contener al menos un número')
+    return value
+
+
+def check_password(value) -> PasswordCheck:
+    """
+    Reglas de dominio de la contraseña: longitud 8-128 y sin caracteres de
+    control (ASCII 0-31 y 127). La verificación contra el diccionario de
+    contraseñas comunes queda a cargo del objeto de valor.
+    """
+    value = sanitize(value)
+    _check_password_length(value)
+    classes = char_classes(value)
+    if CONTROL in classes:
+        raise ValueError("La contraseña no puede contener caracteres de control")
+    return PasswordCheck(value, classes)
+
+
+# --- Nombres de usuario ---
+
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+
+def check_username_format(value: str) -> str:
+    """Regla básica del request: sin espacios. La validación completa es check_username."""
+    value = sanitize(value)
+    if ' ' in value:
+        raise ValueError('El nombre de usuario no puede contener espacios')
+    return value
+
+
+def check_username(value) -> str:
+    """
+    Reglas de dominio del nombre de usuario: 3-30 caracteres, solo letras,
+    números, '_' y '-', sin empezar ni terminar con '_' o '-' y no solo números.
+    """
+    value = sanitize(value)
+    if len(value) < 3:
+        raise ValueError('El nombre de usuario debe tener al menos 3 caracteres')
+    if len(value) > 30:
+        raise ValueError('El nombre de usuario no puede tener más de 30 caracteres')
+    if ' ' in value:
+        raise ValueError('El nombre de usuario no puede contener espacios')
+    if not _USERNAME_RE.match(value):
+        raise ValueError('El nombre de usuario solo puede contener letras, números, guiones bajos (_) y guiones (-)')
+    if value.startswith('-') or value.startswith('_'):
+        raise ValueError('El nombre de usuario no puede empezar con guión (-) o guión bajo (_)')
+    if value.endswith('-') or value.endswith('_'):
+        raise ValueError('El nombre de usuario no puede terminar con guión (-) o guión bajo (_)')
+    if value.isdigit():
+        raise ValueError('El nombre de usuario no puede contener solo números')
+    return value
+
+
+# --- Emails ---
+
+# Permite: letras, números, puntos, guiones bajos, porcentajes, signos más, guiones
+# Requiere: símbolo @ obligatorio, dominio válido, extensión de al menos 2 caracteres
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_EMAIL_DANGEROUS_CHARS = re.compile(r'''[<>"'\\/;:&|`]''')
+
+
+def check_email(value) -> str:
+    """Reglas de dominio del email (RFC 5321): longitud 5-254, sin caracteres peligrosos y formato válido."""
+    value = sanitize(value)
+    if len(value) < 5:
+        raise ValueError('El email debe tener al menos 5 caracteres')
+    if len(value) > 254:
+        raise ValueError('El email no puede tener más de 254 caracteres')
+    if _EMAIL_DANGEROUS_CHARS.search(value):
+        raise ValueError('El email contiene caracteres no permitidos')
+    if not _EMAIL_RE.match(value):
+        raise ValueError('Formato de email inválido')
+    local_part, domain_part = value.split('@', 1)
+    if local_part.startswith('.') or local_part.endswith('.') or local_part.startswith('-') or local_part.endswith('-'):
+        raise ValueError('El email contiene caracteres inválidos en la parte local')
+    if domain_part.startswith('.') or domain_part.endswith('.') or domain_part.startswith('-') or domain_part.endswith('-'):
+        raise ValueError('El email contiene caracteres inválidos en el dominio')
+    return value
+
+
+# Direcciones que email-validator acepta sin cambios salvo pasar el dominio a
+# minúsculas: parte local dot-atom ASCII, etiquetas de dominio de 1 a 63
+# caracteres sin '-' en los extremos ni "--" (IDNA) y TLD alfabético
+_SIMPLE_EMAIL_RE = re.compile(
+    r"(?P<local>[A-Za-z0-9_%+-]{1,64}(?:\.[A-Za-z0-9_%+-]+)*)"
+    r"@(?P<domain>(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63})"
+)
+# Dominios de uso especial que email-validator rechaza (localhost, .test, ...)
+_SPECIAL_USE_DOMAINS = tuple(SPECIAL_USE_DOMAIN_NAMES)
+
+
+def normalize_email(value: str) -> str:
+    """
+    Valida y normaliza un email como EmailStr de pydantic (dominio en
+    minúsculas). Las direcciones ASCII simples se resuelven con un patrón
+    precompilado; el resto (Unicode, "Nombre <email>", casos límite) pasa por
+    email-validator, que además produce los mensajes de error.
+    """
+    match = _SIMPLE_EMAIL_RE.fullmatch(value)
+    if match is not None and len(value) <= 254 and len(match["local"]) <= 64:
+        domain = match["domain"].lower()
+        if (len(domain) <= 253 and "--" not in domain
+                and not any(domain == d or domain.endswith("." + d) for d in _SPECIAL_USE_DOMAINS)):
+            return f"{match['local']}@{domain}"
+    return _pydantic_validate_email(value)[1]
@@ -1,42 +1,25 @@
 import math
-import time
-import re
-import pandas as pd
-import bcrypt
-from pydantic import  validator
-from pydantic_settings import BaseSettings
-from typing import Set, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from src.domain.validation import char_classes, check_password, password_pool_size
+from src.ports.services.password_service import IPasswordService
 
-# --- Configuración Inicial---
 
-# 2. Cargar y limpiar el diccionario de contraseñas predecibles
-COMMON_PASSWORDS: Set[str] = set()
-try:
-    df = pd.read_csv('1millionPasswords.csv', header=None, usecols=[1], low_memory=False)
-    COMMON_PASSWORDS = set(df[1].dropna().astype(str))
-    print(f"Cargadas {len(COMMON_PASSWORDS)} contraseñas comunes del diccionario.")
-except FileNotFoundError:
-    print("Advertencia: No se encontró 'common_passwords.csv'. La verificación de diccionario no funcionará.")
-except Exception as e:
-    print(f"Error al cargar el diccionario de contraseñas: {e}")
-
-
-class Password(BaseSettings):
+class Password(BaseModel):
     value: str # La contraseña en texto plano, solo existirá momentáneamente
     hashed_value: Optional[str] = None
     strength: Optional[str] = None
     crack_time_seconds: Optional[float] = None
     entropy: Optional[float] = None
 
-    class Config:
-        validate_assignment = True # Permite revalidar al asignar un valor
+    model_config = ConfigDict(validate_assignment=True) # Permite revalidar al asignar un valor
         
-    def __init__(self, **data):
+    def __init__(self, password_service: IPasswordService, **data):
         super().__init__(**data)
-        self._validate_and_process(self.value)
-        self.hashed_value = self._hash_password(self.value)
+        self._validate_and_process(self.value, password_service)
+        self.hashed_value = password_service.hash(self.value)
 
-    def _validate_and_process(self, plain_password: str):
+    def _validate_and_process(self, plain_password: str, password_service: IPasswordService):
         """
         Valida y procesa una contraseña según los estándares de seguridad:
         - Sanitización: trim de espacios
@@ -46,48 +29,35 @@ class Password(BaseSettings):
         - Validación contra diccionario de contraseñas comunes
         - Cálculo de entropía y fuerza
         """
-        # Sanitización: trim de espacios
-        if isinstance(plain_password, str):
-            plain_password = plain_password.strip()
-        else:
-            plain_password = str(plain_password).strip()
-        
-        # Validación de longitud mínima
-        if len(plain_password) < 8:
-            raise ValueError("La contraseña debe tener al menos 8 caracteres")
-        
-        # Validación de longitud máxima
-        if len(plain_password) > 128:
-            raise ValueError("La contraseña no puede tener más de 128 caracteres")
-        
-        # Validación de caracteres de control (ASCII 0-31 y 127)
-        # Permite caracteres imprimibles pero rechaza caracteres de control
-        if any(ord(c) < 32 or ord(c) == 127 for c in plain_password):
-            raise ValueError("La contraseña no puede contener caracteres de control")
-        
+        # Los valores los calcula el propio objeto: se asignan sin revalidar
+        # el modelo campo por campo (validate_assignment)
+        self.__dict__.update(self._analyze(plain_password, password_service))
+
+    @classmethod
+    def _analyze(cls, plain_password: str, password_service: IPasswordService) -> dict:
+        """Aplica las validaciones y devuelve entropy, strength y crack_time_seconds."""
+        # Longitud y caracteres de control, con una sola pasada por las clases de caracteres
+        plain_password, classes = check_password(plain_password)
+
         # Validación de diccionario (contraseñas comunes)
-        if plain_password in COMMON_PASSWORDS:
+        if password_service.is_common(plain_password):
             raise ValueError("La contraseña es demasiado común y no es segura")
 
         # Cálculo de entropía
-        pool_size = self._get_character_pool_size(plain_password)
-        self.entropy = math.log2(pool_size ** len(plain_password)) if pool_size > 0 else 0
-
-        # Asignación de fuerza
-        self.strength = self._get_strength_category(self.entropy)
+        pool_size = password_pool_size(classes)
+        entropy = math.log2(pool_size ** len(plain_password)) if pool_size > 0 else 0
 
         # Cálculo de tiempo de crackeo
         ATTEMPTS_PER_SECOND = 10**11 # 100 billones por segundo
-        self.crack_time_seconds = (2**self.entropy) / ATTEMPTS_PER_SECOND
+        return {
+            "entropy": entropy,
+            "strength": cls._get_strength_category(entropy),
+            "crack_time_seconds": (2**entropy) / ATTEMPTS_PER_SECOND,
+        }
 
     @staticmethod
     def _get_character_pool_size(password: str) -> int:
-        pool = 0
-        if re.search(r'[a-z]', password): pool += 26
-        if re.search(r'[A-Z]', password): pool += 26
-        if re.search(r'[0-9]', password): pool += 10
-        if re.search(r'[^a-zA-Z0-9]', password): pool += 32 # Símbolos comunes
-        return pool
+        return password_pool_size(char_classes(password))
 
     @staticmethod
     def _get_strength_category(entropy: float) -> str:
@@ -97,30 +67,6 @@ class Password(BaseSettings):
         if entropy < 100: return "Fuerte"
         return "Muy Fuerte"
 
-    @staticmethod
-    def _hash_password(plain_password: str) -> str:
-        """
-        Hashea una contraseña usando bcrypt.
-        Bcrypt tiene un límite de 72 bytes, por lo que truncamos si es necesario.
-        """
-        # Convertir a bytes y truncar a 72 bytes si es necesario
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            # Truncar a 72 bytes de manera segura
-            password_bytes = password_bytes[:72]
-            # Decodificar de vuelta a string, manejando posibles caracteres cortados
-            try:
-                plain_password = password_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                # Si hay un error de decodificación, truncar un byte más y volver a intentar
-                plain_password = password_bytes[:-1].decode('utf-8', errors='ignore')
-            password_bytes = plain_password.encode('utf-8')
-        
-        # Hashear usando bcrypt directamente
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode('utf-8')
-
     @classmethod
     def from_hash(cls, hashed_value: str) -> 'Password':
         """
@@ -136,20 +82,28 @@ class Password(BaseSettings):
             entropy=0.0  # Valor por defecto
         )
 
-    def verify_password(self, plain_password: str) -> bool:
+    @classmethod
+    def validated(cls, value: str, password_service: IPasswordService) -> 'Password':
         """
-        Verifica una contraseña en texto plano contra el hash almacenado.
-        Trunca la contraseña a 72 bytes para coincidir con el límite de bcrypt.
+        Aplica las validaciones y métricas de Password(password_service, value=...) sin hashear.
+        El llamador debe asignar `hashed_value` (p. ej. tras hashear en lote).
         """
-        # Truncar la contraseña a 72 bytes si es necesario (igual que al hashear)
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-            try:
-                plain_password = password_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                plain_password = password_bytes[:-1].decode('utf-8', errors='ignore')
-            password_bytes = plain_password.encode('utf-8')
-        
-        # Verificar usando bcrypt directamente
-        return bcrypt.checkpw(password_bytes, self.hashed_value.encode('utf-8'))
\ No newline at end of file
+        return cls.model_construct(value=value, **cls._analyze(value, password_service))
+
+    @classmethod
+    async def create_async(cls, value: str, password_service: IPasswordService) -> 'Password':
+        """
+        Equivalente asíncrono de Password(password_service, value=...): valida en el hilo actual
+        (operación barata) y espera el hash sin bloquear el event loop.
+        """
+        password = cls.validated(value, password_service)
+        password.hashed_value = await password_service.hash_async(value)
+        return password
+
+    def verify_password(self, plain_password: str, password_service: IPasswordService) -> bool:
+        """Verifica una contraseña en texto plano contra el hash almacenado."""
+        return password_service.verify(plain_password, self.hashed_value)
+
+    async def verify_password_async(self, plain_password: str, password_service: IPasswordService) -> bool:
+        """Equivalente de verify_password que no bloquea el event loop."""
+        return await password_service.verify_async(plain_password, self.hashed_value)
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+import datetime
+from typing import Optional
+import uuid
+from src.domain.entities.refresh_token import RefreshToken
+
+class IAsyncRefreshTokenRepository(ABC):
+    """Variante asíncrona de IRefreshTokenRepository."""
+
+    @abstractmethod
+    async def add(self, token: RefreshToken) -> None:
+        """Guarda un refresh token recién emitido."""
+        pass
+
+    @abstractmethod
+    async def find_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Busca un refresh token por el hash de su valor."""
+        pass
+
+    @abstractmethod
+    async def rotate(self, token_hash: str, replacement: RefreshToken, used_at: datetime.datetime) -> bool:
+        """Marca el token como usado y guarda su reemplazo; False si ya estaba usado o revocado."""
+        pass
+
+    @abstractmethod
+    async def revoke_family(self, family_id: uuid.UUID, revoked_at: datetime.datetime) -> None:
+        """Revoca todos los tokens de una familia (sesión comprometida)."""
+        pass
+
+    @abstractmethod
+    async def purge(self, before: datetime.datetime, batch_size: int = 1000) -> int:
+        """Borra los tokens vencidos o revocados antes de `before`; devuelve cuántos borró."""
+        pass
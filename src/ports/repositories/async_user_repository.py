@@ -0,0 +1,94 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional, List
+import uuid
+from src.domain.entities.user import User
+from src.ports.repositories.user_repository import (
+    UserAlreadyExistsError, UserCredentials, UserCursor, UserListFilter, UserPage
+)
+
+class IAsyncUserRepository(ABC):
+    """Variante asíncrona de IUserRepository: cada operación se espera con `await`."""
+
+    @abstractmethod
+    async def save(self, user: User) -> None:
+        """
+        Guarda un usuario en el repositorio.
+        Lanza UserAlreadyExistsError si el email o el username ya existen.
+        """
+        pass
+
+    @abstractmethod
+    async def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        """
+        Guarda un lote de usuarios. Devuelve, en el mismo orden, None para cada
+        usuario guardado o el UserAlreadyExistsError que impidió guardarlo.
+        """
+        pass
+
+    @abstractmethod
+    async def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        """
+        Devuelve solo el id y el hash de la contraseña del usuario con ese email,
+        sin construir la entidad completa. Pensado para el login.
+        """
+        pass
+
+    @abstractmethod
+    async def exists_by_email(self, email: str) -> bool:
+        """Indica si existe un usuario con ese email, sin cargarlo."""
+        pass
+
+    @abstractmethod
+    async def exists_by_username(self, username: str) -> bool:
+        """Indica si existe un usuario con ese nombre de usuario, sin cargarlo."""
+        pass
+
+    @abstractmethod
+    async def find_by_email(self, email: str) -> Optional[User]:
+        """Busca un usuario por su email."""
+        pass
+
+    @abstractmethod
+    async def find_by_username(self, username: str) -> Optional[User]:
+        """Busca un usuario por su nombre de usuario."""
+        pass
+
+    @abstractmethod
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+        """Busca un usuario por su ID."""
+        pass
+
+    @abstractmethod
+    async def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        """Página de usuarios ordenada por (created_at, user_id), a partir de `after`."""
+        pass
+
+    @abstractmethod
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> AsyncIterator[User]:
+        """
+        Generador asíncrono con todos los usuarios que cumplen los filtros, en
+        el orden de find_page, cargados de a `chunk_size`.
+        """
+        pass
+
+    @abstractmethod
+    async def find_all(self) -> List[User]:
+        """Devuelve todos los usuarios (en memoria; para tablas grandes usar find_page o iter_all)."""
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> None:
+        """Actualiza un usuario existente."""
+        pass
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        """Reemplaza el hash solo si el guardado sigue siendo `expected_hash`."""
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: uuid.UUID) -> None:
+        """Elimina un usuario por su ID."""
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+import datetime
+from typing import Optional
+import uuid
+from src.domain.entities.refresh_token import RefreshToken
+
+class IRefreshTokenRepository(ABC):
+
+    @abstractmethod
+    def add(self, token: RefreshToken) -> None:
+        """Guarda un refresh token recién emitido."""
+        pass
+
+    @abstractmethod
+    def find_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """Busca un refresh token por el hash de su valor."""
+        pass
+
+    @abstractmethod
+    def rotate(self, token_hash: str, replacement: RefreshToken, used_at: datetime.datetime) -> bool:
+        """
+        Marca el token como usado y guarda su reemplazo en una sola transacción.
+        Devuelve False (sin guardar nada) si el token ya estaba usado o revocado,
+        p. ej. porque otro request lo usó al mismo tiempo.
+        """
+        pass
+
+    @abstractmethod
+    def revoke_family(self, family_id: uuid.UUID, revoked_at: datetime.datetime) -> None:
+        """Revoca todos los tokens de una familia (sesión comprometida)."""
+        pass
+
+    @abstractmethod
+    def purge(self, before: datetime.datetime, batch_size: int = 1000) -> int:
+        """
+        Borra los tokens que vencieron o fueron revocados antes de `before`, en
+        transacciones de hasta `batch_size` filas. Los usados que siguen vigentes
+        se conservan: hacen falta para detectar su reutilización. Devuelve la
+        cantidad de filas borradas.
+        """
+        pass
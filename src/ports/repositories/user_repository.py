@@ -1,13 +1,82 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+import datetime
+from typing import Iterator, NamedTuple, Optional, List
 import uuid
+from pydantic import BaseModel
 from src.domain.entities.user import User
+from src.domain.value_objects.enums import Entorno, NivelEducativo
+
+class UserCredentials(NamedTuple):
+    """Proyección mínima que necesita el login: id del usuario y hash de su contraseña."""
+    user_id: uuid.UUID
+    password_hash: str
+
+class UserListFilter(BaseModel):
+    """Filtros del listado de usuarios; los campos en None no filtran."""
+    entorno: Optional[Entorno] = None
+    nivel_educativo: Optional[NivelEducativo] = None
+    created_from: Optional[datetime.datetime] = None  # Inclusivo
+    created_to: Optional[datetime.datetime] = None  # Exclusivo
+
+class UserCursor(NamedTuple):
+    """Posición en el listado: los usuarios se ordenan por (created_at, user_id)."""
+    created_at: datetime.datetime
+    user_id: uuid.UUID
+
+class UserPage(NamedTuple):
+    users: List[User]
+    next_cursor: Optional[UserCursor]  # None en la última página
+
+class UserAlreadyExistsError(ValueError):
+    """
+    El email o el username ya pertenecen a otro usuario. Los repositorios la
+    lanzan al violar una restricción de unicidad en lugar de exigir consultas
+    previas de existencia.
+    """
+    MESSAGES = {
+        "email": "El email ya está en uso.",
+        "username": "El nombre de usuario ya está en uso.",
+    }
+
+    def __init__(self, field: str):
+        self.field = field
+        super().__init__(self.MESSAGES[field])
 
 class IUserRepository(ABC):
     
     @abstractmethod
     def save(self, user: User) -> None:
-        """Guarda un usuario en el repositorio."""
+        """
+        Guarda un usuario en el repositorio.
+        Lanza UserAlreadyExistsError si el email o el username ya existen.
+        """
+        pass
+
+    @abstractmethod
+    def save_many(self, users: List[User]) -> List[Optional[UserAlreadyExistsError]]:
+        """
+        Guarda un lote de usuarios. Devuelve, en el mismo orden, None para cada
+        usuario guardado o el UserAlreadyExistsError que impidió guardarlo; los
+        duplicados no interrumpen el resto del lote.
+        """
+        pass
+
+    @abstractmethod
+    def find_credentials_by_email(self, email: str) -> Optional[UserCredentials]:
+        """
+        Devuelve solo el id y el hash de la contraseña del usuario con ese email,
+        sin construir la entidad completa. Pensado para el login.
+        """
+        pass
+
+    @abstractmethod
+    def exists_by_email(self, email: str) -> bool:
+        """Indica si existe un usuario con ese email, sin cargarlo."""
+        pass
+
+    @abstractmethod
+    def exists_by_username(self, username: str) -> bool:
+        """Indica si existe un usuario con ese nombre de usuario, sin cargarlo."""
         pass
 
     @abstractmethod
@@ -25,14 +94,44 @@ class IUserRepository(ABC):
         """Busca un usuario por su ID."""
         pass
     
+    @abstractmethod
+    def find_page(
+        self, filters: UserListFilter, limit: int, after: Optional[UserCursor] = None
+    ) -> UserPage:
+        """
+        Página de usuarios ordenada por (created_at, user_id), a partir de
+        `after` (paginación por cursor: el costo no crece con la página pedida).
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, filters: UserListFilter, chunk_size: int = 1000) -> Iterator[User]:
+        """
+        Recorre todos los usuarios que cumplen los filtros, en el mismo orden
+        que find_page, cargándolos de a `chunk_size` para mantener la memoria acotada.
+        """
+        pass
+
     @abstractmethod
     def find_all(self) -> List[User]: 
-        """Devuelve todos los usuarios."""
+        """Devuelve todos los usuarios (en memoria; para tablas grandes usar find_page o iter_all)."""
         pass
         
     @abstractmethod
     def update(self, user: User) -> None: 
-        """Actualiza un usuario existente."""
+        """
+        Actualiza un usuario existente.
+        Lanza UserAlreadyExistsError si el nuevo username ya existe.
+        """
+        pass
+
+    @abstractmethod
+    def update_password_hash(self, user_id: uuid.UUID, expected_hash: str, new_hash: str) -> bool:
+        """
+        Reemplaza el hash de la contraseña solo si el guardado sigue siendo
+        `expected_hash` (re-hash tras cambiar la política). Devuelve False si
+        entretanto cambió o el usuario ya no existe.
+        """
         pass
 
     @abstractmethod
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+
+class IPasswordService(ABC):
+    """
+    Servicios de contraseñas que el dominio necesita pero no implementa:
+    el diccionario de contraseñas comunes y el hashing.
+    """
+
+    @abstractmethod
+    def is_common(self, plain_password: str) -> bool:
+        """Indica si la contraseña está en el diccionario de contraseñas comunes."""
+        pass
+
+    @abstractmethod
+    def hash(self, plain_password: str) -> str:
+        """Hashea la contraseña con la política vigente."""
+        pass
+
+    @abstractmethod
+    def verify(self, plain_password: str, hashed_value: str) -> bool:
+        """Compara una contraseña en texto plano contra un hash."""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, hashed_value: str) -> bool:
+        """Indica si el hash se generó con otro algoritmo o costo que el de la política vigente."""
+        pass
+
+    @abstractmethod
+    async def hash_async(self, plain_password: str) -> str:
+        """Equivalente de hash que no bloquea el event loop."""
+        pass
+
+    @abstractmethod
+    async def verify_async(self, plain_password: str, hashed_value: str) -> bool:
+        """Equivalente de verify que no bloquea el event loop."""
+        pass
@@ -0,0 +1,143 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import ExitStack, nullcontext
+from itertools import islice
+from typing import Any, Callable, ContextManager, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from src.ports.repositories.user_repository import IUserRepository
+from src.domain.entities.user import User
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.password import Password
+from src.domain.value_objects.username import Username
+from src.ports.services.password_service import IPasswordService
+from .dtos import BulkImportRowResultDTO, RegisterUserRequestDTO
+from .register_user import RegisterUserUseCase
+
+# Fila de entrada: (número de línea, datos) o (número de línea, error de lectura)
+BulkImportRow = Tuple[int, Union[Dict[str, Any], ValueError]]
+
+class BulkImportUsersUseCase:
+    def __init__(
+        self,
+        user_repository: IUserRepository,
+        hash_executor: Executor,
+        password_service: IPasswordService,
+        hash_password: Callable[[str], str],
+        batch_size: int = 500,
+        admit: Optional[Callable[[], ContextManager[None]]] = None,
+        hash_concurrency: int = 1
+    ):
+        # `hash_password` corre en `hash_executor`: con un pool de procesos debe
+        # ser serializable, y conviene que lleve la política ya resuelta para
+        # que los workers no la recalibren.
+        # `admit` devuelve un context manager que se toma antes de cada hash y
+        # se libera al terminar, quizá desde otro hilo (p. ej. un slot de baja
+        # prioridad del control de admisión). `hash_concurrency` es la cantidad
+        # de hashes en curso a la vez: normalmente, los workers de `hash_executor`.
+        self.user_repository = user_repository
+        self.hash_executor = hash_executor
+        self.password_service = password_service
+        self.hash_password = hash_password
+        self.batch_size = batch_size
+        self.admit = admit or nullcontext
+        self.hash_concurrency = max(1, hash_concurrency)
+
+    def execute(self, rows: Iterable[BulkImportRow]) -> Iterator[BulkImportRowResultDTO]:
+        """
+        Registra usuarios en lote con las mismas validaciones que el registro
+        individual. Las filas se consumen de a `batch_size`, de modo que la
+        memoria no depende del tamaño de la importación: cada lote se valida,
+        se hashea en paralelo en `hash_executor` y se inserta en una sola
+        transacción. Devuelve un resultado por fila, en el orden de entrada.
+        """
+        iterator = iter(rows)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield from self._import_batch(batch)
+
+    def _import_batch(self, batch: List[BulkImportRow]) -> List[BulkImportRowResultDTO]:
+        results: List[BulkImportRowResultDTO] = []
+        pending: List[Tuple[BulkImportRowResultDTO, User, str]] = []
+
+        # 1. Validar cada fila (DTO + Value Objects), sin hashear todavía
+        for line, data in batch:
+            try:
+                if isinstance(data, ValueError):
+                    raise data
+                request = RegisterUserRequestDTO(**data)
+                email_vo = Email(value=request.email)
+                username_vo = Username(value=request.username)
+                password_vo = Password.validated(request.password, self.password_service)
+            except ValidationError as e:
+                results.append(BulkImportRowResultDTO(line=line, status="error", error=self._format_errors(e)))
+                continue
+            except ValueError as e:
+                results.append(BulkImportRowResultDTO(line=line, status="error", error=str(e)))
+                continue
+
+            user = RegisterUserUseCase._build_user(request, email_vo, password_vo, username_vo)
+            result = BulkImportRowResultDTO(
+                line=line, status="created", user_id=str(user.user_id),
+                username=user.username, email=user.email.value
+            )
+            results.append(result)
+            pending.append((result, user, request.password))
+
+        if not pending:
+            return results
+
+        # 2. Hashear las contraseñas válidas en paralelo
+        hashes = self._hash_all([plain for _, _, plain in pending])
+        for (_, user, _), hashed in zip(pending, hashes):
+            user.password.hashed_value = hashed
+
+        # 3. Insertar el lote; los duplicados se reportan por fila
+        errors = self.user_repository.save_many([user for _, user, _ in pending])
+        for (result, _, _), error in zip(pending, errors):
+            if error is not None:
+                result.status = "error"
+                result.user_id = None
+                result.error = str(error)
+        return results
+
+    def _hash_all(self, passwords: List[str]) -> List[str]:
+        """
+        Hashea en `hash_executor` con hasta `hash_concurrency` tareas en curso,
+        cada una con su propio `admit()`: el control de admisión ve un slot por
+        núcleo ocupado, no uno por lote. Devuelve los hashes en el orden de
+        entrada.
+        """
+        in_flight: Deque[Future] = deque()
+        hashes: List[str] = []
+        try:
+            for plain in passwords:
+                if len(in_flight) >= self.hash_concurrency:
+                    hashes.append(in_flight.popleft().result())
+                slot = ExitStack()
+                slot.enter_context(self.admit())
+                try:
+                    future = self.hash_executor.submit(self.hash_password, plain)
+                except BaseException:
+                    slot.close()
+                    raise
+                # El slot se libera al terminar el hash, desde el hilo que complete la tarea:
+                # esperar aquí a que se libere bloquearía la toma del siguiente
+                future.add_done_callback(lambda _, slot=slot: slot.close())
+                in_flight.append(future)
+            while in_flight:
+                hashes.append(in_flight.popleft().result())
+        finally:
+            for future in in_flight:
+                future.cancel()
+        return hashes
+
+    @staticmethod
+    def _format_errors(error: ValidationError) -> str:
+        messages = []
+        for item in error.errors():
+            field = ".".join(str(part) for part in item["loc"])
+            message = item["msg"].removeprefix("Value error, ")
+            messages.append(f"{field}: {message}" if field else message)
+        return "; ".join(messages)
@@ -1,8 +1,11 @@
 import uuid
+from typing import Union
 from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
 
 class DeleteUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: Union[IUserRepository, IAsyncUserRepository]):
+        # execute() requiere un repositorio síncrono y execute_async() uno asíncrono
         self.user_repository = user_repository
 
     def execute(self, user_id: uuid.UUID) -> None:
@@ -10,4 +13,11 @@ class DeleteUserUseCase:
         if not user_to_delete:
             raise FileNotFoundError("Usuario no encontrado.")
         
-        self.user_repository.delete(user_id)
\ No newline at end of file
+        self.user_repository.delete(user_id)
+
+    async def execute_async(self, user_id: uuid.UUID) -> None:
+        user_to_delete = await self.user_repository.find_by_id(user_id)
+        if not user_to_delete:
+            raise FileNotFoundError("Usuario no encontrado.")
+
+        await self.user_repository.delete(user_id)
@@ -1,18 +1,32 @@
-from pydantic import BaseModel, Field, validator, EmailStr
-from typing import Optional
-import re
+from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
+from typing import List, Optional
 from src.domain.value_objects.enums import Entorno, NivelEducativo, Rol
+from src.domain.validation import check_password_policy, check_username_format, normalize_email
+from src.adapters.timing import phase
 
-class RegisterUserRequestDTO(BaseModel):
+class TimedRequestDTO(BaseModel):
+    """Base de los cuerpos de request: su validación se registra como fase "dto" de Server-Timing."""
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _timed_validation(cls, data, handler):
+        with phase("dto"):
+            return handler(data)
+
+class RegisterUserRequestDTO(TimedRequestDTO):
     username: str = Field(..., min_length=3, max_length=30, description="Nombre de usuario entre 3 y 30 caracteres")
-    email: EmailStr = Field(..., description="Correo electrónico válido")
+    email: str = Field(..., description="Correo electrónico válido", json_schema_extra={"format": "email"})
     password: str = Field(..., min_length=8, max_length=128, description="Contraseña entre 8 y 128 caracteres")
     confirm_password: str = Field(..., min_length=8, max_length=128, description="Confirmación de contraseña")
     age: int = Field(..., ge=1, le=120, description="Edad entre 1 y 120 años")
     entorno: Entorno
     nivel_educativo: NivelEducativo
 
-    @validator('password')
+    # Las reglas y sus mensajes están en src/domain/validation.py, compartidas
+    # con los Value Objects (que aplican además las reglas de dominio)
+
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         """
         Valida la política de contraseñas según MSTG-AUTH-5:
@@ -22,73 +36,40 @@ class RegisterUserRequestDTO(BaseModel):
         - Al menos una minúscula
         - Al menos un número
         """
-        # Sanitización: trim de espacios
-        if isinstance(v, str):
-            v = v.strip()
-        
-        # Validación explícita de longitud mínima
-        if len(v) < 8:
-            raise ValueError('La contraseña debe tener al menos 8 caracteres')
-        
-        # Validación explícita de longitud máxima
-        if len(v) > 128:
-            raise ValueError('La contraseña no puede tener más de 128 caracteres')
-        
-        # Validación explícita de al menos 1 mayúscula
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('La contraseña debe contener al menos una mayúscula')
-        
-        # Validación explícita de al menos 1 minúscula
-        if not re.search(r'[a-z]', v):
-            raise ValueError('La contraseña debe contener al menos una minúscula')
-        
-        # Validación explícita de al menos 1 número
-        if not re.search(r'[0-9]', v):
-            raise ValueError('La contraseña debe contener al menos un número')
-        
-        return v
+        return check_password_policy(v)
     
-    @validator('confirm_password')
-    def validate_confirm_password(cls, v, values):
+    @field_validator('confirm_password')
+    @classmethod
+    def validate_confirm_password(cls, v, info: ValidationInfo):
         """
         Valida que la confirmación de contraseña coincida con la contraseña original.
         """
         # Sanitización: trim de espacios
-        if isinstance(v, str):
-            v = v.strip()
+        v = v.strip()
         
         # Validar que coincida con la contraseña original
-        if 'password' in values and v != values['password']:
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('Las contraseñas no coinciden')
         
         return v
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         """
         Valida que el username cumpla con las reglas básicas.
         La validación completa se hace en el Value Object Username.
         """
-        # Sanitización: trim de espacios
-        if isinstance(v, str):
-            v = v.strip()
-        
-        # Validación básica de espacios (validación completa en Value Object)
-        if ' ' in v:
-            raise ValueError('El nombre de usuario no puede contener espacios')
-        
-        return v
+        return check_username_format(v)
     
-    @validator('email')
+    @field_validator('email')
+    @classmethod
     def validate_email(cls, v):
         """
-        Sanitiza el email antes de la validación.
+        Valida y normaliza el email (mismo resultado y mensajes que EmailStr).
         La validación completa se hace en el Value Object Email.
         """
-        # Sanitización: trim de espacios
-        if isinstance(v, str):
-            v = v.strip()
-        return v
+        return normalize_email(v).strip()
 
 class UserResponseDTO(BaseModel):
     user_id: str
@@ -109,17 +90,39 @@ class UserDetailResponseDTO(BaseModel): # DTO más completo para respuestas
     age: int
     profile: ProfileResponseDTO
 
+class UserListPageDTO(BaseModel):
+    items: List[UserDetailResponseDTO]
+    next_cursor: Optional[str] = None  # None en la última página
+
 # --- DTOs para Login ---
-class LoginRequestDTO(BaseModel):
+class LoginRequestDTO(TimedRequestDTO):
     email: str
     password: str
 
 class LoginResponseDTO(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # Para renovar el access token en /token/refresh
+
+class RefreshTokenRequestDTO(TimedRequestDTO):
+    refresh_token: str
+
+# --- DTOs para Importación masiva ---
+class BulkImportRowResultDTO(BaseModel):
+    line: int  # Número de línea en el archivo de origen
+    status: str  # "created" o "error"
+    user_id: Optional[str] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkImportSummaryDTO(BaseModel):
+    total: int = 0
+    created: int = 0
+    failed: int = 0
 
 # --- DTOs para Update ---
-class UpdateUserRequestDTO(BaseModel):
+class UpdateUserRequestDTO(TimedRequestDTO):
     username: Optional[str] = Field(None, min_length=3)
     age: Optional[int] = Field(None, gt=17) # gt = greater than
     entorno: Optional[Entorno] = None
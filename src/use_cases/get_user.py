@@ -1,20 +1,36 @@
 import uuid
+from typing import Union
 from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.domain.entities.user import User
 from .dtos import UserDetailResponseDTO, ProfileResponseDTO
 
 class GetUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: Union[IUserRepository, IAsyncUserRepository]):
+        # execute() requiere un repositorio síncrono y execute_async() uno asíncrono
         self.user_repository = user_repository
 
     def execute(self, user_id: uuid.UUID) -> UserDetailResponseDTO:
         user = self.user_repository.find_by_id(user_id)
+        return self._to_response(user)
+
+    async def execute_async(self, user_id: uuid.UUID) -> UserDetailResponseDTO:
+        user = await self.user_repository.find_by_id(user_id)
+        return self._to_response(user)
+
+    @staticmethod
+    def _to_response(user: User) -> UserDetailResponseDTO:
         if not user:
             raise FileNotFoundError("Usuario no encontrado.")
 
-        return UserDetailResponseDTO(
+        # Datos de una entidad ya validada: el DTO se arma sin volver a validarlos
+        profile = user.profile
+        return UserDetailResponseDTO.model_construct(
             user_id=str(user.user_id),
             username=user.username,
             email=user.email.value,
             age=user.age,
-            profile=ProfileResponseDTO(**user.profile.dict())
-        )
\ No newline at end of file
+            profile=ProfileResponseDTO.model_construct(
+                rol=profile.rol, entorno=profile.entorno, nivel_educativo=profile.nivel_educativo
+            )
+        )
@@ -0,0 +1,54 @@
+import base64
+import binascii
+import datetime
+import uuid
+from typing import Iterator, Optional, Union
+from src.ports.repositories.user_repository import IUserRepository, UserCursor, UserListFilter, UserPage
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from .dtos import UserDetailResponseDTO, UserListPageDTO
+from .get_user import GetUserUseCase
+
+class ListUsersUseCase:
+    def __init__(self, user_repository: Union[IUserRepository, IAsyncUserRepository]):
+        # execute() y stream() requieren un repositorio síncrono y execute_async() uno asíncrono
+        self.user_repository = user_repository
+
+    def execute(self, filters: UserListFilter, limit: int, cursor: Optional[str] = None) -> UserListPageDTO:
+        """
+        Devuelve una página del listado. `cursor` es el `next_cursor` de la
+        página anterior; sin cursor se empieza desde el principio.
+        """
+        page = self.user_repository.find_page(filters, limit, self.decode_cursor(cursor))
+        return self._to_response(page)
+
+    async def execute_async(self, filters: UserListFilter, limit: int, cursor: Optional[str] = None) -> UserListPageDTO:
+        page = await self.user_repository.find_page(filters, limit, self.decode_cursor(cursor))
+        return self._to_response(page)
+
+    def stream(self, filters: UserListFilter, chunk_size: int = 1000) -> Iterator[UserDetailResponseDTO]:
+        """Recorre todo el listado sin cargarlo en memoria (para exportaciones)."""
+        for user in self.user_repository.iter_all(filters, chunk_size):
+            yield GetUserUseCase._to_response(user)
+
+    @staticmethod
+    def encode_cursor(cursor: Optional[UserCursor]) -> Optional[str]:
+        if cursor is None:
+            return None
+        raw = f"{cursor.created_at.isoformat()}|{cursor.user_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[UserCursor]:
+        if not cursor:
+            return None
+        try:
+            created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return UserCursor(datetime.datetime.fromisoformat(created_at), uuid.UUID(user_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Cursor inválido.")
+
+    def _to_response(self, page: UserPage) -> UserListPageDTO:
+        return UserListPageDTO(
+            items=[GetUserUseCase._to_response(user) for user in page.users],
+            next_cursor=self.encode_cursor(page.next_cursor)
+        )
@@ -1,22 +1,78 @@
-from src.ports.repositories.user_repository import IUserRepository
+from typing import Callable, Optional, Union
+import uuid
+from src.ports.repositories.user_repository import IUserRepository, UserCredentials
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.ports.repositories.refresh_token_repository import IRefreshTokenRepository
+from src.ports.repositories.async_refresh_token_repository import IAsyncRefreshTokenRepository
+from src.ports.services.password_service import IPasswordService
 from .dtos import LoginRequestDTO, LoginResponseDTO
 from src.adapters.security import create_access_token 
+from .refresh_token import new_refresh_token
+
+# Recibe (user_id, contraseña en texto plano, hash actual) y agenda el re-hash
+RehashScheduler = Callable[[uuid.UUID, str, str], None]
 
 class LoginUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(
+        self,
+        user_repository: Union[IUserRepository, IAsyncUserRepository],
+        password_service: IPasswordService,
+        refresh_token_repository: Optional[Union[IRefreshTokenRepository, IAsyncRefreshTokenRepository]] = None,
+        rehash_scheduler: Optional[RehashScheduler] = None
+    ):
+        # execute() requiere repositorios síncronos y execute_async() asíncronos.
+        # Sin repositorio de refresh tokens, el login solo devuelve el access token.
+        # Sin rehash_scheduler, los hashes con parámetros viejos se dejan como están.
         self.user_repository = user_repository
+        self.password_service = password_service
+        self.refresh_token_repository = refresh_token_repository
+        self.rehash_scheduler = rehash_scheduler
 
     def execute(self, request: LoginRequestDTO) -> LoginResponseDTO:
-        # 1. Buscar al usuario por email
-        user = self.user_repository.find_by_email(request.email)
-        if not user:
+        # 1. Buscar solo las credenciales (id + hash) por email, sin hidratar el usuario
+        credentials = self.user_repository.find_credentials_by_email(request.email)
+        if not credentials:
             raise ValueError("Email o contraseña incorrectos.") 
 
-        # 2. Verificar la contraseña usando el método del objeto de valor
-        if not user.password.verify_password(request.password):
+        # 2. Verificar la contraseña contra el hash almacenado
+        if not self.password_service.verify(request.password, credentials.password_hash):
             raise ValueError("Email o contraseña incorrectos.")
+        self._schedule_rehash(credentials, request.password)
 
         # 3. Crear el token JWT
-        access_token = create_access_token(data={"sub": str(user.user_id)})
-        
-        return LoginResponseDTO(access_token=access_token)
\ No newline at end of file
+        access_token = create_access_token(data={"sub": str(credentials.user_id)})
+
+        # 4. Emitir el refresh token de la nueva sesión
+        refresh_token = None
+        if self.refresh_token_repository is not None:
+            refresh_token, entity = new_refresh_token(credentials.user_id)
+            self.refresh_token_repository.add(entity)
+
+        return LoginResponseDTO(access_token=access_token, refresh_token=refresh_token)
+
+    async def execute_async(self, request: LoginRequestDTO) -> LoginResponseDTO:
+        """
+        Variante asíncrona de execute sobre un IAsyncUserRepository; la
+        verificación bcrypt corre en el executor de hashing.
+        """
+        credentials = await self.user_repository.find_credentials_by_email(request.email)
+        if not credentials:
+            raise ValueError("Email o contraseña incorrectos.")
+
+        if not await self.password_service.verify_async(request.password, credentials.password_hash):
+            raise ValueError("Email o contraseña incorrectos.")
+        self._schedule_rehash(credentials, request.password)
+
+        access_token = create_access_token(data={"sub": str(credentials.user_id)})
+
+        refresh_token = None
+        if self.refresh_token_repository is not None:
+            refresh_token, entity = new_refresh_token(credentials.user_id)
+            await self.refresh_token_repository.add(entity)
+
+        return LoginResponseDTO(access_token=access_token, refresh_token=refresh_token)
+
+    def _schedule_rehash(self, credentials: UserCredentials, plain_password: str) -> None:
+        """Si el hash quedó desactualizado respecto de la política, agenda su reemplazo."""
+        if self.rehash_scheduler is not None and self.password_service.needs_rehash(credentials.password_hash):
+            self.rehash_scheduler(credentials.user_id, plain_password, credentials.password_hash)
@@ -0,0 +1,77 @@
+import datetime
+import uuid
+from typing import Optional, Tuple, Union
+from src.ports.repositories.refresh_token_repository import IRefreshTokenRepository
+from src.ports.repositories.async_refresh_token_repository import IAsyncRefreshTokenRepository
+from src.domain.entities.refresh_token import RefreshToken
+from .dtos import LoginResponseDTO, RefreshTokenRequestDTO
+from src.adapters.security import create_access_token, generate_refresh_token, hash_refresh_token
+from src.config import get_settings
+
+def new_refresh_token(user_id: uuid.UUID, family_id: Optional[uuid.UUID] = None) -> Tuple[str, RefreshToken]:
+    """
+    Emite un refresh token: devuelve el valor para el cliente y la entidad a
+    guardar. Sin `family_id` empieza una familia (sesión) nueva, como en el login.
+    """
+    token, token_hash = generate_refresh_token()
+    now = datetime.datetime.utcnow()
+    entity = RefreshToken(
+        token_hash=token_hash,
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4(),
+        expires_at=now + datetime.timedelta(days=get_settings().refresh_token_expire_days),
+        created_at=now
+    )
+    return token, entity
+
+class RefreshAccessTokenUseCase:
+    def __init__(self, refresh_token_repository: Union[IRefreshTokenRepository, IAsyncRefreshTokenRepository]):
+        # execute() requiere un repositorio síncrono y execute_async() uno asíncrono
+        self.refresh_token_repository = refresh_token_repository
+
+    def execute(self, request: RefreshTokenRequestDTO) -> LoginResponseDTO:
+        """
+        Emite un access token nuevo a partir de un refresh token, sin verificar
+        la contraseña (una búsqueda por clave primaria en lugar de bcrypt). El
+        refresh token se rota: el presentado queda usado y se devuelve otro.
+        """
+        now = datetime.datetime.utcnow()
+        stored = self.refresh_token_repository.find_by_hash(hash_refresh_token(request.refresh_token))
+        self._check(stored, now)
+        if stored.is_spent():
+            # Un token ya rotado se volvió a presentar: alguien más lo tiene
+            self.refresh_token_repository.revoke_family(stored.family_id, now)
+            raise ValueError("Refresh token reutilizado: la sesión fue revocada.")
+
+        token, replacement = new_refresh_token(stored.user_id, stored.family_id)
+        if not self.refresh_token_repository.rotate(stored.token_hash, replacement, now):
+            # Otro request usó el mismo token al mismo tiempo
+            self.refresh_token_repository.revoke_family(stored.family_id, now)
+            raise ValueError("Refresh token reutilizado: la sesión fue revocada.")
+
+        return self._to_response(stored, token)
+
+    async def execute_async(self, request: RefreshTokenRequestDTO) -> LoginResponseDTO:
+        now = datetime.datetime.utcnow()
+        stored = await self.refresh_token_repository.find_by_hash(hash_refresh_token(request.refresh_token))
+        self._check(stored, now)
+        if stored.is_spent():
+            await self.refresh_token_repository.revoke_family(stored.family_id, now)
+            raise ValueError("Refresh token reutilizado: la sesión fue revocada.")
+
+        token, replacement = new_refresh_token(stored.user_id, stored.family_id)
+        if not await self.refresh_token_repository.rotate(stored.token_hash, replacement, now):
+            await self.refresh_token_repository.revoke_family(stored.family_id, now)
+            raise ValueError("Refresh token reutilizado: la sesión fue revocada.")
+
+        return self._to_response(stored, token)
+
+    @staticmethod
+    def _check(stored: Optional[RefreshToken], now: datetime.datetime) -> None:
+        if not stored or (not stored.is_spent() and stored.is_expired(now)):
+            raise ValueError("Refresh token inválido o expirado.")
+
+    @staticmethod
+    def _to_response(stored: RefreshToken, token: str) -> LoginResponseDTO:
+        access_token = create_access_token(data={"sub": str(stored.user_id)})
+        return LoginResponseDTO(access_token=access_token, refresh_token=token)
@@ -1,39 +1,80 @@
 import uuid
+from typing import Union
 from src.adapters.repositories.user_repository import IUserRepository
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
 from src.domain.entities.user import User
 from src.domain.entities.profile import Profile
 from src.domain.value_objects.email import Email
 from src.domain.value_objects.password import Password
 from src.domain.value_objects.username import Username
+from src.ports.services.password_service import IPasswordService
+from src.adapters.timing import phase
 from .dtos import RegisterUserRequestDTO, UserResponseDTO
 
 class RegisterUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(
+        self,
+        user_repository: Union[IUserRepository, IAsyncUserRepository],
+        password_service: IPasswordService
+    ):
+        # execute() requiere un repositorio síncrono y execute_async() uno asíncrono
         self.user_repository = user_repository
+        self.password_service = password_service
 
     def execute(self, request: RegisterUserRequestDTO) -> UserResponseDTO:
         """
         Registra un nuevo usuario con validaciones completas de seguridad.
-        Valida que el email y username no existan, crea los Value Objects
-        con validaciones robustas, y persiste el usuario.
+        Crea los Value Objects con validaciones robustas y persiste el usuario
+        en un único INSERT: si el email o el username ya existen, el repositorio
+        lo detecta por sus restricciones únicas y lanza UserAlreadyExistsError
+        (un ValueError con el mismo mensaje de siempre).
         """
-        # 1. Validar que el usuario o email no existan
-        if self.user_repository.find_by_email(request.email):
-            raise ValueError("El email ya está en uso.")
-        if self.user_repository.find_by_username(request.username):
-            raise ValueError("El nombre de usuario ya está en uso.")
-
-        # 2. Crear los objetos de valor con validaciones robustas
+        # 1. Crear los objetos de valor con validaciones robustas
         # Estos Value Objects validan formato, longitud, caracteres peligrosos, etc.
         try:
             email_vo = Email(value=request.email)
-            password_vo = Password(value=request.password)
+            password_vo = Password(self.password_service, value=request.password)
             username_vo = Username(value=request.username)
         except ValueError as e:
             # Propagar errores de validación del Value Object
             raise e
 
-        # 3. Crear el agregado completo
+        # 2. Crear el agregado completo
+        user_entity = self._build_user(request, email_vo, password_vo, username_vo)
+
+        # 3. Guardar a través del repositorio (los duplicados se detectan aquí)
+        self.user_repository.save(user_entity)
+
+        # 4. Devolver una respuesta DTO
+        return self._to_response(user_entity)
+
+    async def execute_async(self, request: RegisterUserRequestDTO) -> UserResponseDTO:
+        """
+        Variante asíncrona de execute sobre un IAsyncUserRepository: el hash
+        bcrypt se espera en el executor de hashing, de modo que el event loop
+        nunca queda bloqueado.
+        """
+        # Cada paso se registra como fase de Server-Timing (si el request se mide)
+        with phase("vo.email"):
+            email_vo = Email(value=request.email)
+        with phase("vo.username"):
+            username_vo = Username(value=request.username)
+        with phase("vo.password"):
+            password_vo = Password.validated(request.password, self.password_service)
+        password_vo.hashed_value = await self.password_service.hash_async(request.password)
+
+        user_entity = self._build_user(request, email_vo, password_vo, username_vo)
+        await self.user_repository.save(user_entity)
+
+        return self._to_response(user_entity)
+
+    @staticmethod
+    def _build_user(
+        request: RegisterUserRequestDTO,
+        email_vo: Email,
+        password_vo: Password,
+        username_vo: Username
+    ) -> User:
         # Primero crear un UUID temporal para el user_id (se generará automáticamente si no se pasa)
         temp_user_id = uuid.uuid4()
         
@@ -43,7 +84,7 @@ class RegisterUserUseCase:
             nivel_educativo=request.nivel_educativo
         )
         
-        user_entity = User(
+        return User(
             user_id=temp_user_id,
             username=username_vo.value,  # Usar el valor validado del Value Object
             age=request.age,
@@ -51,14 +92,12 @@ class RegisterUserUseCase:
             password=password_vo,
             profile=profile_entity
         )
-        
-        # 4. Guardar a través del repositorio
-        self.user_repository.save(user_entity)
 
-        # 5. Devolver una respuesta DTO
+    @staticmethod
+    def _to_response(user_entity: User) -> UserResponseDTO:
         return UserResponseDTO(
             user_id=str(user_entity.user_id),
             username=user_entity.username,
             email=user_entity.email.value,
             message="Usuario registrado exitosamente"
-        )
\ No newline at end of file
+        )
@@ -1,11 +1,15 @@
 # src/use_cases/update_user.py
 import uuid
+from typing import Optional, Union
 from src.ports.repositories.user_repository import IUserRepository
+from src.ports.repositories.async_user_repository import IAsyncUserRepository
+from src.domain.entities.user import User
 from src.domain.value_objects.username import Username
 from .dtos import UpdateUserRequestDTO, UserDetailResponseDTO, ProfileResponseDTO
 
 class UpdateUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: Union[IUserRepository, IAsyncUserRepository]):
+        # execute() requiere un repositorio síncrono y execute_async() uno asíncrono
         self.user_repository = user_repository
 
     def execute(self, user_id: uuid.UUID, request: UpdateUserRequestDTO) -> UserDetailResponseDTO:
@@ -18,32 +22,60 @@ class UpdateUserUseCase:
             raise FileNotFoundError("Usuario no encontrado.")
 
         # Validar username usando Value Object si se proporciona
-        validated_username = None
+        validated_username = self._validate_username(request)
+        if validated_username and validated_username != user_to_update.username:
+            # Validar que el nuevo username no esté en uso por otro usuario
+            if self.user_repository.exists_by_username(validated_username):
+                raise ValueError("El nombre de usuario ya está en uso.")
+
+        self._apply(user_to_update, validated_username, request)
+        self.user_repository.update(user_to_update)
+
+        # Devolver el usuario actualizado
+        return self._to_response(user_to_update)
+
+    async def execute_async(self, user_id: uuid.UUID, request: UpdateUserRequestDTO) -> UserDetailResponseDTO:
+        """Variante asíncrona de execute sobre un IAsyncUserRepository."""
+        user_to_update = await self.user_repository.find_by_id(user_id)
+        if not user_to_update:
+            raise FileNotFoundError("Usuario no encontrado.")
+
+        validated_username = self._validate_username(request)
+        if validated_username and validated_username != user_to_update.username:
+            if await self.user_repository.exists_by_username(validated_username):
+                raise ValueError("El nombre de usuario ya está en uso.")
+
+        self._apply(user_to_update, validated_username, request)
+        await self.user_repository.update(user_to_update)
+
+        return self._to_response(user_to_update)
+
+    @staticmethod
+    def _validate_username(request: UpdateUserRequestDTO) -> Optional[str]:
         if request.username:
             try:
                 username_vo = Username(value=request.username)
-                validated_username = username_vo.value
+                return username_vo.value
             except ValueError as e:
                 raise e
-            
-            # Validar que el nuevo username no esté en uso por otro usuario
-            if validated_username != user_to_update.username:
-                if self.user_repository.find_by_username(validated_username):
-                    raise ValueError("El nombre de usuario ya está en uso.")
-        else:
-            validated_username = request.username
+        return request.username
 
+    @staticmethod
+    def _apply(user_to_update: User, validated_username: Optional[str], request: UpdateUserRequestDTO) -> None:
         # Usar los métodos de la entidad para actualizarse
         user_to_update.update_details(username=validated_username, age=request.age)
         user_to_update.update_profile(entorno=request.entorno, nivel_educativo=request.nivel_educativo)
-        
-        self.user_repository.update(user_to_update)
 
-        # Devolver el usuario actualizado
-        return UserDetailResponseDTO(
-            user_id=str(user_to_update.user_id),
-            username=user_to_update.username,
-            email=user_to_update.email.value,
-            age=user_to_update.age,
-            profile=ProfileResponseDTO(**user_to_update.profile.dict())
-        )
\ No newline at end of file
+    @staticmethod
+    def _to_response(user: User) -> UserDetailResponseDTO:
+        # Datos de una entidad ya validada: el DTO se arma sin volver a validarlos
+        profile = user.profile
+        return UserDetailResponseDTO.model_construct(
+            user_id=str(user.user_id),
+            username=user.username,
+            email=user.email.value,
+            age=user.age,
+            profile=ProfileResponseDTO.model_construct(
+                rol=profile.rol, entorno=profile.entorno, nivel_educativo=profile.nivel_educativo
+            )
+        )
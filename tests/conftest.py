@@ -0,0 +1,5 @@
+import os
+
+# Configuración mínima para importar la aplicación sin .env ni MySQL
+os.environ.setdefault("SECRET_KEY", "clave-de-pruebas")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
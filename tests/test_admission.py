@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import anyio
+import pytest
+
+from src.adapters.admission import AdmissionController, AdmissionRejected, HashPriority
+from src.use_cases.bulk_import_users import BulkImportUsersUseCase
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def settle():
+    """Deja correr a las tareas pendientes hasta que se encolen."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_waiter_is_rejected_after_max_wait():
+    async def scenario():
+        controller = AdmissionController(slots=1, max_queue=8, max_wait=0.05)
+        await controller.acquire(HashPriority.LOGIN)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(HashPriority.LOGIN)
+
+        assert rejected.value.reason == "timeout"
+        assert rejected.value.retry_after >= 1
+        stats = controller.stats()
+        assert stats["rejected"]["timeout"] == 1
+        assert stats["queue_depth"]["login"] == 0
+        # El que venció no se queda con el slot al liberarse
+        controller.release()
+        assert controller.stats()["in_use"] == 0
+
+    run(scenario())
+
+
+def test_full_queue_rejects_same_priority():
+    async def scenario():
+        controller = AdmissionController(slots=1, max_queue=1, max_wait=None)
+        await controller.acquire(HashPriority.REGISTER)
+        queued = asyncio.create_task(controller.acquire(HashPriority.REGISTER))
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(HashPriority.REGISTER)
+
+        assert rejected.value.reason == "queue_full"
+        controller.release()
+        await queued
+        controller.release()
+
+    run(scenario())
+
+
+def test_higher_priority_evicts_last_lower_priority_waiter():
+    async def scenario():
+        controller = AdmissionController(slots=1, max_queue=2, max_wait=None)
+        await controller.acquire(HashPriority.BULK)
+        first_bulk = asyncio.create_task(controller.acquire(HashPriority.BULK))
+        last_bulk = asyncio.create_task(controller.acquire(HashPriority.BULK))
+        await settle()
+
+        login = asyncio.create_task(controller.acquire(HashPriority.LOGIN))
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await last_bulk
+        assert rejected.value.reason == "evicted"
+        assert not first_bulk.done()
+
+        # El slot liberado pasa al login antes que al lote que esperaba desde antes
+        controller.release()
+        await login
+        assert not first_bulk.done()
+        controller.release()
+        await first_bulk
+        controller.release()
+
+        stats = controller.stats()
+        assert stats["rejected"]["evicted"] == 1
+        assert stats["admitted"] == {"login": 1, "register": 0, "bulk": 2}
+        assert stats["in_use"] == 0
+
+    run(scenario())
+
+
+def test_under_load_admitted_work_is_bounded_and_served_by_priority():
+    async def scenario():
+        controller = AdmissionController(slots=2, max_queue=6, max_wait=0.5)
+        order = []
+        running = 0
+        peak = 0
+
+        async def job(priority, name):
+            nonlocal running, peak
+            try:
+                async with controller.slot(priority):
+                    running += 1
+                    peak = max(peak, running)
+                    order.append(name)
+                    await asyncio.sleep(0.01)
+                    running -= 1
+            except AdmissionRejected as e:
+                order.append(f"{name}:{e.reason}")
+
+        # Un pico: 8 trabajos en lote ocupan los 2 slots y llenan la cola; después llegan 4 logins
+        tasks = [asyncio.create_task(job(HashPriority.BULK, f"bulk{i}")) for i in range(8)]
+        await settle()
+        tasks += [asyncio.create_task(job(HashPriority.LOGIN, f"login{i}")) for i in range(4)]
+        await asyncio.gather(*tasks)
+
+        assert peak <= 2
+        served = [name for name in order if ":" not in name]
+        rejected = [name for name in order if ":" in name]
+        # Los logins desplazaron a los últimos lotes y se atendieron antes que los que quedaron
+        assert rejected == [f"bulk{i}:evicted" for i in (7, 6, 5, 4)]
+        assert served == ["bulk0", "bulk1", "login0", "login1", "login2", "login3", "bulk2", "bulk3"]
+        assert controller.stats()["in_use"] == 0
+
+    run(scenario())
+
+
+def test_thread_slot_can_be_released_from_another_thread():
+    async def scenario():
+        controller = AdmissionController(slots=1, max_queue=4, max_wait=None)
+        entered, proceed = threading.Event(), threading.Event()
+
+        def worker():
+            with ThreadPoolExecutor(1) as pool:
+                slot = controller.slot_from_thread()
+                slot.__enter__()
+                entered.set()
+                proceed.wait()
+                # Se libera desde el callback, en un hilo que no es de AnyIO
+                pool.submit(time.sleep, 0.01).add_done_callback(lambda _: slot.__exit__(None, None, None))
+
+        bulk = asyncio.create_task(anyio.to_thread.run_sync(worker))
+        await anyio.to_thread.run_sync(entered.wait)
+        login = asyncio.create_task(controller.acquire(HashPriority.LOGIN))
+        await settle()
+        assert not login.done()
+
+        proceed.set()
+        await asyncio.wait_for(login, 2)
+        await bulk
+        controller.release()
+        stats = controller.stats()
+        assert stats["admitted"] == {"login": 1, "register": 0, "bulk": 1}
+        assert stats["in_use"] == 0
+
+    run(scenario())
+
+
+def test_bulk_hashing_holds_one_slot_per_hash_in_flight():
+    async def scenario():
+        controller = AdmissionController(slots=2, max_queue=8, max_wait=None)
+        lock = threading.Lock()
+        running = peak = 0
+
+        def hash_password(plain):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.005)
+            with lock:
+                running -= 1
+            return plain.upper()
+
+        # Más hashes en curso que slots: no debe bloquearse esperando su propio slot
+        with ThreadPoolExecutor(4) as pool:
+            use_case = BulkImportUsersUseCase(
+                None, pool, None, hash_password,
+                admit=partial(controller.slot_from_thread, HashPriority.BULK), hash_concurrency=4
+            )
+            passwords = [f"clave{i}" for i in range(20)]
+            hashes = await asyncio.wait_for(anyio.to_thread.run_sync(use_case._hash_all, passwords), 10)
+
+        assert hashes == [plain.upper() for plain in passwords]
+        assert peak <= 2
+        stats = controller.stats()
+        assert stats["admitted"]["bulk"] == 20
+        assert stats["in_use"] == 0
+
+    run(scenario())
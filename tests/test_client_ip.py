@@ -0,0 +1,73 @@
+import pytest
+from starlette.requests import Request
+
+from src.adapters.api.rate_limiter import MAX_FORWARDED_HOPS, get_client_ip
+from src.config import get_settings
+
+PEER = "10.0.0.1"
+
+
+@pytest.fixture
+def trust(monkeypatch):
+    """Configura TRUSTED_PROXIES solo para el test."""
+    def apply(value: str) -> None:
+        monkeypatch.setattr(get_settings(), "trusted_proxies", value)
+    return apply
+
+
+def make_request(peer: str = PEER, forwarded: str | None = None) -> Request:
+    headers = [] if forwarded is None else [(b"x-forwarded-for", forwarded.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 12345)})
+
+
+def test_without_trusted_proxies_uses_peer(trust):
+    trust("")
+    assert get_client_ip(make_request(forwarded="1.2.3.4")) == PEER
+
+
+def test_untrusted_peer_ignores_forwarded_for(trust):
+    trust("10.0.0.2")
+    assert get_client_ip(make_request(forwarded="1.2.3.4")) == PEER
+
+
+def test_trusted_peer_takes_rightmost_untrusted_hop(trust):
+    trust(f"{PEER},10.0.0.2")
+    # La entrada de la izquierda la escribe el cliente y no cuenta
+    request = make_request(forwarded="6.6.6.6, 1.2.3.4, 10.0.0.2")
+    assert get_client_ip(request) == "1.2.3.4"
+
+
+def test_all_hops_trusted_falls_back_to_peer(trust):
+    trust(f"{PEER},10.0.0.2,10.0.0.3")
+    assert get_client_ip(make_request(forwarded="10.0.0.3, 10.0.0.2")) == PEER
+
+
+def test_missing_header_uses_peer(trust):
+    trust(PEER)
+    assert get_client_ip(make_request()) == PEER
+
+
+@pytest.mark.parametrize("hop", ["not-an-ip", "1.2.3.4:80", "", "999.1.1.1"])
+def test_malformed_entry_falls_back_to_peer(trust, hop):
+    trust(PEER)
+    assert get_client_ip(make_request(forwarded=f"1.2.3.4, {hop}")) == PEER
+
+
+def test_hops_beyond_limit_are_not_examined(trust):
+    trust(f"{PEER},10.0.1.0/24")
+    proxies = [f"10.0.1.{i}" for i in range(MAX_FORWARDED_HOPS)]
+    # Todos los saltos examinados son de confianza: el cliente real queda fuera del límite
+    assert get_client_ip(make_request(forwarded=", ".join(["1.2.3.4", *proxies]))) == PEER
+    # Con un proxy menos, el cliente entra en la ventana examinada
+    assert get_client_ip(make_request(forwarded=", ".join(["1.2.3.4", *proxies[1:]]))) == "1.2.3.4"
+
+
+def test_cidr_entries_match_peer_and_hops(trust):
+    trust("10.0.0.0/8, 2001:db8::/32")
+    request = make_request(peer="10.9.8.7", forwarded="1.2.3.4, 2001:db8::1, 10.1.1.1")
+    assert get_client_ip(request) == "1.2.3.4"
+
+
+def test_ipv6_client_is_normalized(trust):
+    trust(PEER)
+    assert get_client_ip(make_request(forwarded="2001:DB8:0:0::1")) == "2001:db8::1"
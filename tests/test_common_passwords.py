@@ -0,0 +1,46 @@
+import logging
+
+import pytest
+
+from src.adapters import common_passwords
+from src.adapters.common_passwords import CommonPasswordIndex, build_index, get_common_passwords
+from src.config import get_settings
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    """Rutas del diccionario en un directorio temporal y el índice del proceso sin abrir."""
+    index_path, csv_path = tmp_path / "common.idx", tmp_path / "common.csv"
+    monkeypatch.setattr(get_settings(), "common_passwords_index", str(index_path))
+    monkeypatch.setattr(get_settings(), "common_passwords_csv", str(csv_path))
+    monkeypatch.setattr(common_passwords, "_index", None)
+    return index_path, csv_path
+
+
+def test_index_lookup(tmp_path):
+    path = str(tmp_path / "common.idx")
+    assert build_index(["123456", "qwerty", "123456", "contraseña"], path) == 3
+    index = CommonPasswordIndex(path)
+    try:
+        assert len(index) == 3
+        assert "qwerty" in index and "contraseña" in index
+        assert "qwerty1" not in index and "" not in index and 123456 not in index
+    finally:
+        index.close()
+
+
+def test_lookup_opens_a_compiled_index(paths):
+    index_path, _ = paths
+    build_index(["123456"], str(index_path))
+    assert "123456" in get_common_passwords()
+    get_common_passwords().close()
+
+
+def test_lookup_never_compiles_the_csv(paths, caplog):
+    index_path, csv_path = paths
+    csv_path.write_text("1,123456\n2,qwerty\n", encoding="utf-8")
+    with caplog.at_level(logging.WARNING, logger=common_passwords.__name__):
+        index = get_common_passwords()
+    assert len(index) == 0 and "123456" not in index
+    assert not index_path.exists()
+    assert "python -m src.adapters.common_passwords" in caplog.text
@@ -0,0 +1,85 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from src.adapters.repositories import db_models  # noqa: F401 (registra los modelos en Base)
+from src.adapters.repositories.database import Base
+from src.adapters.repositories.mappers import duplicate_user_error
+from src.adapters.repositories.mysql_user_repository import MySQLUserRepository
+from src.domain.entities.profile import Profile
+from src.domain.entities.user import User
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.enums import Entorno, NivelEducativo
+from src.domain.value_objects.password import Password
+from src.ports.repositories.user_repository import UserAlreadyExistsError
+
+
+def integrity_error(message: str) -> IntegrityError:
+    return IntegrityError("INSERT INTO users ...", {}, Exception(message))
+
+
+@pytest.mark.parametrize("message, field", [
+    ("UNIQUE constraint failed: users.email", "email"),
+    ("UNIQUE constraint failed: users.username", "username"),
+    ("(1062, \"Duplicate entry 'a@x.com' for key 'users.ix_users_email'\")", "email"),
+    ("(1062, \"Duplicate entry 'ana' for key 'ix_users_username'\")", "username"),
+    # El valor duplicado lo elige el cliente: solo cuenta la clave al final
+    ("(1062, \"Duplicate entry 'x' for key 'users.ix_users_username' y' for key 'users.ix_users_email'\")", "email"),
+])
+def test_unique_violations_are_classified(message, field):
+    duplicate = duplicate_user_error(integrity_error(message))
+
+    assert isinstance(duplicate, UserAlreadyExistsError)
+    assert duplicate.field == field
+
+
+@pytest.mark.parametrize("message", [
+    "NOT NULL constraint failed: users.email",
+    "UNIQUE constraint failed: profiles.profile_id",
+    "FOREIGN KEY constraint failed",
+    "(1048, \"Column 'email' cannot be null\")",
+    "(1062, \"Duplicate entry 'x' for key 'profiles.PRIMARY'\")",
+    "(1452, 'Cannot add or update a child row: a foreign key constraint fails')",
+])
+def test_other_integrity_errors_are_not_duplicates(message):
+    assert duplicate_user_error(integrity_error(message)) is None
+
+
+@pytest.fixture
+def repository(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        # SQLite verifica primero el último índice creado: así un alta con email y
+        # username repetidos falla por el username, el caso que la precedencia corrige
+        connection.exec_driver_sql("DROP INDEX ix_users_username")
+        connection.exec_driver_sql("CREATE UNIQUE INDEX ix_users_username ON users (username)")
+    with sessionmaker(bind=engine)() as db:
+        yield MySQLUserRepository(db)
+    engine.dispose()
+
+
+def new_user(username: str, email: str) -> User:
+    user_id = uuid.uuid4()
+    return User(
+        user_id=user_id, username=username, age=20, email=Email(value=email),
+        password=Password.from_hash("$2b$04$hash"),
+        profile=Profile(user_id=user_id, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.PRIMARIA),
+    )
+
+
+@pytest.mark.parametrize("username, email, field", [
+    ("ana_perez", "ana@example.com", "email"),  # Ambos repetidos: el email tiene prioridad
+    ("ana_perez", "otra@example.com", "username"),
+    ("otra_ana", "ana@example.com", "email"),
+])
+def test_save_reports_the_duplicate_field(repository, username, email, field):
+    repository.save(new_user("ana_perez", "ana@example.com"))
+
+    with pytest.raises(UserAlreadyExistsError) as duplicate:
+        repository.save(new_user(username, email))
+
+    assert duplicate.value.field == field
@@ -0,0 +1,49 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import JWTError, jwt
+
+from src.adapters.jwt_keys import get_key_ring
+from src.adapters.security import create_access_token, decode_access_token, verify_access_token
+from src.config import get_settings
+
+
+@pytest.fixture
+def key_ring(tmp_path, monkeypatch):
+    """Llavero ES256 con una clave generada para el test."""
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    key_file = tmp_path / "signing.pem"
+    key_file.write_bytes(pem)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "algorithm", "ES256")
+    monkeypatch.setattr(settings, "jwt_key_files", str(key_file))
+    monkeypatch.setattr(settings, "jwt_accept_hs256", False)
+    get_key_ring.cache_clear()
+    yield get_key_ring()
+    get_key_ring.cache_clear()
+
+
+def sign_with_kid(key_ring, kid) -> str:
+    signing_key = key_ring.signing_key
+    return jwt.encode({"sub": "alice"}, signing_key.private_key, algorithm="ES256", headers={"kid": kid})
+
+
+def test_token_signed_with_active_key_is_accepted(key_ring):
+    token = create_access_token({"sub": "alice"})
+    assert decode_access_token(token)["sub"] == "alice"
+
+
+@pytest.mark.parametrize("kid", [["a", "b"], {"k": "v"}, 7, None])
+def test_non_string_kid_is_rejected(key_ring, kid):
+    # Un kid no hashable no debe llegar a la búsqueda en el llavero (TypeError -> 500)
+    token = sign_with_kid(key_ring, kid)
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+    assert verify_access_token(token) is None
+
+
+def test_unknown_kid_is_rejected(key_ring):
+    with pytest.raises(JWTError):
+        decode_access_token(sign_with_kid(key_ring, "otra-clave"))
@@ -0,0 +1,56 @@
+import logging
+import sqlite3
+import time
+
+import pytest
+
+from src.adapters import rate_limit_storage
+from src.adapters.rate_limit_storage import SQLiteStorage
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rl.db")
+
+
+def test_sliding_window_counts_across_instances(path):
+    first, second = SQLiteStorage(f"sqlite:///{path}"), SQLiteStorage(f"sqlite:///{path}")
+
+    assert first.acquire_sliding_window_entry("ip", 2, 60)
+    assert second.acquire_sliding_window_entry("ip", 2, 60)
+    assert not first.acquire_sliding_window_entry("ip", 2, 60)
+
+
+def test_locked_database_fails_open_quickly(path, caplog):
+    storage = SQLiteStorage(f"sqlite:///{path}")
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.perf_counter()
+        with caplog.at_level(logging.WARNING, logger=rate_limit_storage.__name__):
+            assert storage.acquire_sliding_window_entry("ip", 1, 60)
+        assert time.perf_counter() - start < 1
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    assert "database is locked" in caplog.text
+    # El request admitido por el lock no se contó
+    assert storage.acquire_sliding_window_entry("ip", 1, 60)
+
+
+def test_expired_counters_are_purged_outside_the_check(path, monkeypatch):
+    monkeypatch.setattr(rate_limit_storage, "_PURGE_EVERY", 3)
+    storage = SQLiteStorage(f"sqlite:///{path}")
+    storage.acquire_sliding_window_entry("old", 5, 1)
+    time.sleep(2.1)  # La ventana de 1 s vence a los 2 s
+    for key in ("a", "b"):
+        storage.acquire_sliding_window_entry(key, 5, 1)
+
+    keys = [row[0].split("/")[0] for row in sqlite3.connect(path).execute("SELECT key FROM rate_limits")]
+    assert sorted(keys) == ["a", "b"]
+
+
+@pytest.mark.parametrize("uri", ["sqlite://", "sqlite:///:memory:"])
+def test_rejects_storage_that_cannot_be_shared(uri):
+    with pytest.raises(ValueError):
+        SQLiteStorage(uri)
@@ -0,0 +1,142 @@
+import datetime
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.adapters.repositories import db_models  # noqa: F401 (registra los modelos en Base)
+from src.adapters.repositories.database import Base
+from src.adapters.repositories.sql_refresh_token_repository import SQLRefreshTokenRepository
+from src.adapters.security import hash_refresh_token
+from src.use_cases.dtos import RefreshTokenRequestDTO
+from src.use_cases.refresh_token import RefreshAccessTokenUseCase, new_refresh_token
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    # Un archivo (no :memory:) para que cada sesión tenga su propia conexión
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    yield factory
+    engine.dispose()
+
+
+def issue(sessions, **overrides) -> str:
+    """Emite un refresh token como el login y lo guarda; devuelve el valor del cliente."""
+    token, entity = new_refresh_token(USER_ID)
+    entity = entity.model_copy(update=overrides)
+    with sessions() as db:
+        SQLRefreshTokenRepository(db).add(entity)
+    return token
+
+
+def refresh(sessions, token: str):
+    with sessions() as db:
+        return RefreshAccessTokenUseCase(SQLRefreshTokenRepository(db)).execute(
+            RefreshTokenRequestDTO(refresh_token=token)
+        )
+
+
+def stored(sessions, token: str):
+    with sessions() as db:
+        return SQLRefreshTokenRepository(db).find_by_hash(hash_refresh_token(token))
+
+
+def test_rotation_issues_a_new_token_and_spends_the_old_one(sessions):
+    token = issue(sessions)
+
+    response = refresh(sessions, token)
+
+    assert response.access_token
+    assert response.refresh_token and response.refresh_token != token
+    old, new = stored(sessions, token), stored(sessions, response.refresh_token)
+    assert old.used_at is not None
+    assert new.family_id == old.family_id and new.used_at is None
+    # El reemplazo sirve para la siguiente renovación
+    assert refresh(sessions, response.refresh_token).refresh_token
+
+
+def test_reusing_a_rotated_token_revokes_the_family(sessions):
+    token = issue(sessions)
+    replacement = refresh(sessions, token).refresh_token
+
+    with pytest.raises(ValueError, match="reutilizado"):
+        refresh(sessions, token)
+
+    assert stored(sessions, replacement).revoked_at is not None
+    with pytest.raises(ValueError, match="reutilizado"):
+        refresh(sessions, replacement)
+
+
+def test_concurrent_rotation_lets_only_one_request_win(sessions):
+    token = issue(sessions)
+    # Ambos requests leen el token antes de que alguno lo rote
+    both_read = threading.Barrier(2)
+
+    class RacingRepository(SQLRefreshTokenRepository):
+        def find_by_hash(self, token_hash):
+            found = super().find_by_hash(token_hash)
+            both_read.wait(timeout=5)
+            return found
+
+    results = []
+
+    def attempt():
+        with sessions() as db:
+            try:
+                response = RefreshAccessTokenUseCase(RacingRepository(db)).execute(
+                    RefreshTokenRequestDTO(refresh_token=token)
+                )
+                results.append(response.refresh_token)
+            except ValueError as e:
+                results.append(e)
+
+    threads = [threading.Thread(target=attempt) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [result for result in results if isinstance(result, str)]
+    losers = [result for result in results if isinstance(result, ValueError)]
+    assert len(winners) == 1 and len(losers) == 1
+    assert "reutilizado" in str(losers[0])
+    # El perdedor revocó la familia: el token del ganador tampoco sirve
+    with pytest.raises(ValueError):
+        refresh(sessions, winners[0])
+
+
+def test_expired_token_is_rejected_without_rotation(sessions):
+    past = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+    token = issue(sessions, expires_at=past)
+
+    with pytest.raises(ValueError, match="expirado"):
+        refresh(sessions, token)
+
+    assert stored(sessions, token).used_at is None
+
+
+def test_unknown_token_is_rejected(sessions):
+    with pytest.raises(ValueError, match="inválido"):
+        refresh(sessions, "token-que-nunca-se-emitio")
+
+
+def test_purge_keeps_spent_tokens_that_are_still_valid(sessions):
+    now = datetime.datetime.utcnow()
+    expired = issue(sessions, expires_at=now - datetime.timedelta(days=1))
+    token = issue(sessions)
+    replacement = refresh(sessions, token).refresh_token
+
+    with sessions() as db:
+        assert SQLRefreshTokenRepository(db).purge(now, batch_size=1) == 1
+
+    assert stored(sessions, expired) is None
+    # El token rotado se conserva: presentarlo de nuevo todavía revoca la familia
+    with pytest.raises(ValueError, match="reutilizado"):
+        refresh(sessions, token)
+    assert stored(sessions, replacement).revoked_at is not None
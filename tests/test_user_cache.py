@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+
+from src.adapters.cache import AsyncSingleFlight
+from src.adapters.repositories.cached_user_repository import CachedUserRepository, UserCache
+from src.domain.entities.profile import Profile
+from src.domain.entities.user import User
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.enums import Entorno, NivelEducativo
+from src.domain.value_objects.password import Password
+
+
+def new_user(username: str = "ana_perez", email: str = "ana@example.com") -> User:
+    user_id = uuid.uuid4()
+    return User(
+        user_id=user_id, username=username, age=20, email=Email(value=email),
+        password=Password.from_hash("$2b$04$hash"),
+        profile=Profile(user_id=user_id, entorno=Entorno.CASA, nivel_educativo=NivelEducativo.PRIMARIA),
+    )
+
+
+class FakeRepository:
+    """Repositorio en memoria que cuenta las lecturas; `during_load` simula una escritura concurrente."""
+
+    def __init__(self, user: User):
+        self.user = user
+        self.loads = 0
+        self.during_load = None
+
+    def find_by_id(self, user_id):
+        self.loads += 1
+        loaded = self.user.model_copy(deep=True)
+        if self.during_load is not None:
+            self.during_load()
+        return loaded
+
+    def find_by_username(self, username):
+        self.loads += 1
+        return self.user.model_copy(deep=True) if self.user.username == username else None
+
+    def update(self, user):
+        self.user = user.model_copy(deep=True)
+
+
+def test_reads_are_served_from_cache():
+    user = new_user()
+    inner = FakeRepository(user)
+    repository = CachedUserRepository(inner, UserCache(100, 60))
+    assert repository.find_by_id(user.user_id).username == "ana_perez"
+    assert repository.find_by_id(user.user_id).username == "ana_perez"
+    assert inner.loads == 1
+
+
+def test_load_that_overlaps_a_write_does_not_repopulate_the_cache():
+    user = new_user()
+    inner = FakeRepository(user)
+    cache = UserCache(100, 60)
+    repository = CachedUserRepository(inner, cache)
+
+    def concurrent_update():
+        inner.during_load = None
+        repository.update(user.model_copy(update={"age": 30}))
+
+    # La carga leyó la versión anterior y la escritura terminó antes de que la guardara
+    inner.during_load = concurrent_update
+    assert repository.find_by_id(user.user_id).age == 20
+    assert cache.get_by_id(user.user_id) is None
+    # La siguiente lectura vuelve a la fuente y ve el dato nuevo
+    assert repository.find_by_id(user.user_id).age == 30
+    assert inner.loads == 2
+
+
+def test_put_with_a_stale_generation_is_ignored():
+    cache = UserCache(100, 60)
+    user = new_user()
+    generation = cache.generation
+    cache.clear()
+    cache.put(user, generation)
+    assert cache.get_by_id(user.user_id) is None
+    cache.put(user, cache.generation)
+    assert cache.get_by_id(user.user_id) is not None
+
+
+def test_renamed_user_is_not_served_under_the_old_username():
+    user = new_user()
+    inner = FakeRepository(user)
+    repository = CachedUserRepository(inner, UserCache(100, 60))
+    assert repository.find_by_username("ana_perez") is not None
+    repository.update(user.model_copy(update={"username": "ana_garcia"}))
+    assert repository.find_by_username("ana_perez") is None
+    assert repository.find_by_username("ana_garcia").user_id == user.user_id
+
+
+def test_cached_entities_are_copies():
+    user = new_user()
+    repository = CachedUserRepository(FakeRepository(user), UserCache(100, 60))
+    repository.find_by_id(user.user_id).age = 99
+    assert repository.find_by_id(user.user_id).age == 20
+
+
+def test_follower_retries_when_the_single_flight_leader_is_cancelled():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return "usuario"
+
+        leader = asyncio.create_task(flight.do("k", load))
+        await started.wait()
+        follower = asyncio.create_task(flight.do("k", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        # El seguidor no hereda la cancelación: pasa a ser líder y ejecuta la carga
+        assert await follower == ("usuario", False)
+        assert leader.cancelled()
+        assert calls == 2
+
+    asyncio.run(scenario())